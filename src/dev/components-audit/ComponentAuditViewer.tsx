@@ -1,5 +1,5 @@
 import React, { useState, useMemo } from 'react';
-import auditData from './audit.json';
+import viewerIndex from './audit-viewer/index.json';
 import {
   Input,
   Select,
@@ -28,7 +28,16 @@ type ComponentCategory =
 
 type ComplexityCategory = 'basic' | 'simple' | 'medium' | 'complex';
 
-interface ComponentAudit {
+type RoadmapPhaseId =
+  | 'ready_now'
+  | 'next_phase'
+  | 'medium_complexity'
+  | 'complex_components'
+  | 'completed';
+
+// One row of audit-viewer/index.json, generated by update_audit.py on save
+interface ComponentRow {
+  key: string;
   name: string;
   path: string;
   description: string;
@@ -36,18 +45,43 @@ interface ComponentAudit {
   used: string;
   primitives: AuditStatus;
   logic_extraction: AuditStatus;
-  hooks: string[];
   native: AuditStatus;
+  complexity_category?: ComplexityCategory;
+  dependency_level?: number;
+  dependency_count: number;
+  dependencies_preview: string[];
+  shard: number;
+}
+
+// Heavy per-component fields, loaded from a detail shard on first expand
+interface ComponentDetails {
   notes: string;
-  updated: string;
-  // New dependency fields
+  hooks: string[];
   dependencies?: string[];
-  dependency_level?: number;
-  complexity_category?: ComplexityCategory;
+  updated: string;
 }
 
-interface AuditData {
-  components: Record<string, ComponentAudit>;
+interface DetailShard {
+  version: number;
+  components: Record<string, ComponentDetails>;
+}
+
+interface ViewerIndex {
+  version: number;
+  source_sha256: string;
+  shard_count: number;
+  components: ComponentRow[];
+  // Lowercased "name\npath\ndescription" per row
+  search: string[];
+  // Row positions, presorted
+  order: {
+    alphabetical: number[];
+    dependency: number[];
+  };
+  // Row positions in each roadmap phase
+  buckets: {
+    roadmap: Record<RoadmapPhaseId, number[]>;
+  };
   stats: {
     total: number;
     primitives_done: number;
@@ -70,18 +104,9 @@ interface AuditData {
   };
   metadata: {
     audit_version: string;
-    last_full_scan: string | null;
     scan_scope: string[];
-    unified_version?: string;
-    migration_date?: string;
-    includes_dependencies?: boolean;
-  };
-  dependency_hierarchy?: {
-    basic: { count: number; components: string[] };
-    simple: { count: number; components: string[] };
-    medium: { count: number; components: string[] };
-    complex: { count: number; components: string[] };
   };
+  hierarchy: Record<ComplexityCategory, number> | null;
   mobile_strategy?: {
     current_phase: string;
     ready_to_build: Array<{
@@ -96,9 +121,92 @@ interface AuditData {
       moderate_components_current: string;
       next_priority: string;
     };
-  };
+  } | null;
 }
 
+const data = viewerIndex as unknown as ViewerIndex;
+const rows = data.components;
+const reverseOrder = [...data.order.alphabetical].reverse();
+
+// Every row belongs to at most one roadmap phase
+const roadmapPhaseOf = new Map<ComponentRow, RoadmapPhaseId>();
+for (const [phase, positions] of Object.entries(data.buckets.roadmap)) {
+  for (const position of positions) {
+    roadmapPhaseOf.set(rows[position], phase as RoadmapPhaseId);
+  }
+}
+
+const ROADMAP_PHASES: Array<{
+  id: RoadmapPhaseId;
+  title: string;
+  subtitle: string;
+  color: string;
+  urgency: 'high' | 'medium' | 'low' | 'done';
+}> = [
+  {
+    id: 'ready_now',
+    title: '🚀 Ready to Build Now',
+    subtitle: 'Basic components with no dependencies - Start here!',
+    color: 'bg-green-500/10 border-green-500/30',
+    urgency: 'high',
+  },
+  {
+    id: 'next_phase',
+    title: '⚡ Next Phase - Simple Components',
+    subtitle: 'Components with 1-3 dependencies - Build after basics',
+    color: 'bg-blue-500/10 border-blue-500/30',
+    urgency: 'medium',
+  },
+  {
+    id: 'medium_complexity',
+    title: '🔧 Medium Complexity',
+    subtitle: 'Components with 4-6 dependencies - Plan carefully',
+    color: 'bg-orange-500/10 border-orange-500/30',
+    urgency: 'low',
+  },
+  {
+    id: 'complex_components',
+    title: '🎯 Complex Components',
+    subtitle: 'Components with 7+ dependencies - Tackle last',
+    color: 'bg-red-500/10 border-red-500/30',
+    urgency: 'low',
+  },
+  {
+    id: 'completed',
+    title: '✅ Completed & Ready',
+    subtitle: 'Native implementation complete',
+    color: 'bg-accent-rgb/10 border-accent-rgb/30',
+    urgency: 'done',
+  },
+];
+
+// Detail shards are split out of the bundle and fetched once, on first expand
+const detailShards = import.meta.glob<DetailShard>(
+  './audit-viewer/details-*.json',
+  { import: 'default' }
+);
+const loadedShards = new Map<number, Promise<DetailShard>>();
+
+const shardFile = (shard: number) =>
+  `./audit-viewer/details-${String(shard).padStart(2, '0')}.json`;
+
+const loadDetailShard = (shard: number): Promise<DetailShard> => {
+  let pending = loadedShards.get(shard);
+  if (!pending) {
+    const load = detailShards[shardFile(shard)];
+    if (!load) {
+      return Promise.reject(new Error(`Missing audit detail shard ${shard}`));
+    }
+    pending = load().catch((error) => {
+      // Let the next expand retry
+      loadedShards.delete(shard);
+      throw error;
+    });
+    loadedShards.set(shard, pending);
+  }
+  return pending;
+};
+
 const StatusBadge: React.FC<{
   status: AuditStatus;
   context?: 'native' | 'default';
@@ -271,8 +379,96 @@ const ComplexityBadge: React.FC<{
   );
 };
 
+const ComponentDetailsPanel: React.FC<{
+  component: ComponentRow;
+  detail: ComponentDetails | undefined;
+  failed: boolean;
+}> = ({ component, detail, failed }) => {
+  if (!detail) {
+    return (
+      <p className="text-sm text-subtle">
+        {failed
+          ? 'Could not load details. Run update_audit.py --viewer-index.'
+          : 'Loading details...'}
+      </p>
+    );
+  }
+
+  return (
+    <div className="space-y-3">
+      <div>
+        <h4 className="text-sm font-medium text-strong mb-1">Notes</h4>
+        <p className="text-sm text-main bg-surface-1 rounded p-3">
+          {detail.notes}
+        </p>
+      </div>
+
+      {detail.hooks.length > 0 && (
+        <div>
+          <h4 className="text-sm font-medium text-strong mb-1">
+            Identified Hooks
+          </h4>
+          <div className="flex flex-wrap gap-2">
+            {detail.hooks.map((hook, index) => (
+              <span
+                key={index}
+                className="px-2 py-1 bg-accent-rgb/10 text-accent-600 dark:text-accent-400 rounded text-xs"
+              >
+                {hook}
+              </span>
+            ))}
+          </div>
+        </div>
+      )}
+
+      {detail.dependencies && detail.dependencies.length > 0 && (
+        <div>
+          <h4 className="text-sm font-medium text-strong mb-1">
+            Dependencies ({detail.dependencies.length})
+          </h4>
+          <div className="flex flex-wrap gap-2">
+            {detail.dependencies.map((dep, index) => (
+              <span
+                key={index}
+                className="px-2 py-1 bg-blue-50 dark:bg-blue-900/20 text-blue-600 dark:text-blue-400 rounded text-xs border border-blue-200 dark:border-blue-800"
+              >
+                {dep}
+              </span>
+            ))}
+          </div>
+        </div>
+      )}
+
+      {component.dependency_level !== undefined && (
+        <div>
+          <h4 className="text-sm font-medium text-strong mb-1">
+            Build Information
+          </h4>
+          <div className="grid grid-cols-1 md:grid-cols-3 gap-2 text-xs">
+            <div>
+              <span className="text-subtle">Dependency Level:</span>{' '}
+              <span className="font-medium">{component.dependency_level}</span>
+            </div>
+            <div>
+              <span className="text-subtle">Complexity:</span>{' '}
+              <span className="font-medium capitalize">
+                {component.complexity_category}
+              </span>
+            </div>
+            <div>
+              <span className="text-subtle">Dependencies:</span>{' '}
+              <span className="font-medium">{component.dependency_count}</span>
+            </div>
+          </div>
+        </div>
+      )}
+
+      <div className="text-xs text-subtle">Last updated: {detail.updated}</div>
+    </div>
+  );
+};
+
 export const ComponentAuditViewer: React.FC = () => {
-  const data = auditData as unknown as AuditData;
   const [searchTerm, setSearchTerm] = useState('');
   const [categoryFilter, setCategoryFilter] = useState<
     ComponentCategory | 'all'
@@ -293,6 +489,8 @@ export const ComponentAuditViewer: React.FC = () => {
     'alphabetical' | 'reverse' | 'dependency'
   >('alphabetical');
   const [expandedRows, setExpandedRows] = useState<Set<string>>(new Set());
+  const [details, setDetails] = useState<Record<string, ComponentDetails>>({});
+  const [detailErrors, setDetailErrors] = useState<Set<number>>(new Set());
 
   const clearAllFilters = () => {
     setSearchTerm('');
@@ -306,63 +504,51 @@ export const ComponentAuditViewer: React.FC = () => {
   };
 
   const filteredComponents = useMemo(() => {
-    const filtered = Object.entries(data.components).filter(
-      ([key, component]) => {
-        const matchesSearch =
-          component.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-          component.path.toLowerCase().includes(searchTerm.toLowerCase()) ||
-          component.description
-            .toLowerCase()
-            .includes(searchTerm.toLowerCase());
-
-        const matchesCategory =
-          categoryFilter === 'all' || component.category === categoryFilter;
-
-        const matchesPrimitives =
-          primitivesFilter === 'all' ||
-          component.primitives === primitivesFilter;
-        const matchesLogic =
-          logicFilter === 'all' || component.logic_extraction === logicFilter;
-        const matchesNative =
-          nativeFilter === 'all' || component.native === nativeFilter;
-
-        const matchesUsage =
-          usageFilter === 'all' || component.used === usageFilter;
-
-        const matchesComplexity =
-          complexityFilter === 'all' ||
-          component.complexity_category === complexityFilter;
-
-        return (
-          matchesSearch &&
-          matchesCategory &&
-          matchesPrimitives &&
-          matchesLogic &&
-          matchesNative &&
-          matchesUsage &&
-          matchesComplexity
-        );
+    // Orderings are presorted in the index, so filtering keeps them sorted
+    const order =
+      sortOrder === 'dependency'
+        ? data.order.dependency
+        : sortOrder === 'reverse'
+          ? reverseOrder
+          : data.order.alphabetical;
+    const term = searchTerm.toLowerCase();
+    const filtered: ComponentRow[] = [];
+
+    for (const position of order) {
+      const component = rows[position];
+      const matchesSearch = !term || data.search[position].includes(term);
+
+      const matchesCategory =
+        categoryFilter === 'all' || component.category === categoryFilter;
+
+      const matchesPrimitives =
+        primitivesFilter === 'all' || component.primitives === primitivesFilter;
+      const matchesLogic =
+        logicFilter === 'all' || component.logic_extraction === logicFilter;
+      const matchesNative =
+        nativeFilter === 'all' || component.native === nativeFilter;
+
+      const matchesUsage =
+        usageFilter === 'all' || component.used === usageFilter;
+
+      const matchesComplexity =
+        complexityFilter === 'all' ||
+        component.complexity_category === complexityFilter;
+
+      if (
+        matchesSearch &&
+        matchesCategory &&
+        matchesPrimitives &&
+        matchesLogic &&
+        matchesNative &&
+        matchesUsage &&
+        matchesComplexity
+      ) {
+        filtered.push(component);
       }
-    );
-
-    // Apply sorting
-    if (sortOrder === 'alphabetical') {
-      return filtered.sort(([, a], [, b]) => a.name.localeCompare(b.name));
-    } else if (sortOrder === 'reverse') {
-      return filtered.sort(([, a], [, b]) => b.name.localeCompare(a.name));
-    } else if (sortOrder === 'dependency') {
-      return filtered.sort(([, a], [, b]) => {
-        const aLevel = a.dependency_level ?? 0;
-        const bLevel = b.dependency_level ?? 0;
-        if (aLevel === bLevel) {
-          return a.name.localeCompare(b.name);
-        }
-        return aLevel - bLevel;
-      });
     }
     return filtered;
   }, [
-    data.components,
     searchTerm,
     categoryFilter,
     primitivesFilter,
@@ -373,17 +559,35 @@ export const ComponentAuditViewer: React.FC = () => {
     sortOrder,
   ]);
 
-  const toggleRowExpansion = (componentKey: string) => {
+  // One pass over the filtered rows groups them by roadmap phase
+  const roadmapGroups = useMemo(() => {
+    const groups = Object.fromEntries(
+      ROADMAP_PHASES.map((phase) => [phase.id, [] as ComponentRow[]])
+    ) as Record<RoadmapPhaseId, ComponentRow[]>;
+    for (const component of filteredComponents) {
+      const phase = roadmapPhaseOf.get(component);
+      if (phase) groups[phase].push(component);
+    }
+    return groups;
+  }, [filteredComponents]);
+
+  const toggleRowExpansion = (component: ComponentRow) => {
     const newExpanded = new Set(expandedRows);
-    if (newExpanded.has(componentKey)) {
-      newExpanded.delete(componentKey);
+    if (newExpanded.has(component.key)) {
+      newExpanded.delete(component.key);
     } else {
-      newExpanded.add(componentKey);
+      newExpanded.add(component.key);
+      if (!details[component.key]) {
+        loadDetailShard(component.shard).then(
+          (shard) => setDetails((prev) => ({ ...prev, ...shard.components })),
+          () => setDetailErrors((prev) => new Set(prev).add(component.shard))
+        );
+      }
     }
     setExpandedRows(newExpanded);
   };
 
-  const calculateProgress = (component: ComponentAudit): number => {
+  const calculateProgress = (component: ComponentRow): number => {
     let progress = 0;
     const total = 3;
 
@@ -553,14 +757,14 @@ export const ComponentAuditViewer: React.FC = () => {
         </div>
 
         {/* Complexity Breakdown */}
-        {data.dependency_hierarchy && (
+        {data.hierarchy && (
           <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-4 mb-8">
             <div className="bg-surface-1 rounded-lg p-4 border border-default">
               <h3 className="text-sm font-medium text-subtle mb-2">
                 Basic Components
               </h3>
               <p className="text-xl font-bold text-success">
-                {data.dependency_hierarchy.basic.count}
+                {data.hierarchy.basic}
               </p>
               <p className="text-xs text-subtle">Base components</p>
             </div>
@@ -569,7 +773,7 @@ export const ComponentAuditViewer: React.FC = () => {
                 Simple Components
               </h3>
               <p className="text-xl font-bold text-info">
-                {data.dependency_hierarchy.simple.count}
+                {data.hierarchy.simple}
               </p>
               <p className="text-xs text-subtle">1-3 dependencies</p>
             </div>
@@ -578,7 +782,7 @@ export const ComponentAuditViewer: React.FC = () => {
                 Medium Components
               </h3>
               <p className="text-xl font-bold text-warning">
-                {data.dependency_hierarchy.medium.count}
+                {data.hierarchy.medium}
               </p>
               <p className="text-xs text-subtle">4-6 dependencies</p>
             </div>
@@ -587,7 +791,7 @@ export const ComponentAuditViewer: React.FC = () => {
                 Complex Components
               </h3>
               <p className="text-xl font-bold text-danger">
-                {data.dependency_hierarchy.complex.count}
+                {data.hierarchy.complex}
               </p>
               <p className="text-xs text-subtle">7+ dependencies</p>
             </div>
@@ -854,8 +1058,8 @@ export const ComponentAuditViewer: React.FC = () => {
                   </tr>
                 </thead>
                 <tbody>
-                  {filteredComponents.map(([key, component]) => (
-                    <React.Fragment key={key}>
+                  {filteredComponents.map((component) => (
+                    <React.Fragment key={component.key}>
                       <tr className="border-b border-default hover:bg-surface-2 transition-colors">
                         <td className="px-4 py-3">
                           <div>
@@ -895,21 +1099,24 @@ export const ComponentAuditViewer: React.FC = () => {
                         </td>
                         <td className="px-4 py-3">
                           <div className="max-w-[120px]">
-                            {component.dependencies &&
-                            component.dependencies.length > 0 ? (
+                            {component.dependency_count > 0 ? (
                               <div className="flex flex-wrap gap-1">
-                                {component.dependencies
-                                  .slice(0, 3)
-                                  .map((dep, idx) => (
-                                    <span className="px-1.5 py-0.5 bg-accent-rgb/10 text-accent-600 dark:text-accent-400 rounded text-xs" key={idx} title={dep}>
+                                {component.dependencies_preview.map(
+                                  (dep, idx) => (
+                                    <span
+                                      className="px-1.5 py-0.5 bg-accent-rgb/10 text-accent-600 dark:text-accent-400 rounded text-xs"
+                                      key={idx}
+                                      title={dep}
+                                    >
                                       {dep.length > 10
                                         ? dep.substring(0, 10) + '...'
                                         : dep}
                                     </span>
-                                  ))}
-                                {component.dependencies.length > 3 && (
+                                  )
+                                )}
+                                {component.dependency_count > 3 && (
                                   <span className="px-1.5 py-0.5 bg-surface-2 text-subtle rounded text-xs">
-                                    +{component.dependencies.length - 3}
+                                    +{component.dependency_count - 3}
                                   </span>
                                 )}
                               </div>
@@ -937,105 +1144,24 @@ export const ComponentAuditViewer: React.FC = () => {
                           <Button
                             type="subtle"
                             size="small"
-                            onClick={() => toggleRowExpansion(key)}
+                            onClick={() => toggleRowExpansion(component)}
                             className="text-sm"
                           >
-                            {expandedRows.has(key) ? 'Hide' : 'Details'}
+                            {expandedRows.has(component.key)
+                              ? 'Hide'
+                              : 'Details'}
                           </Button>
                         </td>
                       </tr>
 
-                      {expandedRows.has(key) && (
+                      {expandedRows.has(component.key) && (
                         <tr className="bg-surface-2 border-b border-default">
                           <td colSpan={10} className="px-4 py-4">
-                            <div className="space-y-3">
-                              <div>
-                                <h4 className="text-sm font-medium text-strong mb-1">
-                                  Notes
-                                </h4>
-                                <p className="text-sm text-main bg-surface-1 rounded p-3">
-                                  {component.notes}
-                                </p>
-                              </div>
-
-                              {component.hooks.length > 0 && (
-                                <div>
-                                  <h4 className="text-sm font-medium text-strong mb-1">
-                                    Identified Hooks
-                                  </h4>
-                                  <div className="flex flex-wrap gap-2">
-                                    {component.hooks.map((hook, index) => (
-                                      <span
-                                        key={index}
-                                        className="px-2 py-1 bg-accent-rgb/10 text-accent-600 dark:text-accent-400 rounded text-xs"
-                                      >
-                                        {hook}
-                                      </span>
-                                    ))}
-                                  </div>
-                                </div>
-                              )}
-
-                              {component.dependencies &&
-                                component.dependencies.length > 0 && (
-                                  <div>
-                                    <h4 className="text-sm font-medium text-strong mb-1">
-                                      Dependencies (
-                                      {component.dependencies.length})
-                                    </h4>
-                                    <div className="flex flex-wrap gap-2">
-                                      {component.dependencies.map(
-                                        (dep, index) => (
-                                          <span
-                                            key={index}
-                                            className="px-2 py-1 bg-blue-50 dark:bg-blue-900/20 text-blue-600 dark:text-blue-400 rounded text-xs border border-blue-200 dark:border-blue-800"
-                                          >
-                                            {dep}
-                                          </span>
-                                        )
-                                      )}
-                                    </div>
-                                  </div>
-                                )}
-
-                              {component.dependency_level !== undefined && (
-                                <div>
-                                  <h4 className="text-sm font-medium text-strong mb-1">
-                                    Build Information
-                                  </h4>
-                                  <div className="grid grid-cols-1 md:grid-cols-3 gap-2 text-xs">
-                                    <div>
-                                      <span className="text-subtle">
-                                        Dependency Level:
-                                      </span>{' '}
-                                      <span className="font-medium">
-                                        {component.dependency_level}
-                                      </span>
-                                    </div>
-                                    <div>
-                                      <span className="text-subtle">
-                                        Complexity:
-                                      </span>{' '}
-                                      <span className="font-medium capitalize">
-                                        {component.complexity_category}
-                                      </span>
-                                    </div>
-                                    <div>
-                                      <span className="text-subtle">
-                                        Dependencies:
-                                      </span>{' '}
-                                      <span className="font-medium">
-                                        {component.dependencies?.length || 0}
-                                      </span>
-                                    </div>
-                                  </div>
-                                </div>
-                              )}
-
-                              <div className="text-xs text-subtle">
-                                Last updated: {component.updated}
-                              </div>
-                            </div>
+                            <ComponentDetailsPanel
+                              component={component}
+                              detail={details[component.key]}
+                              failed={detailErrors.has(component.shard)}
+                            />
                           </td>
                         </tr>
                       )}
@@ -1063,65 +1189,35 @@ export const ComponentAuditViewer: React.FC = () => {
               <div className="grid grid-cols-2 md:grid-cols-5 gap-4">
                 <div className="text-center">
                   <div className="text-2xl font-bold text-green-500">
-                    {
-                      filteredComponents.filter(
-                        ([, c]) =>
-                          c.complexity_category === 'basic' &&
-                          c.primitives === 'done' &&
-                          c.native === 'todo'
-                      ).length
-                    }
+                    {roadmapGroups.ready_now.length}
                   </div>
                   <div className="text-xs text-subtle">Ready Now</div>
                   <div className="text-xs text-green-600">Start Here</div>
                 </div>
                 <div className="text-center">
                   <div className="text-2xl font-bold text-blue-500">
-                    {
-                      filteredComponents.filter(
-                        ([, c]) =>
-                          c.complexity_category === 'simple' &&
-                          c.primitives === 'done' &&
-                          ['todo', 'in_progress'].includes(c.native)
-                      ).length
-                    }
+                    {roadmapGroups.next_phase.length}
                   </div>
                   <div className="text-xs text-subtle">Next Phase</div>
                   <div className="text-xs text-blue-600">1-3 deps</div>
                 </div>
                 <div className="text-center">
                   <div className="text-2xl font-bold text-orange-500">
-                    {
-                      filteredComponents.filter(
-                        ([, c]) =>
-                          c.complexity_category === 'medium' &&
-                          ['todo', 'in_progress'].includes(c.native)
-                      ).length
-                    }
+                    {roadmapGroups.medium_complexity.length}
                   </div>
                   <div className="text-xs text-subtle">Medium Term</div>
                   <div className="text-xs text-orange-600">4-6 deps</div>
                 </div>
                 <div className="text-center">
                   <div className="text-2xl font-bold text-red-500">
-                    {
-                      filteredComponents.filter(
-                        ([, c]) =>
-                          c.complexity_category === 'complex' &&
-                          ['todo', 'in_progress'].includes(c.native)
-                      ).length
-                    }
+                    {roadmapGroups.complex_components.length}
                   </div>
                   <div className="text-xs text-subtle">Complex</div>
                   <div className="text-xs text-red-600">7+ deps</div>
                 </div>
                 <div className="text-center">
                   <div className="text-2xl font-bold text-accent">
-                    {
-                      filteredComponents.filter(([, c]) =>
-                        ['done', 'ready'].includes(c.native)
-                      ).length
-                    }
+                    {roadmapGroups.completed.length}
                   </div>
                   <div className="text-xs text-subtle">Done</div>
                   <div className="text-xs text-accent">Complete</div>
@@ -1130,207 +1226,143 @@ export const ComponentAuditViewer: React.FC = () => {
             </div>
 
             {/* Priority Phases */}
-            {(() => {
-              const roadmapPhases = [
-                {
-                  id: 'ready_now',
-                  title: '🚀 Ready to Build Now',
-                  subtitle:
-                    'Basic components with no dependencies - Start here!',
-                  filter: (comp: ComponentAudit) =>
-                    comp.complexity_category === 'basic' &&
-                    comp.primitives === 'done' &&
-                    comp.native === 'todo',
-                  color: 'bg-green-500/10 border-green-500/30',
-                  urgency: 'high',
-                },
-                {
-                  id: 'next_phase',
-                  title: '⚡ Next Phase - Simple Components',
-                  subtitle:
-                    'Components with 1-3 dependencies - Build after basics',
-                  filter: (comp: ComponentAudit) =>
-                    comp.complexity_category === 'simple' &&
-                    comp.primitives === 'done' &&
-                    ['todo', 'in_progress'].includes(comp.native),
-                  color: 'bg-blue-500/10 border-blue-500/30',
-                  urgency: 'medium',
-                },
-                {
-                  id: 'medium_complexity',
-                  title: '🔧 Medium Complexity',
-                  subtitle: 'Components with 4-6 dependencies - Plan carefully',
-                  filter: (comp: ComponentAudit) =>
-                    comp.complexity_category === 'medium' &&
-                    ['todo', 'in_progress'].includes(comp.native),
-                  color: 'bg-orange-500/10 border-orange-500/30',
-                  urgency: 'low',
-                },
-                {
-                  id: 'complex_components',
-                  title: '🎯 Complex Components',
-                  subtitle: 'Components with 7+ dependencies - Tackle last',
-                  filter: (comp: ComponentAudit) =>
-                    comp.complexity_category === 'complex' &&
-                    ['todo', 'in_progress'].includes(comp.native),
-                  color: 'bg-red-500/10 border-red-500/30',
-                  urgency: 'low',
-                },
-                {
-                  id: 'completed',
-                  title: '✅ Completed & Ready',
-                  subtitle: 'Native implementation complete',
-                  filter: (comp: ComponentAudit) =>
-                    ['done', 'ready'].includes(comp.native),
-                  color: 'bg-accent-rgb/10 border-accent-rgb/30',
-                  urgency: 'done',
-                },
-              ];
-
-              return roadmapPhases.map((phase) => {
-                const components = filteredComponents.filter(([, comp]) =>
-                  phase.filter(comp)
-                );
-
-                if (components.length === 0) return null;
-
-                return (
-                  <div
-                    key={phase.id}
-                    className={`rounded-lg border-2 ${phase.color} overflow-hidden`}
-                  >
-                    <div className="p-6">
-                      <div className="flex justify-between items-start mb-6">
-                        <div className="flex-1 pr-4">
-                          <span className="text-xl font-semibold block mb-2">
-                            {phase.title}
-                          </span>
-                          <span className="text-sm text-subtle block">
-                            {phase.subtitle}
-                          </span>
-                        </div>
-                        <div className="text-right">
-                          <div className="text-2xl font-bold text-accent">
-                            {components.length}
-                          </div>
-                          <div className="text-xs text-subtle">components</div>
-                        </div>
-                      </div>
+            {ROADMAP_PHASES.map((phase) => {
+              const components = roadmapGroups[phase.id];
 
-                      {/* Action Items List */}
-                      <div className="space-y-3">
-                        {components.slice(0, 8).map(([key, component]) => (
-                          <div
-                            key={key}
-                            className="flex items-center justify-between p-4 bg-surface-0 rounded-lg border border-default hover:bg-surface-1 transition-colors"
-                          >
-                            <div className="flex-1">
-                              <div className="flex items-center gap-4 mb-2">
-                                <span className="text-sm font-medium">
-                                  {component.name}
-                                </span>
+              if (components.length === 0) return null;
 
-                                {/* Status indicators */}
-                                <div className="flex gap-2">
-                                  <StatusBadge
-                                    status={component.native}
-                                    context="native"
-                                  />
-                                  {component.dependencies &&
-                                    component.dependencies.length > 0 && (
-                                      <span className="text-xs bg-accent-rgb/10 text-accent px-2 py-1 rounded">
-                                        {component.dependencies.length} deps
-                                      </span>
-                                    )}
-                                </div>
-                              </div>
+              return (
+                <div
+                  key={phase.id}
+                  className={`rounded-lg border-2 ${phase.color} overflow-hidden`}
+                >
+                  <div className="p-6">
+                    <div className="flex justify-between items-start mb-6">
+                      <div className="flex-1 pr-4">
+                        <span className="text-xl font-semibold block mb-2">
+                          {phase.title}
+                        </span>
+                        <span className="text-sm text-subtle block">
+                          {phase.subtitle}
+                        </span>
+                      </div>
+                      <div className="text-right">
+                        <div className="text-2xl font-bold text-accent">
+                          {components.length}
+                        </div>
+                        <div className="text-xs text-subtle">components</div>
+                      </div>
+                    </div>
 
-                              <span className="text-xs text-subtle line-clamp-1 mb-2">
-                                {component.description}
+                    {/* Action Items List */}
+                    <div className="space-y-3">
+                      {components.slice(0, 8).map((component) => (
+                        <div
+                          key={component.key}
+                          className="flex items-center justify-between p-4 bg-surface-0 rounded-lg border border-default hover:bg-surface-1 transition-colors"
+                        >
+                          <div className="flex-1">
+                            <div className="flex items-center gap-4 mb-2">
+                              <span className="text-sm font-medium">
+                                {component.name}
                               </span>
 
-                              {/* Dependencies preview */}
-                              {component.dependencies &&
-                                component.dependencies.length > 0 && (
-                                  <div className="flex gap-1 flex-wrap">
-                                    <span className="text-xs text-subtle">
-                                      Needs:
-                                    </span>
-                                    {component.dependencies
-                                      .slice(0, 3)
-                                      .map((dep) => (
-                                        <span
-                                          key={dep}
-                                          className="text-xs bg-surface-2 px-1.5 py-0.5 rounded"
-                                        >
-                                          {dep}
-                                        </span>
-                                      ))}
-                                    {component.dependencies.length > 3 && (
-                                      <span className="text-xs text-subtle">
-                                        +{component.dependencies.length - 3}
-                                      </span>
-                                    )}
-                                  </div>
-                                )}
-                            </div>
-
-                            <div className="flex items-center gap-3 ml-4">
-                              {/* Progress dots */}
-                              <div
-                                className="flex gap-1"
-                                title="Primitives • Logic • Native"
-                              >
-                                <div
-                                  className={`w-2 h-2 rounded-full ${
-                                    component.primitives === 'done'
-                                      ? 'bg-green-500'
-                                      : 'bg-gray-300'
-                                  }`}
-                                />
-                                <div
-                                  className={`w-2 h-2 rounded-full ${
-                                    component.logic_extraction === 'done'
-                                      ? 'bg-green-500'
-                                      : 'bg-gray-300'
-                                  }`}
-                                />
-                                <div
-                                  className={`w-2 h-2 rounded-full ${
-                                    ['done', 'ready'].includes(component.native)
-                                      ? 'bg-green-500'
-                                      : 'bg-gray-300'
-                                  }`}
+                              {/* Status indicators */}
+                              <div className="flex gap-2">
+                                <StatusBadge
+                                  status={component.native}
+                                  context="native"
                                 />
+                                {component.dependency_count > 0 && (
+                                  <span className="text-xs bg-accent-rgb/10 text-accent px-2 py-1 rounded">
+                                    {component.dependency_count} deps
+                                  </span>
+                                )}
                               </div>
+                            </div>
 
-                              <span className="text-xs text-subtle w-8 text-right">
-                                L{component.dependency_level || 0}
-                              </span>
+                            <span className="text-xs text-subtle line-clamp-1 mb-2">
+                              {component.description}
+                            </span>
 
-                              {phase.urgency === 'high' && (
-                                <span className="text-xs bg-green-100 text-green-700 px-2 py-1 rounded font-medium">
-                                  BUILD
+                            {/* Dependencies preview */}
+                            {component.dependency_count > 0 && (
+                              <div className="flex gap-1 flex-wrap">
+                                <span className="text-xs text-subtle">
+                                  Needs:
                                 </span>
-                              )}
-                            </div>
+                                {component.dependencies_preview.map((dep) => (
+                                  <span
+                                    key={dep}
+                                    className="text-xs bg-surface-2 px-1.5 py-0.5 rounded"
+                                  >
+                                    {dep}
+                                  </span>
+                                ))}
+                                {component.dependency_count > 3 && (
+                                  <span className="text-xs text-subtle">
+                                    +{component.dependency_count - 3}
+                                  </span>
+                                )}
+                              </div>
+                            )}
                           </div>
-                        ))}
 
-                        {components.length > 8 && (
-                          <div className="text-center py-3">
-                            <span className="text-sm text-subtle">
-                              +{components.length - 8} more components in this
-                              phase
+                          <div className="flex items-center gap-3 ml-4">
+                            {/* Progress dots */}
+                            <div
+                              className="flex gap-1"
+                              title="Primitives • Logic • Native"
+                            >
+                              <div
+                                className={`w-2 h-2 rounded-full ${
+                                  component.primitives === 'done'
+                                    ? 'bg-green-500'
+                                    : 'bg-gray-300'
+                                }`}
+                              />
+                              <div
+                                className={`w-2 h-2 rounded-full ${
+                                  component.logic_extraction === 'done'
+                                    ? 'bg-green-500'
+                                    : 'bg-gray-300'
+                                }`}
+                              />
+                              <div
+                                className={`w-2 h-2 rounded-full ${
+                                  ['done', 'ready'].includes(component.native)
+                                    ? 'bg-green-500'
+                                    : 'bg-gray-300'
+                                }`}
+                              />
+                            </div>
+
+                            <span className="text-xs text-subtle w-8 text-right">
+                              L{component.dependency_level || 0}
                             </span>
+
+                            {phase.urgency === 'high' && (
+                              <span className="text-xs bg-green-100 text-green-700 px-2 py-1 rounded font-medium">
+                                BUILD
+                              </span>
+                            )}
                           </div>
-                        )}
-                      </div>
+                        </div>
+                      ))}
+
+                      {components.length > 8 && (
+                        <div className="text-center py-3">
+                          <span className="text-sm text-subtle">
+                            +{components.length - 8} more components in this
+                            phase
+                          </span>
+                        </div>
+                      )}
                     </div>
                   </div>
-                );
-              });
-            })()}
+                </div>
+              );
+            })}
 
             {/* Build Strategy Summary */}
             <div className="bg-surface-1 rounded-lg p-6 border border-default">
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Synthetic audit generator and benchmark suite for update_audit.py.
+
+Usage Examples:
+  # Write a seeded 10k-component audit for manual experiments
+  python3 benchmark_audit.py --generate 10000 --output /tmp/audit-10k.json
+
+  # Time every phase at the default sizes and compare with the baseline
+  python3 benchmark_audit.py
+
+  # Also check how the phases scale up to 100k components
+  python3 benchmark_audit.py --sizes 1000,10000,100000
+
+  # Record new baseline numbers after an intentional performance change
+  python3 benchmark_audit.py --sizes 1000,10000,100000 --save-baseline
+"""
+
+import json
+import argparse
+import contextlib
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from update_audit import AuditUpdater, FIELD_CHOICES  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark-baseline.json')
+DEFAULT_THRESHOLD = 0.25
+# Phases faster than this are dominated by timer noise and never count as regressions
+MIN_REGRESSION_SECONDS = 0.005
+
+PHASES = ['load', 'graph_build', 'recalculate_all', 'update_statistics',
+          'bulk_update', 'validate', 'save']
+
+
+def generate_audit(size: int, seed: int = 0, fanout: int = 4, depth: int = 8,
+                   cycles: int = 0, dangling: int = 0) -> Dict:
+    """Build a deterministic audit document with size components.
+
+    Components are spread over depth layers and only depend on lower
+    layers, so the graph is acyclic until cycles back edges are added.
+    Each component gets 0..fanout dependencies; dangling extra
+    dependencies point at components that do not exist.
+    """
+    rng = random.Random(seed)
+    names = [f"Component{i:06d}.tsx" for i in range(size)]
+    layers: List[List[str]] = [[] for _ in range(max(depth, 1))]
+    layer_of = {}
+    for name in names:
+        layer = rng.randrange(len(layers))
+        layers[layer].append(name)
+        layer_of[name] = layer
+
+    # Dependencies come from the two layers below, which keeps levels close to depth
+    pools = [[n for lower in layers[max(0, layer - 2):layer] for n in lower] for layer in range(len(layers))]
+
+    components = {}
+    for name in names:
+        layer = layer_of[name]
+        pool = pools[layer]
+        deps = sorted(rng.sample(pool, min(len(pool), rng.randint(0, fanout))))
+        stem = name[:-len('.tsx')]
+        components[name] = {
+            'name': stem,
+            'path': f"src/components/synthetic/layer{layer}/{name}",
+            'description': f"Synthetic component {stem}",
+            'category': rng.choice(FIELD_CHOICES['category']),
+            'used': rng.choice(FIELD_CHOICES['used']),
+            'primitives': rng.choice(FIELD_CHOICES['primitives']),
+            'logic_extraction': rng.choice(FIELD_CHOICES['logic_extraction']),
+            'hooks': [f"use{stem}"] if rng.random() < 0.3 else [],
+            'native': rng.choice(FIELD_CHOICES['native']),
+            'notes': '',
+            'updated': '2025-01-01',
+            'dependencies': [d[:-len('.tsx')] for d in deps],
+            'dependency_level': 0,
+            'complexity_category': 'basic',
+        }
+
+    # Walk down from a component through its dependencies; an edge from the
+    # node reached back up to where the walk started closes a cycle
+    heads = [name for name in names if components[name]['dependencies']]
+    for _ in range(cycles if heads else 0):
+        head = rng.choice(heads)
+        node = head
+        for _ in range(rng.randint(1, max(depth, 1))):
+            deps = components[node]['dependencies']
+            if not deps:
+                break
+            node = f"{rng.choice(deps)}.tsx"
+        stem = head[:-len('.tsx')]
+        if node != head and stem not in components[node]['dependencies']:
+            components[node]['dependencies'].append(stem)
+    for i in range(dangling):
+        components[rng.choice(names)]['dependencies'].append(f"Missing{i:05d}")
+
+    return {
+        'components': components,
+        'stats': {},
+        'metadata': {
+            'audit_version': '1.0',
+            'synthetic': {'size': size, 'seed': seed, 'fanout': fanout, 'depth': depth,
+                          'cycles': cycles, 'dangling': dangling},
+        },
+        'dependency_hierarchy': {},
+        'mobile_strategy': {},
+    }
+
+
+def run_phases(audit_path: str, bulk_fraction: float = 0.01) -> Dict[str, float]:
+    """Run every benchmarked phase once against the audit at audit_path"""
+    timings = {}
+
+    def timed(phase: str, action: Callable):
+        start = time.perf_counter()
+        result = action()
+        timings[phase] = time.perf_counter() - start
+        return result
+
+    updater = AuditUpdater(audit_path)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        timed('load', updater.load_audit)
+        timed('graph_build', updater.build_dependency_graph)
+        timed('recalculate_all', updater.recalculate_all_components)
+        timed('update_statistics', updater.update_statistics)
+
+        names = list(updater.data['components'])
+        targets = random.Random(len(names)).sample(names, max(1, int(len(names) * bulk_fraction)))
+        timed('bulk_update', lambda: updater.bulk_update(targets, {'native': 'done', 'primitives': 'done'}))
+        timed('validate', updater.validate_and_fix)
+        timed('save', updater.save_audit)
+    return timings
+
+
+def benchmark(sizes: List[int], repeat: int, generator_args: Dict) -> Dict[str, Dict[str, float]]:
+    """Median seconds per phase for each size"""
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='audit-bench-')
+    try:
+        for size in sizes:
+            audit_path = os.path.join(workdir, 'audit.json')
+            payload = json.dumps(generate_audit(size, **generator_args), ensure_ascii=False, indent=2)
+            runs = []
+            for _ in range(repeat):
+                with open(audit_path, 'w') as f:
+                    f.write(payload)
+                for sidecar in ('audit-journal.jsonl', 'audit-snapshot.json'):
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(os.path.join(workdir, sidecar))
+                runs.append(run_phases(audit_path))
+            results[str(size)] = {phase: round(statistics.median(run[phase] for run in runs), 6)
+                                  for phase in PHASES}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def expected_timings(results: Dict, baseline: Dict, absolute: bool = False) -> Dict[str, Dict[str, float]]:
+    """Seconds each measured phase should take according to the baseline.
+
+    Baselines are usually recorded on another machine, so by default only
+    how each phase scales is compared: the smallest size measured in both
+    runs is the reference, and a larger size is expected to take the
+    reference's time multiplied by the baseline's ratio between the two
+    sizes. The reference size itself is not checked. With absolute=True the
+    baseline seconds are used as they are, which only makes sense for a
+    baseline recorded on this machine.
+    """
+    recorded = baseline.get('results', {})
+    if absolute:
+        return {size: recorded[size] for size in results if size in recorded}
+    common = sorted((size for size in results if size in recorded), key=int)
+    if not common:
+        return {}
+    reference = common[0]
+    expected = {}
+    for size in common[1:]:
+        expected[size] = {
+            phase: results[reference][phase] * recorded[size][phase] / recorded[reference][phase]
+            for phase in results[size]
+            if recorded[size].get(phase) and recorded[reference].get(phase)
+        }
+    return expected
+
+
+def compare(results: Dict, baseline: Dict, absolute: bool = False) -> List[str]:
+    """Phases slower than the baseline expects by more than their threshold"""
+    thresholds = baseline.get('thresholds', {})
+    default = thresholds.get('default', DEFAULT_THRESHOLD)
+    regressions = []
+    for size, phases in expected_timings(results, baseline, absolute).items():
+        for phase, before in phases.items():
+            seconds = results[size][phase]
+            limit = before * (1 + thresholds.get(phase, default))
+            if seconds > limit and seconds - before > MIN_REGRESSION_SECONDS:
+                regressions.append(f"{size} components, {phase}: {seconds:.4f}s vs expected "
+                                   f"{before:.4f}s (+{(seconds / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def print_results(results: Dict, baseline: Optional[Dict], absolute: bool = False):
+    expected = expected_timings(results, baseline, absolute) if baseline else {}
+    header = f"{'phase':<18}" + ''.join(f"{size + ' comps':>22}" for size in results)
+    print(header)
+    print('-' * len(header))
+    for phase in PHASES:
+        cells = []
+        for size, phases in results.items():
+            cell = f"{phases[phase]:.4f}s"
+            before = expected.get(size, {}).get(phase)
+            if before:
+                cell += f" ({(phases[phase] / before - 1) * 100:+.0f}%)"
+            cells.append(f"{cell:>22}")
+        print(f"{phase:<18}" + ''.join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic audits and benchmark update_audit.py')
+    parser.add_argument('--generate', type=int, metavar='N', help='Write a synthetic audit with N components and exit')
+    parser.add_argument('--output', help='Destination for --generate (default: stdout)')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help='Comma-separated component counts to benchmark')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the generator')
+    parser.add_argument('--fanout', type=int, default=4, help='Maximum dependencies per component')
+    parser.add_argument('--depth', type=int, default=8, help='Number of dependency layers')
+    parser.add_argument('--cycles', type=int, default=5, help='Back edges injected to form cycles')
+    parser.add_argument('--dangling', type=int, default=20, help='Dependencies on components that do not exist')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per size; the median is reported')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='Write these results as the new baseline')
+    parser.add_argument('--threshold', type=float, help='Allowed slowdown as a fraction (default: from baseline, else 0.25)')
+    parser.add_argument('--absolute', action='store_true',
+                        help='Compare raw seconds instead of scaling (for a baseline recorded on this machine)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    args = parser.parse_args()
+    generator_args = {'seed': args.seed, 'fanout': args.fanout, 'depth': args.depth,
+                      'cycles': args.cycles, 'dangling': args.dangling}
+
+    if args.generate:
+        text = json.dumps(generate_audit(args.generate, **generator_args), ensure_ascii=False, indent=2)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(text)
+            print(f"✅ Wrote {args.generate} synthetic components to {args.output}")
+        else:
+            print(text)
+        return 0
+
+    try:
+        sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    except ValueError:
+        print(f"❌ Invalid --sizes: {args.sizes}")
+        return 1
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('generator') != generator_args:
+            print("⚠️  Baseline was recorded with different generator settings; comparison skipped")
+            baseline = None
+
+    results = benchmark(sizes, args.repeat, generator_args)
+
+    if args.json:
+        print(json.dumps({'results': results}, indent=2))
+    else:
+        print_results(results, baseline, args.absolute)
+
+    if args.save_baseline:
+        thresholds = (baseline or {}).get('thresholds', {'default': DEFAULT_THRESHOLD})
+        if args.threshold is not None:
+            thresholds['default'] = args.threshold
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'recorded': datetime.now().strftime('%Y-%m-%d'),
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'generator': generator_args,
+                'repeat': args.repeat,
+                'thresholds': thresholds,
+                'results': results,
+            }, f, indent=2)
+            f.write('\n')
+        print(f"✅ Saved baseline to {args.baseline}")
+        return 0
+
+    if baseline:
+        if args.threshold is not None:
+            baseline.setdefault('thresholds', {})['default'] = args.threshold
+        regressions = compare(results, baseline, args.absolute)
+        if regressions:
+            print(f"❌ {len(regressions)} regressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            return 1
+        print(f"✅ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,893 @@
+#!/usr/bin/env python3
+"""
+Tests for update_audit.py.
+
+Usage:
+  python3 -m pytest src/dev/components-audit
+"""
+
+import copy
+import functools
+import hashlib
+import io
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import benchmark_audit  # noqa: E402
+import update_audit as ua  # noqa: E402
+
+AuditUpdater = ua.AuditUpdater
+
+
+def component(name: str, deps=(), **fields) -> dict:
+    comp = {
+        'name': name,
+        'path': f"src/components/fixture/{name}.tsx",
+        'description': f"{name} fixture",
+        'category': 'shared',
+        'used': 'yes',
+        'primitives': 'done',
+        'logic_extraction': 'done',
+        'hooks': [],
+        'native': 'todo',
+        'notes': '',
+        'updated': '2025-01-01',
+        'dependencies': list(deps),
+        'dependency_level': 0,
+        'complexity_category': 'basic',
+    }
+    comp.update(fields)
+    return comp
+
+
+def fixture_audit() -> dict:
+    return {
+        'components': {
+            'Icon.tsx': component('Icon', native='done'),
+            'Button.tsx': component('Button', ['Icon']),
+            'Modal.tsx': component('Modal', ['Button', 'Icon'], primitives='todo'),
+            'Dialog.tsx': component('Dialog', ['Modal']),
+        },
+        'stats': {},
+        'metadata': {'audit_version': '1.0'},
+        'dependency_hierarchy': {},
+        'mobile_strategy': {},
+    }
+
+
+def write_audit(path, audit: dict):
+    with open(path, 'wb') as f:
+        f.write(json.dumps(audit, ensure_ascii=False, indent=2).encode('utf-8'))
+
+
+@pytest.fixture
+def audit_path(tmp_path):
+    path = tmp_path / 'audit.json'
+    write_audit(path, fixture_audit())
+    return str(path)
+
+
+def load(audit_path: str, **kwargs) -> ua.AuditUpdater:
+    updater = ua.AuditUpdater(audit_path, **kwargs)
+    updater.load_audit()
+    return updater
+
+
+def read(audit_path: str) -> dict:
+    with open(audit_path, 'rb') as f:
+        return json.loads(f.read())
+
+
+def cli(monkeypatch, audit_path: str, *argv: str) -> int:
+    """Run update_audit.py's command line against the fixture audit"""
+    monkeypatch.setattr(ua, 'AuditUpdater', functools.partial(AuditUpdater, audit_path))
+    monkeypatch.setattr(sys, 'argv', ['update_audit.py', *argv])
+    return ua.main()
+
+
+def test_levels_of_a_deep_chain_need_no_recursion(tmp_path):
+    audit = fixture_audit()
+    audit['components'] = {f"C{i}.tsx": component(f"C{i}", [f"C{i - 1}"] if i else []) for i in range(5000)}
+    path = tmp_path / 'audit.json'
+    write_audit(path, audit)
+    updater = load(str(path))
+
+    updater.recalculate_all_components()
+    assert [comp['dependency_level'] for comp in updater.data['components'].values()] == list(range(5000))
+
+
+def test_cycle_members_share_a_level_and_are_reported(audit_path, capsys):
+    updater = load(audit_path)
+    components = updater.data['components']
+    components['Popover.tsx'] = component('Popover', ['Tooltip', 'Icon'])
+    components['Tooltip.tsx'] = component('Tooltip', ['Popover'])
+    components['Toast.tsx'] = component('Toast', ['Tooltip'])
+
+    updater.recalculate_all_components()
+    levels = {name: comp['dependency_level'] for name, comp in components.items()}
+    assert levels == {'Icon.tsx': 0, 'Button.tsx': 1, 'Modal.tsx': 2, 'Dialog.tsx': 3,
+                      'Popover.tsx': 1, 'Tooltip.tsx': 1, 'Toast.tsx': 2}
+    assert updater.graph.cycles == [['Popover.tsx', 'Tooltip.tsx']]
+    assert 'Dependency cycle (2 components): Popover.tsx, Tooltip.tsx' in capsys.readouterr().out
+
+
+def test_edits_refresh_the_levels_of_every_dependent(audit_path):
+    updater = load(audit_path)
+    updater.recalculate_all_components()
+
+    updater.update_component('Button.tsx', {'add_deps': 'Spinner'})
+    # Spinner is only referenced until it is created; then its referrers move up
+    updater.update_component('Spinner.tsx', {'add_deps': 'Icon'})
+    levels = {name: comp['dependency_level'] for name, comp in updater.data['components'].items()}
+    assert levels == {'Icon.tsx': 0, 'Spinner.tsx': 1, 'Button.tsx': 2, 'Modal.tsx': 3, 'Dialog.tsx': 4}
+
+    updater.bulk_update(['Dialog.tsx', 'Modal.tsx'], {'set_deps': 'Icon'})
+    levels = {name: comp['dependency_level'] for name, comp in updater.data['components'].items()}
+    assert levels == {'Icon.tsx': 0, 'Spinner.tsx': 1, 'Button.tsx': 2, 'Modal.tsx': 1, 'Dialog.tsx': 1}
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_incremental_levels_match_a_full_recalculation(tmp_path, seed):
+    rng = random.Random(seed)
+    names = [f"C{i}" for i in range(15)]
+    audit = fixture_audit()
+    audit['components'] = {f"{name}.tsx": component(name) for name in names[:10]}
+    path = tmp_path / 'audit.json'
+    write_audit(path, audit)
+    updater = load(str(path))
+    updater.recalculate_all_components()
+
+    for _ in range(30):
+        targets = [f"{name}.tsx" for name in rng.sample(names, rng.randint(1, 3))]
+        deps = ','.join(rng.sample(names, rng.randint(0, 3)))
+        op = rng.choice(['add_deps', 'remove_deps', 'set_deps'])
+        if len(targets) == 1:
+            updater.update_component(targets[0], {op: deps})
+        else:
+            updater.bulk_update(targets, {op: deps})
+
+    fresh = AuditUpdater(str(path))
+    fresh.data = copy.deepcopy(updater.data)
+    fresh.recalculate_all_components()
+    assert ({name: comp['dependency_level'] for name, comp in updater.data['components'].items()}
+            == {name: comp['dependency_level'] for name, comp in fresh.data['components'].items()})
+
+
+def write_source(root, rel_path: str, source: str):
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(source, encoding='utf-8')
+
+
+MODAL_SOURCE = '''import React from 'react';
+import { Button } from './Button';
+import Icon, { type IconProps } from '@/components/fixture/Icon';
+import { useDisclosure } from '../hooks/useDisclosure';
+import { useState } from 'react';
+import './Modal.scss';
+
+export function Modal(props: IconProps) {
+  const ref = useRef<Button>(null);
+  const { open } = useDisclosure();
+  const [shown] = useState(false);
+  return <Button onClick={open}><Icon /></Button>;
+}
+'''
+
+
+def test_extract_source_usage_keeps_local_components_and_hooks():
+    components, hooks = ua.extract_source_usage(MODAL_SOURCE)
+    # React's own hook and the `useRef<Button>` generic are not usage
+    assert components == ['Button', 'Icon']
+    assert hooks == ['useDisclosure']
+
+
+def test_scan_merges_usage_into_entries_matched_by_path(audit_path, tmp_path):
+    write_source(tmp_path, 'src/components/fixture/Dialog.tsx', MODAL_SOURCE)
+    write_source(tmp_path, 'src/components/fixture/Dialog.test.tsx', "import { Toast } from './Toast';\n<Toast />\n")
+    write_source(tmp_path, 'src/components/other/Unknown.tsx', "import { Modal } from './Modal';\n<Modal />\n")
+    updater = load(audit_path)
+    updater.repo_root = str(tmp_path)
+
+    assert updater.scan_sources(jobs=1) == {'Dialog.tsx'}
+    dialog = updater.data['components']['Dialog.tsx']
+    # Existing dependencies are kept; scanned ones are appended
+    assert dialog['dependencies'] == ['Modal', 'Button', 'Icon']
+    assert dialog['hooks'] == ['useDisclosure']
+    assert updater.data['components']['Modal.tsx']['dependencies'] == ['Button', 'Icon']
+    assert 'last_full_scan' in updater.data['metadata']
+
+
+def scan_with_cache(tmp_path, rel_paths):
+    cache = ua.ScanCache(str(tmp_path / '.audit-scan-cache.json')).load()
+    scanner = ua.SourceScanner(str(tmp_path), ua.DEFAULT_SCAN_SCOPE, jobs=1, cache=cache)
+    return scanner.scan(rel_paths, prune=True), cache
+
+
+def test_scan_cache_skips_unchanged_and_renamed_files(tmp_path):
+    button = "import { Icon } from './Icon';\nexport const Button = () => <Icon />;\n"
+    write_source(tmp_path, 'src/components/Button.tsx', button)
+    write_source(tmp_path, 'src/components/Modal.tsx', "import { Button } from './Button';\n<Button />\n")
+    usage, cache = scan_with_cache(tmp_path, ['src/components/Button.tsx', 'src/components/Modal.tsx'])
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    usage_again, cache = scan_with_cache(tmp_path, ['src/components/Button.tsx', 'src/components/Modal.tsx'])
+    assert (cache.hits, cache.misses) == (2, 0)
+    assert usage_again == usage
+
+    # A renamed file keeps its content hash; an edited one is parsed again
+    os.rename(tmp_path / 'src/components/Button.tsx', tmp_path / 'src/components/Buttons.tsx')
+    write_source(tmp_path, 'src/components/Modal.tsx', "import { Icon } from './Icon';\n<Icon />\n")
+    usage, cache = scan_with_cache(tmp_path, ['src/components/Buttons.tsx', 'src/components/Modal.tsx'])
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert usage['src/components/Modal.tsx'] == (['Icon'], [])
+    assert sorted(cache.files) == ['src/components/Buttons.tsx', 'src/components/Modal.tsx']
+
+
+def test_saving_an_unchanged_audit_does_not_touch_the_file(audit_path):
+    updater = load(audit_path)
+    updater.recalculate_all_components()
+    updater.update_statistics()
+    assert updater.save_audit()
+    saved = os.stat(audit_path).st_mtime_ns
+
+    updater = load(audit_path)
+    updater.recalculate_all_components()
+    updater.update_statistics()
+    assert not updater.save_audit()
+    assert os.stat(audit_path).st_mtime_ns == saved
+    # Writes go through a temp file that never outlives the save
+    assert not [name for name in os.listdir(os.path.dirname(audit_path)) if name.endswith('.tmp')]
+
+
+def test_minify_writes_compact_json_with_the_same_content(audit_path):
+    updater = load(audit_path)
+    updater.recalculate_all_components()
+    updater.save_audit()
+    expected = read(audit_path)
+
+    updater = load(audit_path)
+    assert updater.save_audit(minify=True)
+    with open(audit_path, 'rb') as f:
+        assert b'\n' not in f.read()
+    assert read(audit_path) == expected
+
+
+def test_undo_restores_the_audit_byte_for_byte(audit_path, monkeypatch):
+    assert not cli(monkeypatch, audit_path, '--stats-only')
+    with open(audit_path, 'rb') as f:
+        before = f.read()
+
+    assert not cli(monkeypatch, audit_path, '--component', 'Modal.tsx', '--primitives', 'done', '--add-deps', 'Toast')
+    assert not cli(monkeypatch, audit_path, '--component', 'Toast.tsx', '--description', 'New toast')
+    with open(audit_path, 'rb') as f:
+        assert f.read() != before
+
+    assert not cli(monkeypatch, audit_path, '--undo', '2')
+    with open(audit_path, 'rb') as f:
+        assert f.read() == before
+
+
+def test_as_of_replays_the_journal_from_its_snapshot(audit_path, monkeypatch, capsys):
+    assert not cli(monkeypatch, audit_path, '--component', 'Modal.tsx', '--primitives', 'done')
+    assert not cli(monkeypatch, audit_path, '--component', 'Toast.tsx', '--description', 'New toast')
+    saved = read(audit_path)
+    monkeypatch.undo()
+
+    updater = load(audit_path)
+    assert updater.reconstruct('2999-01-01')['components'] == saved['components']
+    with pytest.raises(ValueError):
+        updater.reconstruct('2000-01-01')
+
+    capsys.readouterr()
+    assert updater.show_history('Modal.tsx') >= 1
+    assert 'primitives: todo → done' in capsys.readouterr().out
+
+    # Compacting folds the entries into a snapshot that replays to the same audit
+    updater.compact_journal()
+    assert updater.show_history('Modal.tsx') == 0
+    assert load(audit_path).reconstruct('2999-01-01')['components'] == saved['components']
+
+
+def test_batch_with_a_bad_line_changes_nothing(audit_path, monkeypatch, capsys):
+    with open(audit_path, 'rb') as f:
+        before = f.read()
+    batch = '\n'.join([
+        json.dumps({'op': 'update', 'component': 'Modal.tsx', 'fields': {'primitives': 'done'}}),
+        '# comments and blank lines are skipped',
+        '',
+        json.dumps({'op': 'add_deps', 'component': 'Dialog.tsx', 'deps': 'Toast'}),
+        json.dumps({'op': 'update', 'component': 'Icon.tsx', 'fields': {'native': 'finished'}}),
+    ])
+    monkeypatch.setattr(sys, 'stdin', io.StringIO(batch))
+
+    assert cli(monkeypatch, audit_path, '--batch', '-') == 1
+    assert 'line 5' in capsys.readouterr().out
+    with open(audit_path, 'rb') as f:
+        assert f.read() == before
+    assert not os.path.exists(os.path.join(os.path.dirname(audit_path), 'audit-journal.jsonl'))
+
+    monkeypatch.setattr(sys, 'stdin', io.StringIO(batch.rsplit('\n', 1)[0]))
+    assert cli(monkeypatch, audit_path, '--batch', '-') == 0
+    components = read(audit_path)['components']
+    assert components['Modal.tsx']['primitives'] == 'done'
+    assert 'Toast' in components['Dialog.tsx']['dependencies']
+
+
+def test_stats_maintained_by_deltas_match_a_full_recount(audit_path):
+    updater = load(audit_path)
+    updater.update_statistics()
+
+    updater.update_component('Modal.tsx', {'primitives': 'done', 'native': 'ready', 'category': 'complex_refactor'})
+    updater.update_component('Toast.tsx', {'add_deps': 'Icon,Button,Modal,Dialog'})
+    updater.bulk_update(['Icon.tsx', 'Button.tsx'], {'used': 'no', 'native': 'done'})
+    updater.delete_component('Dialog.tsx')
+    updater.update_statistics()
+
+    recount = AuditUpdater(audit_path)
+    recount.data = copy.deepcopy(updater.data)
+    recount.update_statistics()
+    assert updater.data['stats'] == recount.data['stats']
+    assert updater.data['dependency_hierarchy'] == recount.data['dependency_hierarchy']
+    assert updater.data['stats']['total'] == 4
+
+
+def test_query_filters_sorts_and_projects(audit_path):
+    updater = load(audit_path)
+    updater.recalculate_all_components()
+
+    rows, fields = updater.query('primitives=done and level>=1', sort='-level', fields=['key', 'level'])
+    assert fields == ['key', 'level']
+    assert rows == [{'key': 'Dialog.tsx', 'level': 3}, {'key': 'Button.tsx', 'level': 1}]
+
+    rows, _ = updater.query('native=todo|done and deps~Icon')
+    assert [row['key'] for row in rows] == ['Button.tsx', 'Modal.tsx']
+
+    rows, _ = updater.query('native = todo | done and description~"Button fixture"')
+    assert [row['key'] for row in rows] == ['Button.tsx']
+
+
+@pytest.mark.parametrize('expression', ['level>high', 'colour=red', 'native', 'native=todo or used=yes',
+                                        'native=todo used=yes', 'description~modal dialog'])
+def test_query_rejects_malformed_conditions(expression):
+    with pytest.raises(ValueError):
+        ua.parse_query(expression)
+
+
+def test_plan_groups_remaining_work_into_waves(tmp_path):
+    audit = fixture_audit()
+    audit['components']['Popover.tsx'] = component('Popover', ['Tooltip', 'Icon'])
+    audit['components']['Tooltip.tsx'] = component('Tooltip', ['Popover'])
+    audit['components']['Toast.tsx'] = component('Toast', ['Tooltip'])
+    path = tmp_path / 'audit.json'
+    write_audit(path, audit)
+    updater = load(str(path))
+
+    plan = updater.build_plan()
+    assert plan['remaining'] == 6
+    # Icon is already native; the cycle shares the first wave
+    assert plan['waves'] == [['Button.tsx', 'Popover.tsx', 'Tooltip.tsx'], ['Modal.tsx', 'Toast.tsx'], ['Dialog.tsx']]
+    assert plan['critical_path'] == ['Button.tsx', 'Modal.tsx', 'Dialog.tsx']
+    assert plan['critical_path_length'] == 3
+    assert plan['cycles'] == [['Popover.tsx', 'Tooltip.tsx']]
+
+
+def test_impact_and_depends_on_follow_edits(audit_path):
+    updater = load(audit_path)
+    updater.update_component('Modal.tsx', {'add_deps': 'Portal'})
+    assert updater.transitive('Icon', 'ancestors') == ('Icon.tsx', ['Button.tsx', 'Modal.tsx', 'Dialog.tsx'])
+    assert updater.transitive('Dialog', 'descendants') == ('Dialog.tsx', ['Icon.tsx', 'Button.tsx', 'Modal.tsx'])
+    # Portal is outside the audit and answered through the components that use it
+    assert updater.transitive('Portal', 'ancestors') == ('Portal', ['Modal.tsx', 'Dialog.tsx'])
+    assert updater.transitive('Portal', 'descendants') == ('Portal', [])
+
+    updater.update_component('Button.tsx', {'remove_deps': 'Icon'})
+    assert updater.transitive('Icon', 'ancestors') == ('Icon.tsx', ['Modal.tsx', 'Dialog.tsx'])
+    with pytest.raises(ValueError):
+        updater.transitive('Missing', 'ancestors')
+
+
+def broken_audit() -> dict:
+    audit = fixture_audit()
+    components = audit['components']
+    for name, level in (('Button.tsx', 1), ('Modal.tsx', 2), ('Dialog.tsx', 3)):
+        components[name].update(dependency_level=level, complexity_category='simple')
+    del components['Modal.tsx']['category']
+    components['Button.tsx']['dependency_level'] = 7
+    components['Dialog.tsx']['dependencies'].append('Ghost')
+    components['Icon.tsx']['native'] = 'bogus'
+    return audit
+
+
+def test_validation_fixes_what_it_can_and_reports_the_rest(tmp_path):
+    path = tmp_path / 'audit.json'
+    write_audit(path, broken_audit())
+    updater = load(str(path))
+
+    engine = ua.ValidationEngine(updater)
+    issues = engine.run()
+    assert {(issue['rule'], issue['component'], issue['fixable']) for issue in issues if issue['component']} == {
+        ('required-fields', 'Modal.tsx', True),
+        ('derived-fields', 'Button.tsx', True),
+        ('dangling-dependency', 'Dialog.tsx', False),
+        ('enum-values', 'Icon.tsx', False),
+    }
+    assert any(issue['rule'] == 'stats-consistency' and issue['fixable'] for issue in issues)
+
+    engine.apply_fixes()
+    assert updater.data['components']['Modal.tsx']['category'] == ua.default_component_values('Modal')['category']
+    assert updater.data['components']['Button.tsx']['dependency_level'] == 1
+    remaining = ua.ValidationEngine(updater).run()
+    assert sorted(issue['rule'] for issue in remaining) == ['dangling-dependency', 'enum-values']
+
+
+def test_validation_sarif_names_rules_levels_and_components(tmp_path, monkeypatch, capsys):
+    path = tmp_path / 'audit.json'
+    write_audit(path, broken_audit())
+
+    assert cli(monkeypatch, str(path), '--validate', '--format', 'sarif') == 1
+    log = json.loads(capsys.readouterr().out)
+    assert log['version'] == '2.1.0'
+    run = log['runs'][0]
+    assert {rule['id'] for rule in run['tool']['driver']['rules']} == {rule.id for rule in ua.VALIDATION_RULES}
+    dangling = [result for result in run['results'] if result['ruleId'] == 'dangling-dependency']
+    assert len(dangling) == 1
+    assert dangling[0]['level'] == 'error'
+    location = dangling[0]['locations'][0]
+    assert location['physicalLocation']['artifactLocation']['uri'].endswith('audit.json')
+    assert location['logicalLocations'] == [{'fullyQualifiedName': 'Dialog.tsx'}]
+
+
+@pytest.mark.parametrize('fmt', ['json', 'sarif'])
+def test_validation_fix_keeps_machine_readable_output_clean(tmp_path, monkeypatch, capsys, fmt):
+    path = tmp_path / 'audit.json'
+    write_audit(path, broken_audit())
+
+    assert cli(monkeypatch, str(path), '--validate', '--fix', '--format', fmt) == 1
+    json.loads(capsys.readouterr().out)
+    assert read(str(path))['components']['Button.tsx']['dependency_level'] == 1
+
+
+def test_generated_audits_are_deterministic_and_count_dangling_dependencies(tmp_path):
+    audit = benchmark_audit.generate_audit(300, seed=3, dangling=7)
+    assert audit == benchmark_audit.generate_audit(300, seed=3, dangling=7)
+    assert audit != benchmark_audit.generate_audit(300, seed=4, dangling=7)
+
+    path = tmp_path / 'audit.json'
+    write_audit(path, audit)
+    updater = load(str(path))
+    updater.ensure_dependency_graph()
+    assert sorted(name for name in updater.graph.unresolved if name.startswith('Missing')) == \
+        [f"Missing{i:05d}" for i in range(7)]
+    # Without back edges every dependency points at a lower layer
+    assert updater.graph.cycles == []
+    assert max(updater.graph.levels.values()) < 8
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_generated_back_edges_close_cycles(seed):
+    updater = AuditUpdater()
+    updater.data = benchmark_audit.generate_audit(300, seed=seed, cycles=3)
+    updater.ensure_dependency_graph()
+    assert 1 <= len(updater.graph.cycles) <= 3
+
+
+def test_benchmark_compares_scaling_unless_absolute():
+    baseline = {'results': {'1000': {'save': 0.1}, '10000': {'save': 1.0}}}
+    # A machine twice as slow scales the same way
+    assert benchmark_audit.compare({'1000': {'save': 0.2}, '10000': {'save': 2.0}}, baseline) == []
+    assert benchmark_audit.compare({'1000': {'save': 0.2}, '10000': {'save': 2.0}}, baseline, absolute=True) == [
+        '1000 components, save: 0.2000s vs expected 0.1000s (+100%)',
+        '10000 components, save: 2.0000s vs expected 1.0000s (+100%)',
+    ]
+    assert benchmark_audit.compare({'1000': {'save': 0.1}, '10000': {'save': 2.0}}, baseline) == [
+        '10000 components, save: 2.0000s vs expected 1.0000s (+100%)',
+    ]
+
+
+def test_benchmark_times_every_phase(tmp_path):
+    path = tmp_path / 'audit.json'
+    write_audit(path, benchmark_audit.generate_audit(200, seed=1, cycles=2, dangling=3))
+    timings = benchmark_audit.run_phases(str(path))
+    assert list(timings) == benchmark_audit.PHASES
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+def test_disabled_profiler_records_nothing(audit_path, monkeypatch):
+    profiler = ua.Profiler()
+    monkeypatch.setattr(ua, 'PROFILER', profiler)
+    assert profiler.phase('load') is profiler.phase('save')
+    updater = load(audit_path)
+    updater.recalculate_all_components()
+    updater.save_audit()
+    assert profiler.phases == {} and profiler.counters == {}
+
+
+def test_profile_reports_nested_phases_and_counters(audit_path, monkeypatch, capsys):
+    monkeypatch.setattr(ua, 'PROFILER', ua.Profiler())
+    assert not cli(monkeypatch, audit_path, '--recalculate-all', '--profile', 'json')
+    report = json.loads(capsys.readouterr().err)
+    phases = {row['phase']: row for row in report['phases']}
+    assert {'total', 'total/load', 'total/recalculate', 'total/save', 'total/save/write'} <= set(phases)
+    assert phases['total']['calls'] == 1
+    assert phases['total']['wall'] >= phases['total/save']['wall']
+    assert report['counters']['bytes_read'] > 0
+    assert report['counters']['bytes_written'] > 0
+
+
+def test_save_writes_a_viewer_index_and_detail_shards(audit_path):
+    updater = load(audit_path)
+    updater.update_component('Modal.tsx', {'notes': 'Needs a native sheet'})
+    assert updater.save_audit()
+    viewer_dir = os.path.join(os.path.dirname(audit_path), 'audit-viewer')
+
+    index = read(os.path.join(viewer_dir, 'index.json'))
+    with open(audit_path, 'rb') as f:
+        assert index['source_sha256'] == hashlib.sha256(f.read()).hexdigest()
+    rows = {row['key']: row for row in index['components']}
+    assert sorted(rows) == ['Button.tsx', 'Dialog.tsx', 'Icon.tsx', 'Modal.tsx']
+    assert 'notes' not in rows['Modal.tsx']
+    assert [index['components'][i]['key'] for i in index['order']['alphabetical']] == \
+        ['Button.tsx', 'Dialog.tsx', 'Icon.tsx', 'Modal.tsx']
+
+    shard = read(os.path.join(viewer_dir, f"details-{rows['Modal.tsx']['shard']:02d}.json"))
+    assert shard['components']['Modal.tsx']['notes'] == 'Needs a native sheet'
+    # An up-to-date index is left alone
+    assert updater.write_viewer_index() == 0
+
+
+@pytest.mark.parametrize('minify', [False, True])
+def test_sqlite_writes_the_same_audit_json_as_json_storage(tmp_path, monkeypatch, minify):
+    paths = {}
+    for storage in ('json', 'sqlite'):
+        directory = tmp_path / storage
+        directory.mkdir()
+        paths[storage] = str(directory / 'audit.json')
+        write_audit(paths[storage], fixture_audit())
+        flags = ['--storage', storage] + (['--minify'] if minify else [])
+        assert not cli(monkeypatch, paths[storage], *flags, '--component', 'Modal.tsx',
+                       '--primitives', 'done', '--add-deps', 'Toast')
+        assert not cli(monkeypatch, paths[storage], *flags, '--component', 'Toast.tsx', '--description', 'New toast')
+        assert not cli(monkeypatch, paths[storage], *flags, '--recalculate-all')
+
+    with open(paths['json'], 'rb') as f:
+        expected = f.read()
+    with open(paths['sqlite'], 'rb') as f:
+        assert f.read() == expected
+    assert not cli(monkeypatch, paths['sqlite'], '--storage', 'sqlite', '--export', *(['--minify'] if minify else []))
+    with open(paths['sqlite'], 'rb') as f:
+        assert f.read() == expected
+
+
+def test_sqlite_merges_concurrent_writers_and_rejects_conflicting_fields(audit_path):
+    first = load(audit_path, storage='sqlite')
+    second = load(audit_path, storage='sqlite')
+    first.update_component('Button.tsx', {'notes': 'first'})
+    first.update_component('Dialog.tsx', {'primitives': 'done'})
+    first.save_audit()
+    # Different fields, or the same value, merge cleanly
+    second.update_component('Modal.tsx', {'notes': 'second'})
+    second.update_component('Dialog.tsx', {'primitives': 'done'})
+    second.save_audit()
+    components = read(audit_path)['components']
+    assert (components['Button.tsx']['notes'], components['Modal.tsx']['notes']) == ('first', 'second')
+
+    first = load(audit_path, storage='sqlite')
+    second = load(audit_path, storage='sqlite')
+    first.update_component('Icon.tsx', {'native': 'ready'})
+    first.save_audit()
+    second.update_component('Icon.tsx', {'native': 'in_progress'})
+    second.update_component('Button.tsx', {'notes': 'lost'})
+    with pytest.raises(ua.StorageConflict, match='Icon.tsx.native'):
+        second.save_audit()
+    components = read(audit_path)['components']
+    assert (components['Icon.tsx']['native'], components['Button.tsx']['notes']) == ('ready', 'first')
+
+
+def test_sqlite_first_use_by_two_runs_at_once_seeds_the_database_once(audit_path, monkeypatch, capsys):
+    first = AuditUpdater(audit_path, storage='sqlite')
+    second = AuditUpdater(audit_path, storage='sqlite')
+    exists = os.path.exists
+    # Both runs look for the database before either has created it
+    monkeypatch.setattr(os.path, 'exists', lambda path: path != first.db_path and exists(path))
+    first.load_audit()
+    second.load_audit()
+    assert second.data == first.data
+    assert capsys.readouterr().out.count('Created') == 1
+
+    edited = read(audit_path)
+    edited['components']['Modal.tsx']['notes'] = 'hand edit'
+    write_audit(audit_path, edited)
+    with pytest.raises(ua.StorageConflict, match='another writer'):
+        AuditUpdater(audit_path, storage='sqlite').load_audit()
+
+
+class ScriptedWatcher:
+    """Stands in for the file watcher: each wait(None) runs the next scripted edit"""
+
+    kind = 'scripted'
+
+    def __init__(self, edits):
+        self.edits = list(edits)
+
+    def wait(self, timeout):
+        if timeout is not None:
+            return set()
+        if not self.edits:
+            raise KeyboardInterrupt
+        return self.edits.pop(0)()
+
+    def close(self):
+        pass
+
+
+def test_watch_scopes_events_with_the_scan_globs(tmp_path):
+    write_source(tmp_path, 'src/components/fixture/Button.tsx', '')
+    scanner = ua.SourceScanner(str(tmp_path), ua.DEFAULT_SCAN_SCOPE, jobs=1)
+    assert scanner.watch_roots() == [str(tmp_path / 'src' / 'components')]
+    assert scanner.in_scope('src/components/fixture/Button.tsx')
+    assert not scanner.in_scope('src/components/fixture/Button.test.tsx')
+    assert not scanner.in_scope('src/lib/Button.tsx')
+
+
+def test_watch_merges_edits_on_top_of_other_saves(tmp_path, audit_path, monkeypatch):
+    sources = tmp_path / 'src' / 'components' / 'fixture'
+    for name in ('Icon', 'Button', 'Modal', 'Dialog'):
+        write_source(tmp_path, f"src/components/fixture/{name}.tsx", '')
+    updater = load(audit_path)
+    updater.repo_root = str(tmp_path)
+
+    def edit_button():
+        (sources / 'Button.tsx').write_text("import { Spinner } from './Spinner';\nexport const B = () => <Spinner />;\n")
+        return {str(sources / 'Button.tsx'), str(tmp_path / 'README.md')}
+
+    def save_elsewhere_and_edit_modal():
+        other = load(audit_path)
+        other.update_component('Modal.tsx', {'notes': 'saved by another command'})
+        other.save_audit()
+        (sources / 'Modal.tsx').write_text("import { Portal } from '@/Portal';\nexport const M = () => <Portal />;\n")
+        return {str(sources / 'Modal.tsx')}
+
+    watcher = ScriptedWatcher([edit_button, save_elsewhere_and_edit_modal])
+    monkeypatch.setattr(ua, 'open_source_watcher', lambda *args, **kwargs: watcher)
+    updater.watch_sources(use_cache=False)
+
+    components = read(audit_path)['components']
+    assert 'Spinner' in components['Button.tsx']['dependencies']
+    assert 'Portal' in components['Modal.tsx']['dependencies']
+    assert components['Modal.tsx']['notes'] == 'saved by another command'
+
+
+def test_diff_reports_transitions_dependency_changes_and_progress():
+    before = fixture_audit()
+    after = copy.deepcopy(before)
+    components = after['components']
+    components['Modal.tsx']['primitives'] = 'done'
+    components['Button.tsx']['dependencies'] = ['Spinner']
+    components['Dialog.tsx']['notes'] = 'Reviewed'
+    # Field order alone is not a change
+    components['Icon.tsx'] = dict(reversed(list(components['Icon.tsx'].items())))
+    components['Toast.tsx'] = component('Toast')
+
+    diff = ua.diff_audits(before, after)
+    assert diff['added'] == ['Toast.tsx']
+    assert diff['removed'] == []
+    assert diff['unchanged'] == 1
+    changed = {entry['component']: entry for entry in diff['changed']}
+    assert sorted(changed) == ['Button.tsx', 'Dialog.tsx', 'Modal.tsx']
+    assert changed['Modal.tsx']['transitions'] == {'primitives': ['todo', 'done']}
+    assert (changed['Button.tsx']['dependencies_added'], changed['Button.tsx']['dependencies_removed']) == \
+        (['Spinner'], ['Icon'])
+    assert changed['Dialog.tsx']['fields'] == ['notes']
+    assert diff['transitions'] == [{'field': 'primitives', 'from': 'todo', 'to': 'done', 'count': 1}]
+    assert diff['progress']['primitives_done'] == [3, 5]
+
+
+def test_journal_trend_ends_at_the_saved_counters(audit_path, monkeypatch):
+    assert not cli(monkeypatch, audit_path, '--component', 'Modal.tsx', '--primitives', 'done')
+    assert not cli(monkeypatch, audit_path, '--component', 'Icon.tsx', '--native', 'ready')
+    monkeypatch.undo()
+
+    rows = load(audit_path).trend('journal')
+    stats = read(audit_path)['stats']
+    assert rows[-1]['source'] == 'journal'
+    assert {counter: rows[-1][counter] for counter in ua.TREND_COUNTERS} == \
+        {counter: stats[counter] for counter in ua.TREND_COUNTERS}
+
+
+def test_reconcile_matches_moved_files_by_fingerprint_then_name(tmp_path, audit_path):
+    for name in ('Icon', 'Button', 'Modal', 'Dialog'):
+        write_source(tmp_path, f"src/components/fixture/{name}.tsx", f"export const {name} = () => null;\n")
+    updater = load(audit_path)
+    updater.repo_root = str(tmp_path)
+    report = updater.reconcile_paths(jobs=1)
+    assert (report['checked'], report['moved'], report['missing'], report['untracked']) == (4, [], [], [])
+
+    fixture = tmp_path / 'src' / 'components' / 'fixture'
+    write_source(tmp_path, 'src/components/forms/Primary.tsx', (fixture / 'Button.tsx').read_text())
+    write_source(tmp_path, 'src/components/overlay/Modal.tsx', "export const Modal = () => <div />;\n")
+    write_source(tmp_path, 'src/components/fixture/Banner.tsx', "export const Banner = () => null;\n")
+    for name in ('Button', 'Modal', 'Dialog'):
+        (fixture / f"{name}.tsx").unlink()
+
+    report = updater.reconcile_paths(jobs=1)
+    assert report['moved'] == [
+        {'component': 'Button.tsx', 'from': 'src/components/fixture/Button.tsx',
+         'to': 'src/components/forms/Primary.tsx', 'match': 'fingerprint'},
+        {'component': 'Modal.tsx', 'from': 'src/components/fixture/Modal.tsx',
+         'to': 'src/components/overlay/Modal.tsx', 'match': 'name'},
+    ]
+    assert [entry['component'] for entry in report['missing']] == ['Dialog.tsx']
+    assert report['untracked'] == ['src/components/fixture/Banner.tsx']
+
+    assert updater.apply_path_fixes(report['moved']) == 2
+    updater.save_audit()
+    assert read(audit_path)['components']['Button.tsx']['path'] == 'src/components/forms/Primary.tsx'
+
+
+def test_reconcile_fix_keeps_json_output_clean(tmp_path, audit_path, monkeypatch, capsys):
+    for name in ('Icon', 'Modal', 'Dialog'):
+        write_source(tmp_path, f"src/components/fixture/{name}.tsx", f"export const {name} = () => null;\n")
+    write_source(tmp_path, 'src/components/forms/Button.tsx', "export const Button = () => null;\n")
+
+    def updater_in_tmp_repo(*args, **kwargs):
+        updater = AuditUpdater(audit_path, *args, **kwargs)
+        updater.repo_root = str(tmp_path)
+        return updater
+
+    monkeypatch.setattr(ua, 'AuditUpdater', updater_in_tmp_repo)
+    monkeypatch.setattr(sys, 'argv', ['update_audit.py', '--reconcile', '--fix', '--format', 'json'])
+    ua.main()
+    report = json.loads(capsys.readouterr().out)
+    assert [entry['to'] for entry in report['moved']] == ['src/components/forms/Button.tsx']
+    assert read(audit_path)['components']['Button.tsx']['path'] == 'src/components/forms/Button.tsx'
+
+
+def test_sqlite_reimports_audit_json_changed_outside_the_database(audit_path):
+    updater = load(audit_path, storage='sqlite')
+    updater.update_component('Button.tsx', {'notes': 'from sqlite'})
+    updater.save_audit()
+
+    # A pull or a hand edit changes the committed audit.json behind the database's back
+    edited = read(audit_path)
+    edited['components']['Modal.tsx']['notes'] = 'hand edit'
+    write_audit(audit_path, edited)
+
+    updater = load(audit_path, storage='sqlite')
+    updater.update_component('Icon.tsx', {'native': 'ready'})
+    updater.save_audit()
+
+    components = read(audit_path)['components']
+    assert components['Modal.tsx']['notes'] == 'hand edit'
+    assert components['Button.tsx']['notes'] == 'from sqlite'
+    assert components['Icon.tsx']['native'] == 'ready'
+    imported = [entry for entry in updater.journal.entries() if entry.get('imported')]
+    assert [(e['component'], e['field'], e['new']) for e in imported] == [('Modal.tsx', 'notes', 'hand edit')]
+
+
+def reachable_sets(graph: ua.DependencyGraph, direction: str) -> dict:
+    return {name: sorted(graph.reachable([name], direction)) for name in graph.forward}
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_impact_after_edits_matches_a_fresh_graph(tmp_path, seed):
+    rng = random.Random(seed)
+    names = [f"C{i}.tsx" for i in range(12)]
+    audit = fixture_audit()
+    audit['components'] = {name: component(name[:-4]) for name in names[:8]}
+    path = tmp_path / 'audit.json'
+    write_audit(path, audit)
+
+    updater = load(str(path))
+    updater.ensure_dependency_graph()
+    for _ in range(40):
+        existing = list(updater.data['components'])
+        op = rng.random()
+        if op < 0.25 and len(existing) > 2:
+            victim = rng.choice(existing)
+            updater.refresh_levels(updater.delete_component(victim))
+        else:
+            target = rng.choice(names)
+            deps = rng.sample([n[:-4] for n in names], rng.randint(0, 3))
+            updater.update_component(target, {'set_deps': ','.join(deps)})
+
+        fresh = ua.DependencyGraph()
+        fresh.build(updater.data['components'])
+        for direction in ('descendants', 'ancestors'):
+            assert reachable_sets(updater.graph, direction) == reachable_sets(fresh, direction)
+
+
+def test_impact_includes_a_component_only_when_it_is_on_a_cycle(audit_path):
+    updater = load(audit_path)
+    assert updater.transitive('Button', 'ancestors') == ('Button.tsx', ['Modal.tsx', 'Dialog.tsx'])
+    updater.update_component('Icon.tsx', {'add_deps': 'Dialog'})
+    # Every component now reaches every other one, itself included
+    for name in ('Icon', 'Button', 'Modal', 'Dialog'):
+        for direction in ('descendants', 'ancestors'):
+            _, names = updater.transitive(name, direction)
+            assert sorted(names) == ['Button.tsx', 'Dialog.tsx', 'Icon.tsx', 'Modal.tsx']
+
+
+def test_plan_only_lists_primitives_done_components_once_per_name(tmp_path):
+    audit = fixture_audit()
+    audit['components']['Toast.tsx'] = component('Toast', primitives='todo')
+    audit['components']['legacy/Button.tsx'] = component('Button', ['Icon'])
+    audit['mobile_strategy']['ready_to_build'] = [{'name': 'Button', 'reason': 'kept', 'effort': 'S', 'notes': ''}]
+    path = tmp_path / 'audit.json'
+    write_audit(path, audit)
+    updater = load(str(path))
+
+    plan = updater.build_plan()
+    assert plan['waves'] == [['Button.tsx', 'Toast.tsx', 'legacy/Button.tsx'], ['Modal.tsx'], ['Dialog.tsx']]
+    assert plan['unblocked'] == ['Button.tsx', 'legacy/Button.tsx']
+    assert plan['critical_path'] == ['Button.tsx', 'Modal.tsx', 'Dialog.tsx']
+
+    assert updater.write_ready_to_build(plan) == 1
+    assert updater.data['mobile_strategy']['ready_to_build'] == [{'name': 'Button', 'reason': 'kept', 'effort': 'S', 'notes': ''}]
+
+
+def test_indexed_query_keeps_audit_order_after_edits(audit_path):
+    updater = load(audit_path)
+    assert [row['key'] for row in updater.query('primitives=done')[0]] == ['Icon.tsx', 'Button.tsx', 'Dialog.tsx']
+
+    updater.delete_component('Button.tsx')
+    updater.create_component('Button.tsx', ua.default_component_values('Button'))
+    updater.create_component('Alert.tsx', ua.default_component_values('Alert'))
+    updater.update_component('Modal.tsx', {'primitives': 'done'})
+    expected = [name for name, comp in updater.data['components'].items() if comp['primitives'] == 'done']
+    assert [row['key'] for row in updater.query('primitives=done')[0]] == expected
+
+
+def test_watch_reports_a_failed_batch_and_retries_its_files(tmp_path, audit_path, monkeypatch):
+    sources = tmp_path / 'src' / 'components' / 'fixture'
+    sources.mkdir(parents=True)
+    for name in ('Icon', 'Button', 'Modal', 'Dialog'):
+        (sources / f"{name}.tsx").write_text('')
+    updater = load(audit_path)
+    updater.repo_root = str(tmp_path)
+    saved = {}
+
+    def corrupt_audit_and_edit_button():
+        saved['audit'] = open(audit_path, 'rb').read()
+        with open(audit_path, 'w') as f:
+            f.write('{ not json')
+        (sources / 'Button.tsx').write_text("import { Spinner } from './Spinner';\nexport const B = () => <Spinner />;\n")
+        return {str(sources / 'Button.tsx')}
+
+    def restore_audit_and_edit_modal():
+        with open(audit_path, 'wb') as f:
+            f.write(saved['audit'])
+        (sources / 'Modal.tsx').write_text("import { Portal } from '@/Portal';\nexport const M = () => <Portal />;\n")
+        return {str(sources / 'Modal.tsx')}
+
+    watcher = ScriptedWatcher([corrupt_audit_and_edit_button, restore_audit_and_edit_modal])
+    monkeypatch.setattr(ua, 'open_source_watcher', lambda *args, **kwargs: watcher)
+    updater.watch_sources(use_cache=False)
+
+    components = read(audit_path)['components']
+    assert 'Spinner' in components['Button.tsx']['dependencies']
+    assert 'Portal' in components['Modal.tsx']['dependencies']
+
+
+def test_reconcile_and_scan_report_entries_with_a_null_path_as_missing(tmp_path):
+    audit = fixture_audit()
+    audit['components']['Modal.tsx']['path'] = None
+    audit['components']['Dialog.tsx'].pop('path')
+    path = tmp_path / 'audit.json'
+    write_audit(path, audit)
+    sources = tmp_path / 'src' / 'components' / 'fixture'
+    sources.mkdir(parents=True)
+    for name in ('Icon', 'Button'):
+        (sources / f"{name}.tsx").write_text('')
+    updater = load(str(path))
+    updater.repo_root = str(tmp_path)
+
+    report = updater.reconcile_paths(jobs=1)
+    assert report['moved'] == []
+    assert [(entry['component'], entry['path']) for entry in report['missing']] == [('Modal.tsx', ''), ('Dialog.tsx', '')]
+    assert updater.merge_scan_results({'src/components/fixture/Button.tsx': (['Modal'], [])}) == {'Button.tsx'}
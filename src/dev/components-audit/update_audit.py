@@ -24,75 +24,2469 @@ Usage Examples:
   
   # Validate JSON structure and fix inconsistencies
   python3 update_audit_enhanced.py --validate --fix
+  
+  # Populate dependencies and hooks from the component sources
+  python3 update_audit_enhanced.py --scan
+  
+  # Keep doing so as the sources change
+  python3 update_audit_enhanced.py --watch
 """
 
-import json
-import argparse
-import os
-from datetime import datetime
-from typing import Dict, List, Set, Optional, Tuple
-import re
+import json
+import argparse
+import contextlib
+import copy
+import csv
+import ctypes
+import ctypes.util
+import errno
+import functools
+import hashlib
+import io
+import os
+import select
+import stat
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from datetime import datetime
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Set, Optional, Tuple
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+COMPONENT_EXTENSIONS = ('.tsx', '.jsx', '.ts', '.js')
+
+# Allowed values for the enum fields, shared by the CLI and batch validation
+FIELD_CHOICES = {
+    'primitives': ['todo', 'partial', 'done'],
+    'logic_extraction': ['todo', 'in_progress', 'done', 'keep'],
+    'native': ['todo', 'in_progress', 'ready', 'done', 'not_needed'],
+    'category': ['shared', 'platform_specific', 'complex_refactor'],
+    'used': ['yes', 'no', 'unknown', 'suspended'],
+}
+
+# Keys accepted by AuditUpdater.update_component
+UPDATE_FIELDS = ['primitives', 'logic_extraction', 'native', 'category', 'used',
+                 'hooks', 'notes', 'description', 'path', 'add_deps', 'remove_deps', 'set_deps']
+
+# Native statuses that no longer block dependents
+NATIVE_COMPLETE = ('done', 'not_needed')
+
+BATCH_OPS = ('update', 'bulk_update', 'add_deps', 'remove_deps', 'set_deps', 'validate', 'recalc')
+
+
+def strip_component_extension(name: str) -> str:
+    """Drop a trailing source extension from a component key"""
+    for ext in COMPONENT_EXTENSIONS:
+        if name.endswith(ext):
+            return name[:-len(ext)]
+    return name
+
+
+class Profiler:
+    """Per-phase wall time, CPU time and memory plus named counters for --profile.
+    
+    Disabled by default: phase() then hands back a shared no-op context and
+    count() returns immediately, and callers only compute expensive counter
+    values behind `if PROFILER.enabled`. Phases nest; each is reported under
+    its parent, and repeated phases are accumulated.
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self.phases: Dict[Tuple[str, ...], Dict] = {}
+        self.counters: Dict[str, int] = {}
+        self._stack: List[Tuple[str, ...]] = []
+        self._peaks: List[int] = []
+        self._idle = contextlib.nullcontext()
+    
+    def enable(self, trace_memory: bool = False):
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory:
+            tracemalloc.start()
+    
+    def count(self, name: str, amount: int = 1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def phase(self, name: str):
+        return self._measure(name) if self.enabled else self._idle
+    
+    @contextlib.contextmanager
+    def _measure(self, name: str):
+        path = (self._stack[-1] if self._stack else ()) + (name,)
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            tracemalloc.reset_peak()
+            self._peaks.append(current)
+            start_memory = current
+        # Registered on entry so parents are listed before their children
+        record = self.phases.setdefault(path, {'calls': 0, 'wall': 0.0, 'cpu': 0.0,
+                                               'peak_alloc': 0, 'max_rss': 0})
+        self._stack.append(path)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            self._stack.pop()
+            record['calls'] += 1
+            record['wall'] += wall
+            record['cpu'] += cpu
+            record['max_rss'] = max_rss_bytes()
+            if self.trace_memory:
+                peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                record['peak_alloc'] = max(record['peak_alloc'], peak - start_memory)
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+    
+    def to_dict(self) -> Dict:
+        return {
+            'phases': [{'phase': '/'.join(path), **{k: round(v, 6) if isinstance(v, float) else v
+                                                     for k, v in record.items()}}
+                       for path, record in self.phases.items()],
+            'counters': dict(sorted(self.counters.items())),
+        }
+    
+    def report(self, fmt: str = 'table') -> str:
+        if fmt == 'json':
+            return json.dumps(self.to_dict(), indent=2) + '\n'
+        # Group each phase under its parent, keeping first-entry order among siblings
+        position = {path: i for i, path in enumerate(self.phases)}
+        paths = sorted(self.phases, key=lambda path: [position[path[:i + 1]] for i in range(len(path))])
+        lines = ['', '⏱️  Profile', f"{'phase':<32}{'calls':>6}{'wall s':>10}{'cpu s':>10}"
+                 f"{'peak alloc':>12}{'max rss':>10}"]
+        for path in paths:
+            record = self.phases[path]
+            label = '  ' * (len(path) - 1) + path[-1]
+            alloc = f"{record['peak_alloc'] / 2**20:.1f} MB" if self.trace_memory else '-'
+            lines.append(f"{label:<32}{record['calls']:>6}{record['wall']:>10.4f}{record['cpu']:>10.4f}"
+                         f"{alloc:>12}{record['max_rss'] / 2**20:>7.1f} MB")
+        if self.counters:
+            lines.append('')
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"{name:<32}{value:>16,}")
+        return '\n'.join(lines) + '\n'
+
+
+def max_rss_bytes() -> int:
+    """Peak resident set size of this process so far, or 0 where unsupported"""
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+PROFILER = Profiler()
+
+
+def profiled(name: str):
+    """Time every call of the decorated function as a --profile phase"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            with PROFILER.phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class DependencyGraph:
+    """Forward/reverse dependency index over audit components.
+    
+    Dependencies are resolved against component keys first and then against
+    keys with their extension stripped, so "Icon" resolves to "Icon.tsx".
+    Levels are computed in a single iterative pass over the strongly
+    connected components (Tarjan), so the cost is O(V+E) and deep chains
+    never hit the recursion limit. Every member of a cycle shares one level.
+    
+    The index is kept up to date across edits: changing a component's
+    dependencies only recomputes levels for the components that depend on
+    it, directly or transitively.
+    """
+    
+    def __init__(self):
+        self.components: Dict[str, Dict] = {}
+        self.forward: Dict[str, List[str]] = {}
+        self.reverse: Dict[str, Set[str]] = {}
+        self.unresolved: Dict[str, Set[str]] = {}
+        self.aliases: Dict[str, str] = {}
+        self.levels: Dict[str, int] = {}
+        self.cycles: List[List[str]] = []
+    
+    def build(self, components: Dict[str, Dict]):
+        """Index every component and its resolvable dependencies"""
+        self.components = components
+        self.aliases = {name: name for name in components}
+        for name in components:
+            self.aliases.setdefault(strip_component_extension(name), name)
+        
+        self.forward = {}
+        self.reverse = {name: set() for name in components}
+        self.unresolved = {}
+        for name in components:
+            self._link(name)
+        self.levels = {}
+        self.cycles = []
+        if PROFILER.enabled:
+            PROFILER.count('graph_edges', sum(len(deps) for deps in self.forward.values()))
+    
+    def resolve(self, dependency: str) -> Optional[str]:
+        """Map a dependency name to a component key, or None if unknown"""
+        return self.aliases.get(dependency)
+    
+    def _link(self, name: str):
+        """Record forward, reverse and unresolved edges for one component"""
+        resolved = {}
+        for dep in self.components[name].get('dependencies', []) or []:
+            key = self.aliases.get(dep)
+            if key is None:
+                self.unresolved.setdefault(dep, set()).add(name)
+            else:
+                resolved[key] = None
+        self.forward[name] = list(resolved)
+        for dep in resolved:
+            self.reverse[dep].add(name)
+    
+    def _unlink(self, name: str):
+        """Drop every edge previously recorded for one component"""
+        for dep in self.forward.get(name, ()):
+            self.reverse[dep].discard(name)
+        for dep in self.components[name].get('dependencies', []) or []:
+            referrers = self.unresolved.get(dep)
+            if referrers is not None:
+                referrers.discard(name)
+                if not referrers:
+                    del self.unresolved[dep]
+    
+    def add_component(self, name: str) -> Set[str]:
+        """Index a newly created component; returns the components whose edges changed"""
+        changed = {name}
+        self.aliases[name] = name
+        self.reverse.setdefault(name, set())
+        stripped = strip_component_extension(name)
+        self.aliases.setdefault(stripped, name)
+        
+        # Components that referenced this name while it did not exist yet
+        for alias in {name, stripped}:
+            if self.aliases[alias] != name:
+                continue
+            for referrer in self.unresolved.pop(alias, set()):
+                self.reverse[name].add(referrer)
+                if name not in self.forward[referrer]:
+                    self.forward[referrer].append(name)
+                changed.add(referrer)
+        
+        self._link(name)
+        return changed
+    
+    def remove_component(self, name: str) -> Set[str]:
+        """Drop a component from the index; returns the components that referenced it.
+        
+        Must be called before the entry is removed from the components mapping.
+        """
+        self._unlink(name)
+        referrers = self.reverse.pop(name, set())
+        for referrer in referrers:
+            self.forward[referrer] = [dep for dep in self.forward[referrer] if dep != name]
+            for dep in self.components[referrer].get('dependencies', []) or []:
+                if self.aliases.get(dep) == name:
+                    self.unresolved.setdefault(dep, set()).add(referrer)
+        for alias in (name, strip_component_extension(name)):
+            if self.aliases.get(alias) == name:
+                del self.aliases[alias]
+        del self.forward[name]
+        self.levels.pop(name, None)
+        self.cycles = [cycle for cycle in self.cycles if name not in cycle]
+        return referrers - {name}
+    
+    def replace_dependencies(self, name: str, dependencies: List[str]) -> Set[str]:
+        """Swap a component's dependency list, keeping the index consistent"""
+        self._unlink(name)
+        self.components[name]['dependencies'] = dependencies
+        self._link(name)
+        return {name}
+    
+    def reachable(self, names: Iterable[str], direction: str) -> Set[str]:
+        """Everything one or more edges away from `names`: 'descendants' or 'ancestors'.
+        
+        A start node is only included if it lies on a cycle. O(V + E) and
+        nothing is kept afterwards.
+        """
+        edges = self.forward if direction == 'descendants' else self.reverse
+        seen: Set[str] = set()
+        pending = list(names)
+        while pending:
+            for neighbour in edges.get(pending.pop(), ()):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    pending.append(neighbour)
+        return seen
+    
+    def dependents(self, names: Iterable[str]) -> Set[str]:
+        """Return the given components plus everything that depends on them"""
+        seen = set(names)
+        pending = list(seen)
+        reverse = self.reverse
+        while pending:
+            for referrer in reverse.get(pending.pop(), ()):
+                if referrer not in seen:
+                    seen.add(referrer)
+                    pending.append(referrer)
+        return seen
+    
+    def strongly_connected(self, nodes: Iterable[str],
+                           within: Optional[Set[str]] = None) -> Iterator[List[str]]:
+        """Yield strongly connected components, dependencies first.
+        
+        Iterative Tarjan: each SCC is emitted only after every SCC it
+        depends on, which is exactly the order levels need. With `within`,
+        edges leaving that set are not followed.
+        """
+        if within is None:
+            forward = self.forward
+        else:
+            forward = {name: [dep for dep in self.forward[name] if dep in within]
+                       for name in within}
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        counter = 0
+        
+        for root in nodes:
+            if root in index:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(forward.get(root, ())))]
+            
+            while work:
+                node, edges = work[-1]
+                for dep in edges:
+                    if dep not in index:
+                        index[dep] = low[dep] = counter
+                        counter += 1
+                        stack.append(dep)
+                        on_stack.add(dep)
+                        work.append((dep, iter(forward.get(dep, ()))))
+                        break
+                    if dep in on_stack and index[dep] < low[node]:
+                        low[node] = index[dep]
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        if low[node] < low[parent]:
+                            low[parent] = low[node]
+                    if low[node] == index[node]:
+                        scc = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            scc.append(member)
+                            if member == node:
+                                break
+                        yield scc
+        
+        if PROFILER.enabled:
+            PROFILER.count('dfs_visits', len(index))
+            PROFILER.count('dfs_edges', sum(len(forward.get(name, ())) for name in index))
+    
+    @profiled('compute_levels')
+    def compute_levels(self) -> Dict[str, int]:
+        """Compute every dependency level and collect cycles in one pass"""
+        self.levels = {}
+        self.cycles = []
+        self._assign_levels(self.forward, None)
+        return self.levels
+    
+    def update_levels(self, changed: Iterable[str]) -> Set[str]:
+        """Recompute levels for the downstream set of the changed components.
+        
+        Only components that depend on a changed component can see a new
+        level; everything else keeps its memoized value. Returns the set of
+        components that were recomputed.
+        """
+        if not self.levels:
+            self.compute_levels()
+            return set(self.forward)
+        
+        affected = self.dependents(changed)
+        self.cycles = [cycle for cycle in self.cycles if not affected.intersection(cycle)]
+        self._assign_levels(affected, affected)
+        self.cycles.sort()
+        return affected
+    
+    def _assign_levels(self, nodes: Iterable[str], within: Optional[Set[str]]):
+        """Assign levels to nodes, SCC by SCC, reusing levels outside `within`.
+        
+        A dependency outside the affected set can never reach back into it,
+        so its memoized level is final and no cycle crosses the boundary.
+        """
+        forward = self.forward
+        levels = self.levels
+        
+        for scc in self.strongly_connected(nodes, within):
+            members = set(scc)
+            level = 0
+            for member in scc:
+                for dep in forward[member]:
+                    if dep not in members and levels[dep] + 1 > level:
+                        level = levels[dep] + 1
+            if len(scc) > 1 or scc[0] in forward[scc[0]]:
+                self.cycles.append(sorted(scc))
+            for member in scc:
+                levels[member] = level
+        
+        if within is None:
+            self.cycles.sort()
+
+
+# Import clauses contain only identifiers, braces, commas, `as`, `type` and `*`,
+# which keeps side-effect imports like `import './x.scss'` from being swallowed
+IMPORT_RE = re.compile(r"^[ \t]*import\s+([\w\s{},*$]+?)\s+from\s+['\"]([^'\"]+)['\"]", re.M)
+# A JSX tag never directly follows an identifier, unlike a generic (`useRef<Foo>`)
+JSX_TAG_RE = re.compile(r'(?<![\w$.])<([A-Z][\w$]*)(?=[\s/>.])')
+HOOK_CALL_RE = re.compile(r'(?<![\w.$])(?<!function )(use[A-Z][\w$]*)\s*(?:<[^()]*?>)?\s*\(')
+
+DEFAULT_SCAN_SCOPE = ['src/components/**/*.tsx', 'src/components/**/*.jsx']
+
+# Process pools only pay off once there is enough work to amortize start-up
+SCAN_PARALLEL_THRESHOLD = 64
+
+# --watch waits this long after the last event before rescanning, but never
+# more than WATCH_MAX_DELAY_SECONDS after the first one of a burst
+WATCH_DEBOUNCE_SECONDS = 0.3
+WATCH_MAX_DELAY_SECONDS = 3.0
+WATCH_POLL_SECONDS = 1.0
+
+
+def _imported_names(clause: str) -> List[str]:
+    """Return the local identifiers bound by an import clause"""
+    clause = clause.strip()
+    if clause.startswith('type '):
+        return []
+    names = []
+    default, _, rest = clause.partition('{')
+    named, _, _ = rest.partition('}')
+    for part in default.split(','):
+        part = part.strip()
+        if part.startswith('*'):
+            part = part.split(' as ')[-1].strip()
+        if part:
+            names.append(part)
+    for part in named.split(','):
+        part = part.strip()
+        if not part or part.startswith('type '):
+            continue
+        names.append(part.split(' as ')[-1].strip())
+    return names
+
+
+def extract_source_usage(source: str) -> Tuple[List[str], List[str]]:
+    """Extract rendered components and called hooks imported from the app's own modules.
+    
+    Library imports (react, react-router, ...) are ignored so only the app's
+    components and custom hooks end up in the audit.
+    """
+    imported = set()
+    for match in IMPORT_RE.finditer(source):
+        module = match.group(2)
+        if module.startswith('.') or module.startswith('@/'):
+            imported.update(_imported_names(match.group(1)))
+    
+    components = sorted(imported.intersection(JSX_TAG_RE.findall(source)))
+    hooks = sorted(imported.intersection(HOOK_CALL_RE.findall(source)))
+    return components, hooks
+
+
+def is_test_path(rel_path: str) -> bool:
+    return '.test.' in rel_path or '.spec.' in rel_path or '/__tests__/' in rel_path
+
+
+def glob_to_regex(pattern: str) -> 're.Pattern':
+    """Compile a scan_scope glob into a regex over repo-relative paths.
+    
+    Matches what Path.glob() finds: `**/` spans any number of directories
+    (including none), `*` and `?` stay within one path component.
+    """
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            parts.append('(?:[^/]+/)*')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile(''.join(parts) + r'\Z')
+
+
+def scan_source_file(path: str) -> Tuple[str, List[str], List[str]]:
+    """Read and scan one source file; top-level so process pools can pickle it"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        components, hooks = extract_source_usage(f.read())
+    return path, components, hooks
+
+
+def source_stem(rel_path: str) -> str:
+    """File name up to its first dot: `Button.web.tsx` → `Button`"""
+    return os.path.basename(rel_path).split('.', 1)[0]
+
+
+def fingerprint_path(abs_path: str) -> Tuple[str, Optional[str]]:
+    """('file', sha1 of the content), ('dir', None) or ('missing', None); safe to run in threads"""
+    try:
+        st = os.stat(abs_path)
+    except OSError:
+        return 'missing', None
+    if stat.S_ISDIR(st.st_mode):
+        return 'dir', None
+    with open(abs_path, 'rb') as f:
+        return 'file', hashlib.sha1(f.read()).hexdigest()
+
+
+@profiled('write')
+def write_atomic(path: str, payload: bytes):
+    """Write bytes to a temp file in the same directory, then rename over path"""
+    PROFILER.count('bytes_written', len(payload))
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{os.path.basename(path)}.', suffix='.tmp', dir=directory)
+    try:
+        # mkstemp creates the file 0600; keep the target's mode, or use the umask default
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(tmp_path, mode)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class ScanCache:
+    """Persistent per-file scan results keyed by path, mtime/size and content hash.
+    
+    A file whose mtime and size are unchanged is a hit without being read.
+    Otherwise its content is hashed: a matching hash (including one recorded
+    under a path that has since been renamed or deleted) is still a hit, and
+    only genuinely new content is parsed again.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.files: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self._by_hash: Dict[str, Dict] = {}
+        self._hashes: Dict[str, str] = {}
+    
+    def load(self) -> 'ScanCache':
+        """Read the sidecar file; a missing or incompatible cache starts empty"""
+        try:
+            with open(self.path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = {}
+        if cached.get('version') == self.VERSION:
+            self.files = cached.get('files', {})
+        self._by_hash = {entry['sha1']: entry for entry in self.files.values()}
+        return self
+    
+    def lookup(self, rel_path: str, abs_path: str) -> Optional[Tuple[List[str], List[str]]]:
+        """Return cached usage for a file, or None if it has to be parsed"""
+        st = os.stat(abs_path)
+        entry = self.files.get(rel_path)
+        if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            self.hits += 1
+            return entry['components'], entry['hooks']
+        
+        with open(abs_path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        known = self._by_hash.get(digest)
+        if known is None:
+            self.misses += 1
+            self._hashes[rel_path] = digest
+            return None
+        
+        self.hits += 1
+        self.store(rel_path, abs_path, (known['components'], known['hooks']), digest)
+        return known['components'], known['hooks']
+    
+    def store(self, rel_path: str, abs_path: str, usage: Tuple[List[str], List[str]],
+              digest: Optional[str] = None):
+        """Record usage for a file under its current stat and hash"""
+        st = os.stat(abs_path)
+        digest = digest or self._hashes.pop(rel_path, None)
+        if digest is None:
+            with open(abs_path, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+        entry = {
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'sha1': digest,
+            'components': usage[0],
+            'hooks': usage[1],
+        }
+        self.files[rel_path] = entry
+        self._by_hash[digest] = entry
+        self.dirty = True
+    
+    def prune(self, live_paths: Iterable[str]):
+        """Forget files that no longer exist in scope"""
+        live = set(live_paths)
+        stale = [rel for rel in self.files if rel not in live]
+        for rel in stale:
+            del self.files[rel]
+        if stale:
+            self.dirty = True
+    
+    def forget(self, rel_paths: Iterable[str]):
+        """Drop entries for files that were deleted"""
+        for rel in rel_paths:
+            if self.files.pop(rel, None) is not None:
+                self.dirty = True
+    
+    def save(self):
+        """Persist the cache if anything changed"""
+        if not self.dirty:
+            return
+        payload = json.dumps({'version': self.VERSION, 'files': self.files},
+                             separators=(',', ':'), sort_keys=True)
+        write_atomic(self.path, payload.encode('utf-8'))
+        self.dirty = False
+
+
+class SourceScanner:
+    """Scans the audit's `scan_scope` globs for component and hook usage"""
+    
+    def __init__(self, repo_root: str, scope: List[str], jobs: Optional[int] = None,
+                 cache: Optional[ScanCache] = None):
+        self.repo_root = repo_root
+        self.scope = scope
+        self.jobs = jobs or os.cpu_count() or 1
+        self.cache = cache
+        self._patterns: Optional[List['re.Pattern']] = None
+    
+    def list_files(self) -> List[str]:
+        """Return repo-relative paths of every non-test file in scope"""
+        root = Path(self.repo_root)
+        files = set()
+        for pattern in self.scope:
+            for path in root.glob(pattern):
+                rel = path.relative_to(root).as_posix()
+                if is_test_path(rel):
+                    continue
+                files.add(rel)
+        return sorted(files)
+    
+    def in_scope(self, rel_path: str) -> bool:
+        """Whether list_files() would include this repo-relative path"""
+        if self._patterns is None:
+            self._patterns = [glob_to_regex(pattern) for pattern in self.scope]
+        return not is_test_path(rel_path) and any(p.match(rel_path) for p in self._patterns)
+    
+    def watch_roots(self) -> List[str]:
+        """Existing directories that contain everything in scope, without nesting"""
+        roots = set()
+        for pattern in self.scope:
+            static = []
+            for part in pattern.split('/')[:-1]:
+                if any(c in part for c in '*?['):
+                    break
+                static.append(part)
+            path = os.path.join(self.repo_root, *static)
+            if os.path.isdir(path):
+                roots.add(path)
+        return [root for root in sorted(roots)
+                if not any(root.startswith(other + os.sep) for other in roots)]
+    
+    def scan(self, rel_paths: List[str], prune: bool = False) -> Dict[str, Tuple[List[str], List[str]]]:
+        """Scan files, reusing cached results and parsing the rest in parallel.
+        
+        With prune=True, rel_paths is taken to be the complete scope and
+        cache entries for any other file are dropped.
+        """
+        usage: Dict[str, Tuple[List[str], List[str]]] = {}
+        pending = []
+        for rel in rel_paths:
+            abs_path = os.path.join(self.repo_root, rel)
+            cached = self.cache.lookup(rel, abs_path) if self.cache else None
+            if cached is None:
+                pending.append(rel)
+            else:
+                usage[rel] = cached
+        
+        abs_paths = [os.path.join(self.repo_root, rel) for rel in pending]
+        if PROFILER.enabled:
+            PROFILER.count('files_scanned', len(abs_paths))
+            PROFILER.count('bytes_read', sum(os.path.getsize(path) for path in abs_paths))
+        if self.jobs > 1 and len(abs_paths) >= SCAN_PARALLEL_THRESHOLD:
+            chunksize = max(1, len(abs_paths) // (self.jobs * 4))
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                results = list(pool.map(scan_source_file, abs_paths, chunksize=chunksize))
+        else:
+            results = [scan_source_file(path) for path in abs_paths]
+        
+        for rel, (abs_path, components, hooks) in zip(pending, results):
+            usage[rel] = (components, hooks)
+            if self.cache:
+                self.cache.store(rel, abs_path, (components, hooks))
+        
+        if self.cache:
+            if prune:
+                self.cache.prune(rel_paths)
+            self.cache.save()
+        return usage
+
+
+class InotifyWatcher:
+    """Reports changed files under a set of directory trees using Linux inotify.
+    
+    Every directory below the roots gets its own watch (inotify is not
+    recursive); directories created later are added as they appear. Waiting
+    blocks in select(), so an idle watcher costs no CPU.
+    """
+    
+    kind = 'inotify'
+    
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+            | IN_DELETE_SELF | IN_ONLYDIR)
+    EVENT = struct.Struct('iIII')
+    
+    def __init__(self, roots: List[str], accept):
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, 'inotify is only available on Linux')
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self.accept = accept
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.paths: Dict[int, str] = {}
+        try:
+            for root in roots:
+                self._add_tree(root)
+        except OSError:
+            self.close()
+            raise
+    
+    def _add_tree(self, root: str) -> Set[str]:
+        """Watch a directory and all directories below it; returns the files found"""
+        found = set()
+        for dirpath, _, filenames in os.walk(root):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirpath), self.MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err in (errno.ENOENT, errno.ENOTDIR):
+                    continue  # Removed while walking
+                raise OSError(err, f"inotify_add_watch failed for {dirpath}"
+                                   + (' (raise fs.inotify.max_user_watches)' if err == errno.ENOSPC else ''))
+            self.paths[wd] = dirpath
+            found.update(p for p in (os.path.join(dirpath, n) for n in filenames) if self.accept(p))
+        return found
+    
+    def _drop_tree(self, root: str):
+        """Stop watching a directory tree that was moved away"""
+        for wd, path in list(self.paths.items()):
+            if path == root or path.startswith(root + os.sep):
+                self.libc.inotify_rm_watch(self.fd, wd)
+                del self.paths[wd]
+    
+    def wait(self, timeout: Optional[float]) -> Optional[Set[str]]:
+        """Changed file paths, an empty set on timeout, or None if a full rescan is needed"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return set()
+            changed = self._read_events()
+            # Events for files outside scope (editor swap files, ...) do not count
+            if changed is None or changed:
+                return changed
+    
+    def _read_events(self) -> Optional[Set[str]]:
+        changed: Set[str] = set()
+        rescan = False
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = self.EVENT.unpack_from(buffer, offset)
+                offset += self.EVENT.size
+                name = buffer[offset:offset + length].rstrip(b'\0')
+                offset += length
+                
+                if mask & self.IN_Q_OVERFLOW:
+                    rescan = True
+                    continue
+                if mask & self.IN_IGNORED:
+                    self.paths.pop(wd, None)
+                    continue
+                directory = self.paths.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name))
+                if mask & self.IN_ISDIR:
+                    if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                        changed.update(self._add_tree(path))
+                    elif mask & self.IN_MOVED_FROM:
+                        # The files inside vanished without events of their own
+                        self._drop_tree(path)
+                        rescan = True
+                elif self.accept(path):
+                    changed.add(path)
+        return None if rescan else changed
+    
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback watcher that compares mtime and size of in-scope files every interval"""
+    
+    kind = 'polling'
+    
+    def __init__(self, roots: List[str], accept, interval: float = WATCH_POLL_SECONDS):
+        self.roots = roots
+        self.accept = accept
+        self.interval = interval
+        self.state = self._stat_all()
+    
+    def _stat_all(self) -> Dict[str, Tuple[int, int]]:
+        state = {}
+        for root in self.roots:
+            for dirpath, _, filenames in os.walk(root):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    if not self.accept(path):
+                        continue
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    state[path] = (st.st_mtime_ns, st.st_size)
+        return state
+    
+    def wait(self, timeout: Optional[float]) -> Optional[Set[str]]:
+        """Changed file paths, or an empty set if nothing changed within timeout"""
+        while True:
+            time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+            state = self._stat_all()
+            changed = {path for path in state.keys() | self.state.keys()
+                       if state.get(path) != self.state.get(path)}
+            self.state = state
+            if changed or timeout is not None:
+                return changed
+    
+    def close(self):
+        pass
+
+
+def open_source_watcher(roots: List[str], accept, polling: bool = False,
+                        interval: float = WATCH_POLL_SECONDS):
+    """inotify where available, otherwise (or when asked to) polling"""
+    if not polling:
+        try:
+            return InotifyWatcher(roots, accept)
+        except (OSError, AttributeError) as e:
+            print(f"⚠️  inotify unavailable ({e}); polling every {interval:g}s instead")
+    return PollingWatcher(roots, accept, interval)
+
+
+class ChangeJournal:
+    """Append-only JSONL log of field-level component mutations.
+    
+    The first line is a snapshot header naming the base document the entries
+    replay on top of. Every later line is one mutation tagged with the save
+    transaction (`txn`) it belongs to. Reads stream the file line by line.
+    """
+    
+    def __init__(self, path: str, snapshot_path: str):
+        self.path = path
+        self.snapshot_path = snapshot_path
+    
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+    
+    def entries(self) -> Iterator[Dict]:
+        """Stream every journal line, snapshot header included"""
+        if not self.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            if PROFILER.enabled:
+                PROFILER.count('bytes_read', f.tell())
+    
+    def last_seq(self) -> int:
+        """Return the sequence number of the last line without reading the whole file"""
+        if not self.exists():
+            return 0
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            chunk = 4096
+            while True:
+                start = max(0, end - chunk)
+                f.seek(start)
+                lines = f.read(end - start).strip().splitlines()
+                if len(lines) > 1 or start == 0:
+                    break
+                chunk *= 2
+        return json.loads(lines[-1]).get('seq', 0) if lines else 0
+    
+    def _write_snapshot(self, audit_bytes: bytes, seq: int) -> bytes:
+        """Write the base snapshot and return the journal header line"""
+        write_atomic(self.snapshot_path, audit_bytes)
+        header = {
+            'op': 'snapshot',
+            'seq': seq,
+            'ts': datetime.now().isoformat(timespec='seconds'),
+            'snapshot': os.path.basename(self.snapshot_path),
+            'sha256': hashlib.sha256(audit_bytes).hexdigest(),
+        }
+        return (json.dumps(header, ensure_ascii=False) + '\n').encode('utf-8')
+    
+    @profiled('journal')
+    def append(self, entries: List[Dict], base_bytes: bytes, extra: Optional[Dict] = None) -> str:
+        """Append one transaction; the first ever append snapshots base_bytes"""
+        if not self.exists():
+            write_atomic(self.path, self._write_snapshot(base_bytes, 0))
+        
+        seq = self.last_seq()
+        now = datetime.now()
+        txn = now.strftime('%Y%m%dT%H%M%S%f')
+        lines = []
+        for entry in entries:
+            seq += 1
+            record = {'seq': seq, 'txn': txn, 'ts': now.isoformat(timespec='seconds')}
+            record.update(entry)
+            if extra:
+                record.update(extra)
+            lines.append(json.dumps(record, ensure_ascii=False))
+        
+        text = '\n'.join(lines) + '\n'
+        if PROFILER.enabled:
+            PROFILER.count('bytes_written', len(text.encode('utf-8')))
+            PROFILER.count('journal_entries', len(lines))
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        return txn
+    
+    def compact(self, audit_bytes: bytes) -> int:
+        """Fold the journal into a fresh snapshot; returns the entries dropped"""
+        folded = sum(1 for entry in self.entries() if entry.get('op') != 'snapshot')
+        write_atomic(self.path, self._write_snapshot(audit_bytes, self.last_seq()))
+        return folded
+    
+    def load_snapshot(self) -> Tuple[Dict, Dict]:
+        """Return the snapshot header and the base document it names"""
+        header = next(self.entries(), None)
+        if header is None or header.get('op') != 'snapshot':
+            raise ValueError(f"{self.path} has no snapshot header")
+        with open(self.snapshot_path, 'rb') as f:
+            return header, json.loads(f.read())
+    
+    @staticmethod
+    def diff_entries(before: Dict[str, Dict], after: Dict[str, Dict]) -> List[Dict]:
+        """Entries that turn one components mapping into another when replayed"""
+        entries = [{'op': 'delete', 'component': name, 'old': comp}
+                   for name, comp in before.items() if name not in after]
+        for name, comp in after.items():
+            old = before.get(name)
+            if old is None:
+                entries.append({'op': 'create', 'component': name, 'new': comp})
+                continue
+            for field in list(old) + [field for field in comp if field not in old]:
+                if field not in comp:
+                    entries.append({'op': 'set', 'component': name, 'field': field, 'old': old[field]})
+                elif field not in old:
+                    entries.append({'op': 'set', 'component': name, 'field': field, 'new': comp[field]})
+                elif old[field] != comp[field]:
+                    entries.append({'op': 'set', 'component': name, 'field': field,
+                                    'old': old[field], 'new': comp[field]})
+        return entries
+    
+    @staticmethod
+    def apply(components: Dict[str, Dict], entry: Dict):
+        """Replay one entry forwards onto a components mapping"""
+        op = entry.get('op')
+        name = entry.get('component')
+        if op == 'create':
+            components[name] = copy.deepcopy(entry['new'])
+        elif op == 'delete':
+            components.pop(name, None)
+        elif op == 'set' and name in components:
+            if 'new' in entry:
+                components[name][entry['field']] = copy.deepcopy(entry['new'])
+            else:
+                components[name].pop(entry['field'], None)
+
+
+class StorageConflict(Exception):
+    """Another writer committed a change to something this run also changed"""
+
+
+class JsonAuditStore:
+    """audit.json as the source of truth, rewritten whole and atomically on save"""
+    
+    name = 'json'
+    
+    @property
+    def location(self) -> str:
+        return self.audit_path
+    
+    def __init__(self, audit_path: str):
+        self.audit_path = audit_path
+    
+    def load(self) -> Tuple[Dict, bytes]:
+        with open(self.audit_path, 'rb') as f:
+            raw = f.read()
+        PROFILER.count('bytes_read', len(raw))
+        return json.loads(raw), raw
+    
+    def changed_externally(self, updater: 'AuditUpdater') -> bool:
+        """Whether audit.json no longer holds what this run loaded or last saved"""
+        with open(self.audit_path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest() != updater.saved_digest
+    
+    def save(self, updater: 'AuditUpdater', minify: bool) -> Optional[bytes]:
+        """Write the audit if it changed; returns the bytes written, or None"""
+        payload = updater.serialize_audit(minify)
+        if hashlib.sha256(payload).hexdigest() == updater.saved_digest:
+            return None
+        # Journal the field-level changes before the document they produce
+        updater.flush_journal()
+        write_atomic(self.audit_path, payload)
+        return payload
+
+
+# Component fields stored as columns; anything else goes to the `extra` JSON column
+SQLITE_COMPONENT_COLUMNS = ('name', 'path', 'description', 'category', 'used', 'primitives',
+                            'logic_extraction', 'native', 'notes', 'updated',
+                            'dependency_level', 'complexity_category')
+SQLITE_LIST_FIELDS = {'dependencies': 'dependency', 'hooks': 'hook'}
+
+SQLITE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS document (
+    key TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS components (
+    key TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    field_order TEXT NOT NULL,
+    {', '.join(SQLITE_COMPONENT_COLUMNS)},
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS dependencies (
+    component TEXT NOT NULL REFERENCES components(key) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    dependency TEXT NOT NULL,
+    PRIMARY KEY (component, position)
+);
+CREATE TABLE IF NOT EXISTS hooks (
+    component TEXT NOT NULL REFERENCES components(key) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    hook TEXT NOT NULL,
+    PRIMARY KEY (component, position)
+);
+CREATE INDEX IF NOT EXISTS dependencies_by_target ON dependencies(dependency);
+CREATE INDEX IF NOT EXISTS hooks_by_name ON hooks(hook);
+CREATE INDEX IF NOT EXISTS components_by_category ON components(category);
+CREATE INDEX IF NOT EXISTS components_by_native ON components(native);
+CREATE INDEX IF NOT EXISTS components_by_position ON components(position);
+"""
+
+
+class SqliteAuditStore:
+    """Normalized SQLite storage with per-save transactions.
+    
+    Components, their dependencies and their hooks live in indexed tables;
+    the other top-level keys (stats, metadata, ...) are JSON values in
+    `document`. The database runs in WAL mode, so readers never block the
+    writer. A save writes only the components it touched, in one IMMEDIATE
+    transaction. If another writer committed in between, each field this
+    run changed is checked against the value it started from and the save
+    is refused on a mismatch; otherwise both edits are kept and the
+    in-memory audit is refreshed from the merged tables.
+    
+    Component order and per-component field order are stored too, so
+    export() reproduces audit.json byte for byte. The sha256 of the
+    audit.json last imported or exported is kept in `meta`: audit.json is
+    the committed copy, so when it no longer matches (after a pull or a
+    hand edit) load() re-imports it and journals the difference instead of
+    letting the next save export the stale database over it.
+    """
+    
+    name = 'sqlite'
+    
+    @property
+    def location(self) -> str:
+        return self.db_path
+    
+    def __init__(self, db_path: str, audit_path: str, export: bool = True,
+                 journal: Optional['ChangeJournal'] = None):
+        self.db_path = db_path
+        self.audit_path = audit_path
+        self.export_on_save = export
+        self.journal = journal
+        self.revision = 0
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA foreign_keys=ON')
+            self._conn.executescript(SQLITE_SCHEMA)
+        return self._conn
+    
+    @contextlib.contextmanager
+    def transaction(self, write: bool = False):
+        """One explicit transaction; IMMEDIATE takes the write lock up front"""
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE' if write else 'BEGIN')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+    
+    def _revision(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+        return int(row[0]) if row else 0
+    
+    def _synced_digest(self, conn: sqlite3.Connection) -> Optional[str]:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'audit_sha256'").fetchone()
+        return row[0] if row else None
+    
+    def _set_synced_digest(self, conn: sqlite3.Connection, payload: bytes):
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('audit_sha256', ?)",
+                     (hashlib.sha256(payload).hexdigest(),))
+    
+    def _import(self, conn: sqlite3.Connection, data: Dict, raw: bytes):
+        """Replace everything stored with the given document"""
+        conn.execute('DELETE FROM components')
+        conn.execute('DELETE FROM document')
+        self._write_document(conn, data, {})
+        for position, (key, comp) in enumerate(data.get('components', {}).items()):
+            self._write_component(conn, key, comp, position)
+        self._set_synced_digest(conn, raw)
+    
+    def initialize(self, conn: sqlite3.Connection, data: Dict, raw: bytes) -> bool:
+        """Import a whole audit document into an empty database; returns whether it did.
+        
+        Run inside a write transaction, so of two runs seeding the same new
+        database one imports and the other finds the result. Finding the
+        same audit.json already imported is not an error; a different one is.
+        """
+        if conn.execute('SELECT 1 FROM document LIMIT 1').fetchone():
+            if self._synced_digest(conn) != hashlib.sha256(raw).hexdigest():
+                raise StorageConflict(f"{self.db_path} was created by another writer from a different "
+                                      f"{os.path.basename(self.audit_path)}")
+            return False
+        self._import(conn, data, raw)
+        conn.execute("INSERT INTO meta VALUES ('revision', '0')")
+        return True
+    
+    def load(self) -> Tuple[Dict, Optional[bytes]]:
+        """Read the audit; the serialized bytes are left to the caller to produce if needed"""
+        if not os.path.exists(self.db_path):
+            # First use: seed the database from the existing audit.json
+            data, raw = JsonAuditStore(self.audit_path).load()
+            with self.transaction(write=True) as conn:
+                created = self.initialize(conn, data, raw)
+                self.revision = self._revision(conn)
+                data = self._read_document(conn)
+            if created:
+                print(f"🗄️  Created {self.db_path} from {self.audit_path}")
+            return data, None
+        
+        self.sync_from_json()
+        with self.transaction() as conn:
+            self.revision = self._revision(conn)
+            data = self._read_document(conn)
+        return data, None
+    
+    def sync_from_json(self) -> bool:
+        """Re-import audit.json if it changed since it was last imported or exported.
+        
+        The components that differ are journaled as one transaction, so the
+        re-import shows up in --history and can be undone. Returns whether
+        anything was imported.
+        """
+        if not os.path.exists(self.audit_path):
+            return False
+        data, raw = JsonAuditStore(self.audit_path).load()
+        digest = hashlib.sha256(raw).hexdigest()
+        with self.transaction() as conn:
+            if self._synced_digest(conn) == digest:
+                return False
+        
+        with self.transaction(write=True) as conn:
+            stored = self._read_document(conn)
+            if serialize_document(stored) == raw or serialize_document(stored, minify=True) == raw:
+                # Same content, e.g. a database created before digests were recorded
+                self._set_synced_digest(conn, raw)
+                return False
+            self._import(conn, data, raw)
+            self.revision = self._revision(conn) + 1
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('revision', ?)", (str(self.revision),))
+        
+        entries = ChangeJournal.diff_entries(stored.get('components', {}), data.get('components', {}))
+        if entries and self.journal is not None:
+            self.journal.append(entries, serialize_document(stored),
+                                {'imported': os.path.basename(self.audit_path)})
+        print(f"📥 {self.audit_path} changed since {self.db_path} last synced with it; "
+              f"re-imported it ({len(entries)} component field changes)")
+        return True
+    
+    def changed_externally(self, updater: 'AuditUpdater') -> bool:
+        """Whether another writer committed, or audit.json changed, since this run loaded or last saved"""
+        self.sync_from_json()
+        with self.transaction() as conn:
+            return self._revision(conn) != self.revision
+    
+    def _read_document(self, conn: sqlite3.Connection) -> Dict:
+        data = {}
+        for key, value in conn.execute("SELECT key, value FROM document ORDER BY position"):
+            data[key] = self._read_components(conn) if key == 'components' else json.loads(value)
+        return data
+    
+    def _read_components(self, conn: sqlite3.Connection, keys: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        lists = {field: {} for field in SQLITE_LIST_FIELDS}
+        for field, column in SQLITE_LIST_FIELDS.items():
+            for component, value in conn.execute(
+                    f"SELECT component, {column} FROM {field} ORDER BY component, position"):
+                lists[field].setdefault(component, []).append(value)
+        
+        columns = ', '.join(SQLITE_COMPONENT_COLUMNS)
+        query = f"SELECT key, field_order, {columns}, extra FROM components"
+        if keys is None:
+            rows = conn.execute(query + " ORDER BY position")
+        else:
+            keys = list(keys)
+            rows = conn.execute(query + f" WHERE key IN ({', '.join('?' * len(keys))})", keys)
+        
+        components = {}
+        for row in rows:
+            key, field_order = row[0], json.loads(row[1])
+            values = dict(zip(SQLITE_COMPONENT_COLUMNS, row[2:-1]))
+            extra = json.loads(row[-1]) if row[-1] else {}
+            comp = {}
+            for field in field_order:
+                if field in extra:
+                    comp[field] = extra[field]
+                elif field in SQLITE_LIST_FIELDS:
+                    comp[field] = lists[field].get(key, [])
+                else:
+                    comp[field] = values[field]
+            components[key] = comp
+        return components
+    
+    def _write_component(self, conn: sqlite3.Connection, key: str, comp: Dict, position: Optional[int] = None):
+        """Insert or replace one component row with its dependency and hook rows"""
+        extra = {}
+        values = dict.fromkeys(SQLITE_COMPONENT_COLUMNS)
+        for field, value in comp.items():
+            if field in SQLITE_COMPONENT_COLUMNS and (value is None or isinstance(value, (str, int, float))):
+                values[field] = value
+            elif field in SQLITE_LIST_FIELDS and isinstance(value, list) and all(isinstance(v, str) for v in value):
+                continue
+            else:
+                extra[field] = value
+        if position is None:
+            row = conn.execute('SELECT position FROM components WHERE key = ?', (key,)).fetchone()
+            position = row[0] if row else conn.execute(
+                'SELECT COALESCE(MAX(position), -1) + 1 FROM components').fetchone()[0]
+        
+        conn.execute(f"INSERT OR REPLACE INTO components (key, position, field_order, "
+                     f"{', '.join(SQLITE_COMPONENT_COLUMNS)}, extra) "
+                     f"VALUES ({', '.join('?' * (len(SQLITE_COMPONENT_COLUMNS) + 4))})",
+                     (key, position, json.dumps(list(comp)), *values.values(),
+                      json.dumps(extra, ensure_ascii=False) if extra else None))
+        for field, column in SQLITE_LIST_FIELDS.items():
+            conn.execute(f"DELETE FROM {field} WHERE component = ?", (key,))
+            if field not in extra:
+                conn.executemany(f"INSERT INTO {field} (component, position, {column}) VALUES (?, ?, ?)",
+                                 [(key, i, value) for i, value in enumerate(comp.get(field) or [])])
+    
+    def _write_document(self, conn: sqlite3.Connection, data: Dict, stored: Dict[str, Optional[str]]) -> int:
+        """Write top-level keys whose JSON differs from what is stored; returns keys written"""
+        written = 0
+        for position, (key, value) in enumerate(data.items()):
+            text = None if key == 'components' else json.dumps(value, ensure_ascii=False)
+            if key in stored and stored[key] == text:
+                continue
+            conn.execute('INSERT OR REPLACE INTO document VALUES (?, ?, ?)', (key, position, text))
+            written += 1
+        for key in stored.keys() - data.keys():
+            conn.execute('DELETE FROM document WHERE key = ?', (key,))
+            written += 1
+        return written
+    
+    def _conflicts(self, conn: sqlite3.Connection, changes: List[Dict]) -> List[str]:
+        """Fields another writer changed to something other than what this run wants.
+        
+        A stored value still equal to where this run started, or already
+        equal to where it ends, is not a conflict.
+        """
+        created = {entry['component'] for entry in changes if entry['op'] == 'create'}
+        first: Dict[Tuple[str, Optional[str]], Dict] = {}
+        last: Dict[Tuple[str, Optional[str]], Dict] = {}
+        for entry in changes:
+            # Fields set on a component created in this run have nothing to compare against
+            if entry['op'] == 'set' and entry['component'] in created:
+                continue
+            target = (entry['component'], entry.get('field'))
+            first.setdefault(target, entry)
+            last[target] = entry
+        current = self._read_components(conn, {component for component, _ in first})
+        
+        conflicts = []
+        for target, entry in first.items():
+            component, field = target
+            comp = current.get(component)
+            final = last[target]
+            if field is None:
+                stored = _MISSING if comp is None else comp
+                before = entry['old'] if entry['op'] == 'delete' else _MISSING
+                after = final['new'] if final['op'] == 'create' else _MISSING
+            else:
+                stored = _MISSING if comp is None else comp.get(field, _MISSING)
+                before = entry.get('old', _MISSING)
+                after = final.get('new', _MISSING)
+            if stored != before and stored != after:
+                conflicts.append(f"{component}.{field}" if field else component)
+        return conflicts
+    
+    def save(self, updater: 'AuditUpdater', minify: bool) -> Optional[bytes]:
+        """Commit this run's component changes and document keys in one transaction"""
+        changes = updater.pending_changes
+        components = updater.data['components']
+        with self.transaction(write=True) as conn:
+            revision = self._revision(conn)
+            if revision != self.revision and changes:
+                conflicts = self._conflicts(conn, changes)
+                if conflicts:
+                    raise StorageConflict(f"{len(conflicts)} fields were changed by another writer since "
+                                          f"this run loaded them: {', '.join(sorted(conflicts)[:10])}")
+            
+            touched = list(dict.fromkeys(entry['component'] for entry in changes))
+            for key in touched:
+                if key in components:
+                    self._write_component(conn, key, components[key])
+                else:
+                    conn.execute('DELETE FROM components WHERE key = ?', (key,))
+            
+            if revision != self.revision:
+                # Pick up the other writers' components and recompute stats over the merge
+                updater.adopt_components(self._read_components(conn))
+            stored = dict(conn.execute("SELECT key, value FROM document"))
+            if not self._write_document(conn, updater.data, stored) and not touched:
+                self.revision = revision
+                return None
+            self.revision = revision + 1
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('revision', ?)", (str(self.revision),))
+        
+        updater.flush_journal()
+        payload = updater.serialize_audit(minify)
+        if self.export_on_save:
+            self._write_export(payload)
+        return payload
+    
+    def _write_export(self, payload: bytes):
+        write_atomic(self.audit_path, payload)
+        with self.transaction(write=True) as conn:
+            self._set_synced_digest(conn, payload)
+    
+    def export(self, minify: bool = False) -> bytes:
+        """Write audit.json from the database; the output depends only on the stored data"""
+        with self.transaction() as conn:
+            data = self._read_document(conn)
+        payload = serialize_document(data, minify)
+        self._write_export(payload)
+        return payload
+
+
+_MISSING = object()
+
+
+def serialize_document(data: Dict, minify: bool = False) -> bytes:
+    """Serialize an audit in the same layout as the committed file"""
+    if minify:
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    return text.encode('utf-8')
+
+
+def _comma_list(value, what: str) -> str:
+    """Accept a list or comma-separated string and return the CLI string form"""
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return ','.join(value)
+    if isinstance(value, str):
+        return value
+    raise ValueError(f"{what} must be a string or a list of strings")
+
+
+def parse_batch_operations(lines: Iterable[str]) -> List[Dict]:
+    """Parse and validate JSONL batch operations before any of them is applied.
+    
+    Blank lines and lines starting with '#' are skipped. Any malformed line
+    raises ValueError naming the line, so a bad batch never half-applies.
+    """
+    operations = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            raw = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"line {number}: invalid JSON ({e})")
+        if not isinstance(raw, dict):
+            raise ValueError(f"line {number}: expected a JSON object")
+        
+        op = raw.get('op')
+        if op not in BATCH_OPS:
+            raise ValueError(f"line {number}: unknown op {op!r} (expected one of {', '.join(BATCH_OPS)})")
+        operation = {'line': number, 'op': op, 'components': [], 'updates': {}}
+        
+        try:
+            if op == 'bulk_update':
+                names = raw.get('components')
+                if not isinstance(names, list) or not names or not all(isinstance(n, str) for n in names):
+                    raise ValueError("'components' must be a non-empty list of names")
+                operation['components'] = names
+            elif op in ('update', 'add_deps', 'remove_deps', 'set_deps'):
+                if not isinstance(raw.get('component'), str) or not raw['component']:
+                    raise ValueError("'component' is required")
+                operation['components'] = [raw['component']]
+            
+            if op in ('update', 'bulk_update'):
+                fields = raw.get('fields')
+                if not isinstance(fields, dict) or not fields:
+                    raise ValueError("'fields' must be a non-empty object")
+                for key, value in fields.items():
+                    if key not in UPDATE_FIELDS:
+                        raise ValueError(f"unknown field {key!r}")
+                    if key in FIELD_CHOICES and value not in FIELD_CHOICES[key]:
+                        raise ValueError(f"invalid {key} {value!r} (expected one of {', '.join(FIELD_CHOICES[key])})")
+                    if key in ('hooks', 'add_deps', 'remove_deps', 'set_deps'):
+                        value = _comma_list(value, key)
+                    elif not isinstance(value, str):
+                        raise ValueError(f"{key} must be a string")
+                    operation['updates'][key] = value
+            elif op in ('add_deps', 'remove_deps', 'set_deps'):
+                operation['updates'][op] = _comma_list(raw.get('deps'), "'deps'")
+            elif op == 'validate':
+                operation['fix'] = bool(raw.get('fix', False))
+        except ValueError as e:
+            raise ValueError(f"line {number}: {e}")
+        
+        operations.append(operation)
+    return operations
+
+
+COMPLEXITY_BUCKETS = ('basic', 'simple', 'medium', 'complex')
+
+
+class AuditStats:
+    """Statistics and dependency hierarchy maintained by deltas.
+    
+    build() makes one pass over the components; afterwards every field
+    change is applied with apply(), which only touches the counters and the
+    bucket the value moved between. Materializing the stats is then
+    proportional to the number of buckets, plus a sort of each hierarchy
+    list back into component order.
+    """
+    
+    TRACKED_FIELDS = frozenset({'primitives', 'logic_extraction', 'native', 'category',
+                                'used', 'complexity_category'})
+    
+    def __init__(self):
+        self.components: Optional[Dict[str, Dict]] = None
+        self.total = 0
+        self.primitives_done = 0
+        self.logic_extraction_done = 0
+        self.native_ready = 0
+        self.native_done = 0
+        self.by_category: Dict[str, int] = {}
+        self.by_usage: Dict[str, int] = {}
+        self.hierarchy: Dict[str, Dict[str, None]] = {bucket: {} for bucket in COMPLEXITY_BUCKETS}
+        self.position: Dict[str, int] = {}
+        self._next_position = 0
+    
+    def build(self, components: Dict[str, Dict]) -> 'AuditStats':
+        """Aggregate every stat in a single pass"""
+        self.__init__()
+        self.components = components
+        primitives_done = logic_extraction_done = native_ready = native_done = 0
+        by_category = self.by_category
+        by_usage = self.by_usage
+        hierarchy = self.hierarchy
+        
+        for name, comp in components.items():
+            get = comp.get
+            if get('primitives') == 'done':
+                primitives_done += 1
+            if get('logic_extraction') in ('done', 'keep'):
+                logic_extraction_done += 1
+            native = get('native')
+            if native == 'ready':
+                native_ready += 1
+            elif native == 'done':
+                native_done += 1
+            category = get('category', 'unknown')
+            by_category[category] = by_category.get(category, 0) + 1
+            used = get('used', 'unknown')
+            by_usage[used] = by_usage.get(used, 0) + 1
+            bucket = hierarchy.get(get('complexity_category', 'basic'))
+            if bucket is not None:
+                bucket[name] = None
+        
+        self.total = len(components)
+        self.position = dict(zip(components, range(self.total)))
+        self._next_position = self.total
+        self.primitives_done = primitives_done
+        self.logic_extraction_done = logic_extraction_done
+        self.native_ready = native_ready
+        self.native_done = native_done
+        return self
+    
+    @staticmethod
+    def _bump(counts: Dict[str, int], key: str, delta: int):
+        count = counts.get(key, 0) + delta
+        if count:
+            counts[key] = count
+        else:
+            counts.pop(key, None)
+    
+    def _count(self, name: str, field: str, value, delta: int):
+        """Add or remove one field value's contribution"""
+        if field == 'primitives':
+            if value == 'done':
+                self.primitives_done += delta
+        elif field == 'logic_extraction':
+            if value in ('done', 'keep'):
+                self.logic_extraction_done += delta
+        elif field == 'native':
+            if value == 'ready':
+                self.native_ready += delta
+            elif value == 'done':
+                self.native_done += delta
+        elif field == 'category':
+            self._bump(self.by_category, value, delta)
+        elif field == 'used':
+            self._bump(self.by_usage, value, delta)
+        elif field == 'complexity_category' and value in self.hierarchy:
+            if delta > 0:
+                self.hierarchy[value][name] = None
+            else:
+                self.hierarchy[value].pop(name, None)
+    
+    @staticmethod
+    def _value(comp: Dict, field: str):
+        """Read a field the way the stats have always defaulted it"""
+        if field in ('category', 'used'):
+            return comp.get(field, 'unknown')
+        if field == 'complexity_category':
+            return comp.get(field, 'basic')
+        return comp.get(field)
+    
+    def add(self, name: str, comp: Dict):
+        """Count a component that was added to the audit"""
+        self.total += 1
+        self.position[name] = self._next_position
+        self._next_position += 1
+        for field in self.TRACKED_FIELDS:
+            self._count(name, field, self._value(comp, field), 1)
+    
+    def remove(self, name: str, comp: Dict):
+        """Uncount a component that was removed from the audit"""
+        self.total -= 1
+        self.position.pop(name, None)
+        for field in self.TRACKED_FIELDS:
+            self._count(name, field, self._value(comp, field), -1)
+    
+    def count_field(self, name: str, comp: Dict, field: str, delta: int):
+        """Add (+1) or remove (-1) one field's current contribution"""
+        if field in self.TRACKED_FIELDS:
+            self._count(name, field, self._value(comp, field), delta)
+    
+    @staticmethod
+    def _ordered(counts: Dict[str, int], field: str) -> Dict[str, int]:
+        """Emit counts in the documented value order, unknown values last"""
+        order = FIELD_CHOICES[field]
+        known = {value: counts[value] for value in order if value in counts}
+        known.update((value, counts[value]) for value in sorted(counts) if value not in known)
+        return known
+    
+    def to_stats(self) -> Dict:
+        return {
+            'total': self.total,
+            'primitives_done': self.primitives_done,
+            'logic_extraction_done': self.logic_extraction_done,
+            'native_ready': self.native_ready,
+            'native_done': self.native_done,
+            'by_category': self._ordered(self.by_category, 'category'),
+            'by_usage': self._ordered(self.by_usage, 'used'),
+        }
+    
+    def to_hierarchy(self) -> Dict:
+        position = self.position
+        return {
+            bucket: {
+                'count': len(members),
+                'components': sorted(members, key=position.__getitem__)
+            } for bucket, members in self.hierarchy.items()
+        }
+
+
+# Query field names (and short aliases) mapped to component keys; None is the audit key itself
+QUERY_FIELDS = {
+    'key': None, 'name': 'name', 'path': 'path', 'description': 'description',
+    'category': 'category', 'used': 'used', 'usage': 'used',
+    'primitives': 'primitives', 'logic_extraction': 'logic_extraction', 'logic': 'logic_extraction',
+    'native': 'native', 'complexity': 'complexity_category', 'complexity_category': 'complexity_category',
+    'level': 'dependency_level', 'dependency_level': 'dependency_level',
+    'hooks': 'hooks', 'deps': 'dependencies', 'dependencies': 'dependencies', 'updated': 'updated',
+}
+QUERY_CONDITION_RE = re.compile(r'^\s*(\w+)\s*(<=|>=|!=|=|<|>|~)\s*(.*?)\s*$')
+QUERY_DEFAULT_FIELDS = ['key', 'category', 'primitives', 'native', 'level']
+
+
+def parse_query(expression: str) -> List[Tuple[Optional[str], str, List[str]]]:
+    """Parse `field op value [and ...]` into (component field, op, values).
+    
+    Ops are = != < <= > >= and ~ (contains). `|` separates alternatives,
+    e.g. `native=todo|in_progress`. A value containing spaces must be quoted,
+    so a connector other than `and` is an error rather than part of a value.
+    """
+    conditions = []
+    for clause in re.split(r'\s+and\s+', expression.strip(), flags=re.I):
+        match = QUERY_CONDITION_RE.match(clause)
+        if not match:
+            raise ValueError(f"cannot parse condition {clause!r} (expected field<op>value)")
+        name, op, raw = match.groups()
+        if name not in QUERY_FIELDS:
+            raise ValueError(f"unknown field {name!r} (expected one of {', '.join(QUERY_FIELDS)})")
+        values = []
+        for value in raw.split('|'):
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in '\'"':
+                value = value[1:-1]
+            elif re.search(r'\s', value):
+                raise ValueError(f"unexpected {value.split()[1]!r} in {clause!r} "
+                                 f"(join conditions with 'and'; quote values that contain spaces)")
+            values.append(value)
+        field = QUERY_FIELDS[name]
+        if op in ('<', '<=', '>', '>='):
+            if field != 'dependency_level' or len(values) != 1 or not values[0].lstrip('-').isdigit():
+                raise ValueError(f"{op} needs an integer value on level, got {clause!r}")
+        conditions.append((field, op, values))
+    return conditions
+
+
+class ComponentIndex:
+    """Secondary indexes from status/category values to component keys.
+    
+    Also keeps each component's insertion position, so index hits can be
+    returned in audit order without scanning all components.
+    """
+    
+    INDEXED_FIELDS = ('primitives', 'logic_extraction', 'native', 'category', 'used',
+                      'complexity_category', 'dependency_level')
+    
+    def __init__(self):
+        self.components: Optional[Dict[str, Dict]] = None
+        self.by_field: Dict[str, Dict[str, Set[str]]] = {}
+        self.position: Dict[str, int] = {}
+        self._next_position = 0
+    
+    def build(self, components: Dict[str, Dict]) -> 'ComponentIndex':
+        self.components = components
+        self.by_field = {field: {} for field in self.INDEXED_FIELDS}
+        self.position = {}
+        self._next_position = 0
+        for name, comp in components.items():
+            self.add(name, comp)
+        return self
+    
+    def add(self, name: str, comp: Dict):
+        self.position[name] = self._next_position
+        self._next_position += 1
+        for field, values in self.by_field.items():
+            values.setdefault(str(comp.get(field)), set()).add(name)
+    
+    def remove(self, name: str, comp: Dict):
+        self.position.pop(name, None)
+        for field, values in self.by_field.items():
+            values.get(str(comp.get(field)), set()).discard(name)
+    
+    def move(self, name: str, field: str, old, new):
+        """Re-file one component after an indexed field changed"""
+        values = self.by_field[field]
+        values.get(str(old), set()).discard(name)
+        values.setdefault(str(new), set()).add(name)
+    
+    def candidates(self, conditions) -> Tuple[Optional[Set[str]], list]:
+        """Intersect index hits for equality conditions; return the rest as residual filters"""
+        hits = []
+        residual = []
+        for field, op, values in conditions:
+            if op == '=' and field in self.by_field:
+                index = self.by_field[field]
+                hits.append(set().union(*(index.get(value, set()) for value in values)))
+            else:
+                residual.append((field, op, values))
+        if not hits:
+            return None, residual
+        hits.sort(key=len)
+        return hits[0].intersection(*hits[1:]), residual
+
+
+def _matches(key: str, comp: Dict, field: Optional[str], op: str, values: List[str]) -> bool:
+    """Evaluate one residual query condition against a component"""
+    value = key if field is None else comp.get(field)
+    if isinstance(value, list):
+        if op == '=':
+            return any(v in value for v in values)
+        if op == '~':
+            return any(v.lower() in item.lower() for v in values for item in value)
+        if op == '!=':
+            return not any(v in value for v in values)
+        return False
+    if op in ('<', '<=', '>', '>='):
+        if not isinstance(value, int):
+            return False
+        limit = int(values[0])
+        return {'<': value < limit, '<=': value <= limit, '>': value > limit, '>=': value >= limit}[op]
+    text = '' if value is None else str(value)
+    if op == '=':
+        return text in values
+    if op == '!=':
+        return text not in values
+    lowered = text.lower()
+    return any(v.lower() in lowered for v in values)
+
+
+def format_rows(rows: List[Dict], fields: List[str], fmt: str) -> str:
+    """Render query rows as an aligned table, JSON or CSV"""
+    if fmt == 'json':
+        return json.dumps(rows, ensure_ascii=False, indent=2)
+    
+    def cell(value) -> str:
+        if isinstance(value, list):
+            return ','.join(value)
+        return '' if value is None else str(value)
+    
+    if fmt == 'csv':
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator='\n')
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow([cell(row[field]) for field in fields])
+        return out.getvalue().rstrip('\n')
+    
+    table = [fields] + [[cell(row[field]) for field in fields] for row in rows]
+    widths = [max(len(line[i]) for line in table) for i in range(len(fields))]
+    lines = ['  '.join(text.ljust(width) for text, width in zip(line, widths)).rstrip() for line in table]
+    lines.insert(1, '  '.join('-' * width for width in widths))
+    return '\n'.join(lines)
+
+
+# --diff reports these fields as status transitions; --trend tracks these counters
+DIFF_STATUS_FIELDS = ('primitives', 'logic_extraction', 'native', 'category', 'used')
+TREND_COUNTERS = ['total', 'primitives_done', 'logic_extraction_done', 'native_ready', 'native_done']
+SNAPSHOT_DATE_RE = re.compile(r'(20\d{2})-?(\d{2})-?(\d{2})')
+
+
+def component_digest(comp: Dict) -> bytes:
+    """Content hash of one component, independent of its field order"""
+    canonical = json.dumps(comp, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).digest()
+
+
+def diff_audits(before: Dict, after: Dict) -> Dict:
+    """Compare two audit documents by component key.
+    
+    Components with equal content hashes are skipped without looking at
+    their fields. For the rest, status fields become transitions, the
+    dependency list becomes additions and removals, and any other changed
+    field is listed by name. Progress counters are recomputed for both
+    sides rather than read from their possibly stale `stats`.
+    """
+    old_components = before.get('components', {})
+    new_components = after.get('components', {})
+    
+    changed = []
+    transitions: Dict[Tuple[str, str, str], int] = {}
+    unchanged = 0
+    for name, old in old_components.items():
+        new = new_components.get(name)
+        if new is None:
+            continue
+        if component_digest(old) == component_digest(new):
+            unchanged += 1
+            continue
+        
+        entry = {'component': name, 'transitions': {}, 'dependencies_added': [],
+                 'dependencies_removed': [], 'fields': []}
+        for field in list(old) + [field for field in new if field not in old]:
+            was, now = old.get(field), new.get(field)
+            if was == now:
+                continue
+            if field in DIFF_STATUS_FIELDS:
+                entry['transitions'][field] = [was, now]
+                key = (field, was, now)
+                transitions[key] = transitions.get(key, 0) + 1
+            elif field == 'dependencies':
+                was_set, now_set = set(was or []), set(now or [])
+                entry['dependencies_added'] = [dep for dep in now or [] if dep not in was_set]
+                entry['dependencies_removed'] = [dep for dep in was or [] if dep not in now_set]
+                if not entry['dependencies_added'] and not entry['dependencies_removed']:
+                    entry['fields'].append(field)  # Reordered only
+            else:
+                entry['fields'].append(field)
+        changed.append(entry)
+    
+    field_order = {field: i for i, field in enumerate(DIFF_STATUS_FIELDS)}
+    summary = sorted(transitions.items(), key=lambda item: (field_order[item[0][0]], -item[1]))
+    old_stats = AuditStats().build(old_components).to_stats()
+    new_stats = AuditStats().build(new_components).to_stats()
+    return {
+        'added': [name for name in new_components if name not in old_components],
+        'removed': [name for name in old_components if name not in new_components],
+        'changed': changed,
+        'unchanged': unchanged,
+        'transitions': [{'field': field, 'from': was, 'to': now, 'count': count}
+                        for (field, was, now), count in summary],
+        'progress': {counter: [old_stats[counter], new_stats[counter]] for counter in TREND_COUNTERS},
+    }
+
+
+def snapshot_date(path: str, components: Dict[str, Dict]) -> str:
+    """The date a snapshot represents: from its file name, else its newest `updated`"""
+    match = SNAPSHOT_DATE_RE.search(os.path.basename(path))
+    if match:
+        return '-'.join(match.groups())
+    newest = max((comp.get('updated', '') for comp in components.values()), default='')
+    return newest or datetime.fromtimestamp(os.path.getmtime(path)).strftime('%Y-%m-%d')
+
+
+# Viewer index: what ComponentAuditViewer loads up front, plus lazily loaded detail shards
+VIEWER_INDEX_VERSION = 1
+VIEWER_SHARD_SIZE = 64
+VIEWER_ROW_FIELDS = ['name', 'path', 'description', 'category', 'used', 'primitives',
+                     'logic_extraction', 'native', 'complexity_category', 'dependency_level']
+VIEWER_DETAIL_FIELDS = ['notes', 'hooks', 'dependencies', 'updated']
+VIEWER_DEPENDENCY_PREVIEW = 3
+
+# Native roadmap phases shown by the viewer: (id, complexity, primitives, native statuses)
+VIEWER_ROADMAP = (
+    ('ready_now', 'basic', 'done', ('todo',)),
+    ('next_phase', 'simple', 'done', ('todo', 'in_progress')),
+    ('medium_complexity', 'medium', None, ('todo', 'in_progress')),
+    ('complex_components', 'complex', None, ('todo', 'in_progress')),
+    ('completed', None, None, ('done', 'ready')),
+)
+
+
+def roadmap_phase(comp: Dict) -> Optional[str]:
+    """The viewer roadmap phase a component belongs to; phases never overlap"""
+    for phase, complexity, primitives, natives in VIEWER_ROADMAP:
+        if ((complexity is None or comp.get('complexity_category') == complexity)
+                and (primitives is None or comp.get('primitives') == primitives)
+                and comp.get('native') in natives):
+            return phase
+    return None
+
+
+def build_viewer_index(data: Dict, source_digest: str) -> Tuple[Dict, List[Dict]]:
+    """Split the audit into a compact viewer index and per-shard component details.
+    
+    Rows are in component-key order and everything else refers to them by
+    position: search keys are lowercased once here instead of on every
+    keystroke, orderings are presorted, and bucket lists hold the rows of
+    each roadmap phase. Notes, hooks and the full dependency
+    list go to shard files chosen by a stable hash of the key, so editing a
+    component rewrites only its own shard.
+    """
+    components = data.get('components', {})
+    keys = sorted(components)
+    shard_count = max(1, -(-len(keys) // VIEWER_SHARD_SIZE))
+    shards = [{'version': VIEWER_INDEX_VERSION, 'components': {}} for _ in range(shard_count)]
+    
+    rows = []
+    search = []
+    roadmap = {phase[0]: [] for phase in VIEWER_ROADMAP}
+    for position, key in enumerate(keys):
+        comp = components[key]
+        deps = comp.get('dependencies') or []
+        shard = zlib.crc32(key.encode('utf-8')) % shard_count
+        row = {'key': key}
+        for field in VIEWER_ROW_FIELDS:
+            if field in comp:
+                row[field] = comp[field]
+        row['dependency_count'] = len(deps)
+        row['dependencies_preview'] = deps[:VIEWER_DEPENDENCY_PREVIEW]
+        row['shard'] = shard
+        rows.append(row)
+        search.append('\n'.join(str(comp.get(field, '')) for field in ('name', 'path', 'description')).lower())
+        
+        shards[shard]['components'][key] = {field: comp[field] for field in VIEWER_DETAIL_FIELDS if field in comp}
+        phase = roadmap_phase(comp)
+        if phase:
+            roadmap[phase].append(position)
+    
+    def by_name(position: int):
+        name = str(rows[position].get('name', ''))
+        return name.casefold(), name
+    
+    alphabetical = sorted(range(len(rows)), key=by_name)
+    metadata = data.get('metadata', {})
+    index = {
+        'version': VIEWER_INDEX_VERSION,
+        'source_sha256': source_digest,
+        'shard_count': shard_count,
+        'components': rows,
+        'search': search,
+        'order': {
+            'alphabetical': alphabetical,
+            'dependency': sorted(alphabetical, key=lambda i: rows[i].get('dependency_level') or 0),
+        },
+        'buckets': {'roadmap': roadmap},
+        'stats': data.get('stats', {}),
+        'hierarchy': ({bucket: info.get('count', 0) for bucket, info in data['dependency_hierarchy'].items()}
+                      if 'dependency_hierarchy' in data else None),
+        'mobile_strategy': data.get('mobile_strategy'),
+        'metadata': {'audit_version': metadata.get('audit_version'),
+                     'scan_scope': metadata.get('scan_scope', [])},
+    }
+    return index, shards
+
 
-class AuditUpdater:
+REQUIRED_FIELDS = ['name', 'path', 'description', 'category', 'used',
+                   'primitives', 'logic_extraction', 'native', 'notes', 'updated']
+
+
+def default_component_values(name: str, path: str = '') -> Dict:
+    """Placeholder values used when --fix fills in missing fields"""
+    return {
+        'name': name.replace('.tsx', '').replace('.ts', ''),
+        'path': path,
+        'description': 'Description needed',
+        'category': 'platform_specific',
+        'used': 'unknown',
+        'primitives': 'todo',
+        'logic_extraction': 'todo',
+        'native': 'todo',
+        'notes': 'Needs review',
+        'updated': datetime.now().strftime('%Y-%m-%d'),
+        'hooks': [],
+        'dependencies': [],
+        'dependency_level': 0,
+        'complexity_category': 'basic',
+    }
+
+
+class ValidationRule:
+    """One check run by ValidationEngine.
+    
+    visit() sees every component in the shared traversal; finish() runs once
+    afterwards for document-level checks. Issues are reported through
+    engine.report(), optionally with a fix: a (component, field, value)
+    tuple applied through set_field, or a callable.
+    """
+    
+    id = ''
+    severity = 'warning'
+    description = ''
+    
+    def visit(self, engine: 'ValidationEngine', name: str, comp: Dict):
+        pass
+    
+    def finish(self, engine: 'ValidationEngine'):
+        pass
+
+
+class RequiredFieldsRule(ValidationRule):
+    id = 'required-fields'
+    severity = 'error'
+    description = 'Every component has the required and dependency fields'
+    
+    FIELDS = REQUIRED_FIELDS + ['dependencies', 'dependency_level', 'complexity_category']
+    
+    def visit(self, engine, name, comp):
+        defaults = None
+        for field in self.FIELDS:
+            if field not in comp:
+                defaults = defaults or default_component_values(
+                    name, engine.updater.locate_source(name) or '' if 'path' not in comp else '')
+                engine.report(self, name, f"Missing field '{field}'", (name, field, defaults[field]))
+
+
+class EnumValuesRule(ValidationRule):
+    id = 'enum-values'
+    description = 'Status and category fields use the values the CLI accepts'
+    
+    def visit(self, engine, name, comp):
+        for field, choices in FIELD_CHOICES.items():
+            value = comp.get(field)
+            if value is not None and value not in choices:
+                engine.report(self, name, f"{field}={value!r} is not one of {', '.join(choices)}")
+
+
+class DanglingDependencyRule(ValidationRule):
+    id = 'dangling-dependency'
+    severity = 'error'
+    description = 'Dependencies resolve to audited components'
+    
+    def visit(self, engine, name, comp):
+        resolve = engine.updater.graph.resolve
+        for dep in comp.get('dependencies', []) or []:
+            if resolve(dep) is None:
+                engine.report(self, name, f"References non-existent dependency '{dep}'")
+
+
+class DerivedFieldsRule(ValidationRule):
+    id = 'derived-fields'
+    description = 'Stored dependency_level and complexity_category match the dependency graph'
+    
+    def visit(self, engine, name, comp):
+        if 'dependency_level' in comp:
+            level = engine.updater.graph.levels.get(name, 0)
+            if comp['dependency_level'] != level:
+                engine.report(self, name, f"dependency_level is {comp['dependency_level']}, graph says {level}",
+                              (name, 'dependency_level', level))
+        if 'complexity_category' in comp:
+            complexity = engine.updater.calculate_complexity_category(comp.get('dependencies', []))
+            if comp['complexity_category'] != complexity:
+                engine.report(self, name, f"complexity_category is {comp['complexity_category']!r}, "
+                                          f"dependency count says {complexity!r}",
+                              (name, 'complexity_category', complexity))
+
+
+class DependencyCycleRule(ValidationRule):
+    id = 'dependency-cycle'
+    severity = 'error'
+    description = 'The dependency graph has no cycles'
+    
+    def finish(self, engine):
+        for cycle in engine.updater.graph.cycles:
+            if engine.scope is None or engine.scope.intersection(cycle):
+                engine.report(self, cycle[0], f"Dependency cycle: {', '.join(cycle)}")
+
+
+class StatsConsistencyRule(ValidationRule):
+    """Recounts stats during the shared traversal and compares them with the stored ones"""
+    
+    id = 'stats-consistency'
+    description = 'stats and dependency_hierarchy match the components'
+    
     def __init__(self):
+        self.counted = AuditStats()
+    
+    def visit(self, engine, name, comp):
+        self.counted.add(name, comp)
+    
+    def finish(self, engine):
+        updater = engine.updater
+        data = updater.data
+        refresh = lambda: updater.update_statistics(verbose=False)
+        
+        if 'dependency_hierarchy' not in data:
+            engine.report(self, None, "Missing dependency_hierarchy in root", refresh)
+        elif data['dependency_hierarchy'] != self.counted.to_hierarchy():
+            engine.report(self, None, "dependency_hierarchy does not match component complexity", refresh)
+        
+        stored = data.get('stats', {})
+        for key, value in self.counted.to_stats().items():
+            if stored.get(key) != value:
+                engine.report(self, None, f"stats.{key} is {stored.get(key)!r}, components say {value!r}", refresh)
+
+
+VALIDATION_RULES = (RequiredFieldsRule, EnumValuesRule, DanglingDependencyRule,
+                    DerivedFieldsRule, DependencyCycleRule, StatsConsistencyRule)
+
+
+class ValidationEngine:
+    """Runs every validation rule over the components in one traversal.
+    
+    With a scope (a set of component keys) only those components are
+    visited and document-wide stats checks are skipped.
+    """
+    
+    def __init__(self, updater: 'AuditUpdater', scope: Optional[Set[str]] = None):
+        self.updater = updater
+        self.scope = scope
+        self.rules = [rule() for rule in VALIDATION_RULES
+                      if scope is None or rule is not StatsConsistencyRule]
+        self.issues: List[Dict] = []
+        self.fixes: List = []
+    
+    def report(self, rule: ValidationRule, component: Optional[str], message: str, fix=None):
+        self.issues.append({
+            'rule': rule.id,
+            'severity': rule.severity,
+            'component': component,
+            'message': message,
+            'fixable': fix is not None,
+        })
+        self.fixes.append(fix)
+    
+    def run(self) -> List[Dict]:
+        self.updater.ensure_dependency_graph()
+        components = self.updater.data['components']
+        names = components if self.scope is None else [n for n in self.scope if n in components]
+        rules = self.rules
+        for name in names:
+            comp = components[name]
+            for rule in rules:
+                rule.visit(self, name, comp)
+        for rule in rules:
+            rule.finish(self)
+        return self.issues
+    
+    def apply_fixes(self) -> List[str]:
+        """Apply every available fix; document-level fixes run once"""
+        applied = []
+        deferred = {}
+        for issue, fix in zip(self.issues, self.fixes):
+            if fix is None:
+                continue
+            if callable(fix):
+                deferred.setdefault(issue['rule'], fix)
+                continue
+            name, field, value = fix
+            if self.updater.set_field(name, field, value):
+                applied.append(f"Set {field} on {name}")
+        for rule_id, fix in deferred.items():
+            fix()
+            applied.append(f"Recomputed data for {rule_id}")
+        return applied
+    
+    def to_sarif(self, audit_uri: str) -> Dict:
+        """Render issues as a SARIF 2.1.0 log"""
+        levels = {'error': 'error', 'warning': 'warning'}
+        return {
+            '$schema': 'https://json.schemastore.org/sarif-2.1.0.json',
+            'version': '2.1.0',
+            'runs': [{
+                'tool': {'driver': {
+                    'name': 'update_audit.py',
+                    'rules': [{'id': rule.id, 'shortDescription': {'text': rule.description},
+                               'defaultConfiguration': {'level': levels[rule.severity]}}
+                              for rule in self.rules],
+                }},
+                'results': [{
+                    'ruleId': issue['rule'],
+                    'level': levels[issue['severity']],
+                    'message': {'text': issue['message']},
+                    'locations': [{
+                        'physicalLocation': {'artifactLocation': {'uri': audit_uri}},
+                        **({'logicalLocations': [{'fullyQualifiedName': issue['component']}]}
+                           if issue['component'] else {}),
+                    }],
+                } for issue in self.issues],
+            }],
+        }
+
+
+class AuditUpdater:
+    def __init__(self, audit_path: Optional[str] = None, storage: str = 'json', export: bool = True):
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
-        self.audit_path = os.path.join(self.script_dir, 'audit.json')
+        self.audit_path = os.path.abspath(audit_path or os.path.join(self.script_dir, 'audit.json'))
+        self.repo_root = os.path.abspath(os.path.join(self.script_dir, '..', '..', '..'))
+        # Sidecar files live next to the audit they belong to
+        audit_dir = os.path.dirname(self.audit_path)
+        self.scan_cache_path = os.path.join(audit_dir, '.audit-scan-cache.json')
+        self.fingerprints_path = os.path.join(audit_dir, '.audit-fingerprints.json')
+        self.viewer_dir = os.path.join(audit_dir, 'audit-viewer')
+        self.db_path = os.path.join(audit_dir, 'audit.db')
+        self.journal = ChangeJournal(os.path.join(audit_dir, 'audit-journal.jsonl'),
+                                     os.path.join(audit_dir, 'audit-snapshot.json'))
+        if storage == 'sqlite':
+            self.store = SqliteAuditStore(self.db_path, self.audit_path, export, self.journal)
+        else:
+            self.store = JsonAuditStore(self.audit_path)
+        self.pending_changes: List[Dict] = []
+        self.journal_extra: Optional[Dict] = None
         self.data = None
+        self.saved_bytes: Optional[bytes] = None
+        self.saved_digest: Optional[str] = None
+        self.graph = DependencyGraph()
         self.dependency_graph = {}
+        self.stats_index = AuditStats()
+        self.component_index = ComponentIndex()
+        self.sources_by_stem: Optional[Dict[str, List[str]]] = None
         
+    @profiled('load')
     def load_audit(self) -> Dict:
-        """Load the audit.json file"""
-        with open(self.audit_path, 'r') as f:
-            self.data = json.load(f)
+        """Load the audit from the configured store"""
+        self.data, raw = self.store.load()
+        if raw is None and not self.journal.exists():
+            # The first journaled save snapshots the document it started from
+            raw = self.serialize_audit()
+        self.saved_bytes = raw
+        self.saved_digest = hashlib.sha256(raw).hexdigest() if raw is not None else None
         return self.data
     
-    def save_audit(self):
-        """Save the audit.json file with proper formatting"""
-        # Create backup
-        backup_path = self.audit_path.replace('.json', f'-backup-{datetime.now().strftime("%Y%m%d")}.json')
-        if not os.path.exists(backup_path):
-            with open(backup_path, 'w') as f:
-                json.dump(self.data, f, indent=2)
-        
-        # Save main file
-        with open(self.audit_path, 'w') as f:
-            json.dump(self.data, f, indent=2)
-        print(f"✅ Saved {self.audit_path}")
-    
-    def build_dependency_graph(self):
-        """Build a dependency graph for calculating levels"""
-        self.dependency_graph = {}
-        components = self.data['components']
-        
-        for name, comp in components.items():
-            deps = comp.get('dependencies', [])
-            # Filter to only include dependencies that exist as components
-            valid_deps = [dep for dep in deps if dep in components]
-            self.dependency_graph[name] = valid_deps
+    @profiled('serialize')
+    def serialize_audit(self, minify: bool = False) -> bytes:
+        """Serialize the audit once, in the same layout as the committed file"""
+        return serialize_document(self.data, minify)
     
-    def calculate_dependency_level(self, component_name: str, visited: Set[str] = None) -> int:
-        """Calculate dependency level using depth-first search"""
-        if visited is None:
-            visited = set()
+    @profiled('save')
+    def save_audit(self, minify: bool = False, verbose: bool = True) -> bool:
+        """Save through the configured store, skipping the write if nothing changed.
         
-        if component_name in visited:
-            return 0  # Circular dependency, treat as level 0
+        verbose=False keeps the status line off stdout for machine-readable output.
+        """
+        payload = self.store.save(self, minify)
+        if payload is None:
+            self.pending_changes = []
+            if verbose:
+                print(f"ℹ️  No changes to save in {self.store.location}")
+            if self.saved_digest and self.viewer_index_digest() != self.saved_digest:
+                self.write_viewer_index()
+            return False
         
-        if component_name not in self.dependency_graph:
-            return 0
+        self.saved_bytes = payload
+        self.saved_digest = hashlib.sha256(payload).hexdigest()
+        if verbose:
+            print(f"✅ Saved {self.store.location}")
+        self.write_viewer_index()
+        return True
+    
+    def flush_journal(self):
+        """Append the queued field-level changes to the journal as one transaction"""
+        if self.pending_changes:
+            self.journal.append(self.pending_changes, self.saved_bytes or b'{}', self.journal_extra)
+            self.pending_changes = []
+            self.journal_extra = None
+    
+    def adopt_components(self, components: Dict[str, Dict]):
+        """Swap in components merged with other writers' edits and re-derive stats"""
+        self.data['components'] = components
+        self.update_statistics(verbose=False)
+    
+    def viewer_index_digest(self) -> Optional[str]:
+        """Digest of the audit the viewer index was built from, or None if there is none"""
+        try:
+            with open(os.path.join(self.viewer_dir, 'index.json'), 'r', encoding='utf-8') as f:
+                return json.load(f).get('source_sha256')
+        except (OSError, ValueError):
+            return None
+    
+    @profiled('viewer_index')
+    def write_viewer_index(self) -> int:
+        """Write the viewer index and detail shards for the saved audit; returns files written.
         
-        visited.add(component_name)
-        deps = self.dependency_graph[component_name]
+        Files whose content is unchanged are left alone, and shards beyond the
+        current shard count are removed.
+        """
+        index, shards = build_viewer_index(self.data, self.saved_digest)
+        os.makedirs(self.viewer_dir, exist_ok=True)
+        outputs = {'index.json': index}
+        outputs.update((f'details-{n:02d}.json', shard) for n, shard in enumerate(shards))
         
-        if not deps:
-            return 0  # No dependencies = level 0
+        written = 0
+        for filename, document in outputs.items():
+            path = os.path.join(self.viewer_dir, filename)
+            payload = json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            try:
+                with open(path, 'rb') as f:
+                    if f.read() == payload:
+                        continue
+            except OSError:
+                pass
+            write_atomic(path, payload)
+            written += 1
         
-        max_level = 0
-        for dep in deps:
-            dep_level = self.calculate_dependency_level(dep, visited.copy())
-            max_level = max(max_level, dep_level + 1)
+        for filename in os.listdir(self.viewer_dir):
+            if filename.startswith('details-') and filename.endswith('.json') and filename not in outputs:
+                os.remove(os.path.join(self.viewer_dir, filename))
+        return written
+    
+    @profiled('graph_build')
+    def build_dependency_graph(self):
+        """Build a dependency graph for calculating levels"""
+        self.graph.build(self.data['components'])
+        self.dependency_graph = self.graph.forward
+    
+    def ensure_dependency_graph(self):
+        """Build the dependency index and levels once per load"""
+        if self.graph.components is not self.data['components']:
+            self.build_dependency_graph()
+            self.graph.compute_levels()
+    
+    def record_change(self, entry: Dict):
+        """Queue a journal entry; values are copied so later edits cannot leak in"""
+        self.pending_changes.append(copy.deepcopy(entry))
+    
+    def set_field(self, component_name: str, field: str, value) -> bool:
+        """Set one component field, journaling it if the value changed"""
+        comp = self.data['components'][component_name]
+        if field in comp and comp[field] == value:
+            return False
+        entry = {'op': 'set', 'component': component_name, 'field': field, 'new': value}
+        if field in comp:
+            entry['old'] = comp[field]
+        self.record_change(entry)
+        self._reindex(component_name, field, comp.get(field), value)
+        tracked = self._tracks(field)
+        if tracked:
+            self.stats_index.count_field(component_name, comp, field, -1)
+        comp[field] = value
+        if tracked:
+            self.stats_index.count_field(component_name, comp, field, 1)
+        return True
+    
+    def _tracks(self, field: str) -> bool:
+        """Whether a change to this field has to be mirrored into the stats counters"""
+        return field in AuditStats.TRACKED_FIELDS and self.stats_index.components is self.data['components']
+    
+    def _reindex(self, component_name: str, field: str, old, new):
+        """Keep the query index current when an indexed field changes"""
+        if field in ComponentIndex.INDEXED_FIELDS and self.component_index.components is self.data['components']:
+            self.component_index.move(component_name, field, old, new)
+    
+    def delete_field(self, component_name: str, field: str) -> bool:
+        """Remove one component field, journaling the old value"""
+        comp = self.data['components'][component_name]
+        if field not in comp:
+            return False
+        self.record_change({'op': 'set', 'component': component_name, 'field': field, 'old': comp[field]})
+        self._reindex(component_name, field, comp[field], None)
+        tracked = self._tracks(field)
+        if tracked:
+            self.stats_index.count_field(component_name, comp, field, -1)
+        del comp[field]
+        if tracked:
+            self.stats_index.count_field(component_name, comp, field, 1)
+        return True
+    
+    def set_dependencies(self, component_name: str, dependencies: List[str]) -> Set[str]:
+        """Replace a component's dependencies through the journal and the graph index"""
+        comp = self.data['components'][component_name]
+        if comp.get('dependencies') == dependencies:
+            return set()
+        entry = {'op': 'set', 'component': component_name, 'field': 'dependencies', 'new': dependencies}
+        if 'dependencies' in comp:
+            entry['old'] = comp['dependencies']
+        self.record_change(entry)
+        return self.graph.replace_dependencies(component_name, dependencies)
+    
+    def create_component(self, component_name: str, entry: Dict):
+        """Add a new component entry, journaling its full content"""
+        self.data['components'][component_name] = entry
+        self.record_change({'op': 'create', 'component': component_name, 'new': entry})
+        if self.stats_index.components is self.data['components']:
+            self.stats_index.add(component_name, entry)
+        if self.component_index.components is self.data['components']:
+            self.component_index.add(component_name, entry)
+    
+    def delete_component(self, component_name: str) -> Set[str]:
+        """Remove a component entry, journaling its full content.
         
-        return max_level
+        Returns the components that referenced it, whose levels need a refresh.
+        """
+        referrers = set()
+        if self.graph.components is self.data['components']:
+            referrers = self.graph.remove_component(component_name)
+        entry = self.data['components'].pop(component_name)
+        self.record_change({'op': 'delete', 'component': component_name, 'old': entry})
+        if self.stats_index.components is self.data['components']:
+            self.stats_index.remove(component_name, entry)
+        if self.component_index.components is self.data['components']:
+            self.component_index.remove(component_name, entry)
+        return referrers
+    
+    @profiled('levels')
+    def refresh_levels(self, changed: Set[str]) -> Set[str]:
+        """Recompute levels downstream of changed components and store them"""
+        affected = self.graph.update_levels(changed)
+        PROFILER.count('levels_recomputed', len(affected))
+        for name in affected:
+            level = self.graph.levels[name]
+            if self.set_field(name, 'dependency_level', level) and name not in changed:
+                self.set_field(name, 'updated', datetime.now().strftime('%Y-%m-%d'))
+        self.report_cycles(affected)
+        return affected
+    
+    def calculate_dependency_level(self, component_name: str) -> int:
+        """Return the memoized dependency level for a component"""
+        if not self.graph.levels:
+            self.graph.compute_levels()
+        return self.graph.levels.get(component_name, 0)
     
     def calculate_complexity_category(self, dependencies: List[str]) -> str:
         """Calculate complexity category based on dependency count"""
@@ -108,97 +2502,81 @@ class AuditUpdater:
             return 'complex'
     
     def update_component_calculations(self, component_name: str):
-        """Update calculated fields for a component"""
+        """Update calculated fields for a component, stamping it only if they changed"""
         comp = self.data['components'][component_name]
         deps = comp.get('dependencies', [])
         
-        # Update dependency level
-        comp['dependency_level'] = self.calculate_dependency_level(component_name)
-        
-        # Update complexity category
-        comp['complexity_category'] = self.calculate_complexity_category(deps)
+        level = self.calculate_dependency_level(component_name)
+        complexity = self.calculate_complexity_category(deps)
+        if comp.get('dependency_level') == level and comp.get('complexity_category') == complexity:
+            return
         
-        # Update timestamp
-        comp['updated'] = datetime.now().strftime('%Y-%m-%d')
+        self.set_field(component_name, 'dependency_level', level)
+        self.set_field(component_name, 'complexity_category', complexity)
+        self.set_field(component_name, 'updated', datetime.now().strftime('%Y-%m-%d'))
     
+    @profiled('recalculate')
     def recalculate_all_components(self):
         """Recalculate dependency levels and complexity for all components"""
         self.build_dependency_graph()
+        self.graph.compute_levels()
         
         print("🔄 Recalculating dependency levels and complexity...")
         for component_name in self.data['components']:
             self.update_component_calculations(component_name)
         
+        self.report_cycles()
         print(f"✅ Updated calculations for {len(self.data['components'])} components")
     
-    def update_statistics(self):
-        """Recalculate all statistics including dependency hierarchy"""
-        components = self.data['components']
-        
-        # Basic stats
-        total = len(components)
-        primitives_done = sum(1 for c in components.values() if c.get('primitives') == 'done')
-        logic_extraction_done = sum(1 for c in components.values() 
-                                  if c.get('logic_extraction') in ['done', 'keep'])
-        native_ready = sum(1 for c in components.values() if c.get('native') == 'ready')
-        native_done = sum(1 for c in components.values() if c.get('native') == 'done')
-        
-        # Category counts
-        categories = {}
-        for comp in components.values():
-            cat = comp.get('category', 'unknown')
-            categories[cat] = categories.get(cat, 0) + 1
-        
-        # Usage counts
-        usage = {}
-        for comp in components.values():
-            use = comp.get('used', 'unknown')
-            usage[use] = usage.get(use, 0) + 1
-        
-        # Dependency hierarchy counts
-        complexity_counts = {
-            'basic': 0, 'simple': 0, 'medium': 0, 'complex': 0
-        }
-        complexity_components = {
-            'basic': [], 'simple': [], 'medium': [], 'complex': []
-        }
+    def report_cycles(self, within: Optional[Set[str]] = None):
+        """Print dependency cycles found by the last level computation"""
+        for cycle in self.graph.cycles:
+            if within is not None and within.isdisjoint(cycle):
+                continue
+            print(f"⚠️  Dependency cycle ({len(cycle)} components): {', '.join(cycle)}")
+    
+    @profiled('statistics')
+    def update_statistics(self, verbose: bool = True):
+        """Refresh statistics and dependency hierarchy from the delta-maintained counters"""
+        if self.stats_index.components is not self.data['components']:
+            self.stats_index.build(self.data['components'])
+        counters = self.stats_index.to_stats()
         
-        for name, comp in components.items():
-            complexity = comp.get('complexity_category', 'basic')
-            if complexity in complexity_counts:
-                complexity_counts[complexity] += 1
-                complexity_components[complexity].append(name)
-        
-        # Update stats
-        self.data['stats'] = {
-            'total': total,
-            'primitives_done': primitives_done,
-            'logic_extraction_done': logic_extraction_done,
-            'native_ready': native_ready,
-            'native_done': native_done,
-            'by_category': categories,
-            'by_usage': usage,
-            'analysis_notes': self.data.get('stats', {}).get('analysis_notes', ''),
-            'last_updated': datetime.now().strftime('%Y-%m-%d')
-        }
+        # Update stats, keeping last_updated unless a number actually moved
+        previous = self.data.get('stats', {})
+        stats = dict(counters)
+        stats['analysis_notes'] = previous.get('analysis_notes', '')
+        stats['last_updated'] = previous.get('last_updated')
+        if stats != previous:
+            stats['last_updated'] = datetime.now().strftime('%Y-%m-%d')
+        self.data['stats'] = stats
         
         # Update dependency hierarchy
-        self.data['dependency_hierarchy'] = {
-            complexity: {
-                'count': complexity_counts[complexity],
-                'components': complexity_components[complexity]
-            } for complexity in complexity_counts
-        }
+        self.data['dependency_hierarchy'] = self.stats_index.to_hierarchy()
         
-        print(f"📊 Updated stats: {total} total, {primitives_done} primitives done, {native_done} native done")
+        if verbose:
+            print(f"📊 Updated stats: {stats['total']} total, {stats['primitives_done']} primitives done, "
+                  f"{stats['native_done']} native done")
     
-    def update_component(self, component_name: str, updates: Dict):
-        """Update a specific component with the given updates"""
+    def update_component(self, component_name: str, updates: Dict, recalculate: bool = True) -> Set[str]:
+        """Update a specific component with the given updates.
+        
+        Returns the components whose dependency edges changed. With
+        recalculate=False the caller is responsible for passing them to
+        refresh_levels(), which lets bulk updates share one recomputation.
+        """
+        self.ensure_dependency_graph()
+        changed = set()
+        
         if component_name not in self.data['components']:
             print(f"⚠️  Component {component_name} not found, creating new entry...")
-            self.data['components'][component_name] = {
+            path = updates.get('path') or self.locate_source(component_name)
+            if path is None:
+                print(f"⚠️  No unique source file for {component_name} in scan_scope; "
+                      f"set it with --path or run --reconcile")
+            self.create_component(component_name, {
                 "name": component_name.replace('.tsx', '').replace('.ts', ''),
-                "path": f"src/components/{component_name}",
+                "path": path or '',
                 "description": "Component description pending",
                 "category": "platform_specific", 
                 "used": "yes",
@@ -211,41 +2589,345 @@ class AuditUpdater:
                 "dependency_level": 0,
                 "complexity_category": "basic",
                 "updated": datetime.now().strftime('%Y-%m-%d')
-            }
+            })
+            changed |= self.graph.add_component(component_name)
         
         comp = self.data['components'][component_name]
         
         # Apply updates
         for key, value in updates.items():
             if key == 'hooks' and isinstance(value, str):
-                comp[key] = [h.strip() for h in value.split(',') if h.strip()]
+                self.set_field(component_name, key, [h.strip() for h in value.split(',') if h.strip()])
             elif key == 'add_deps':
                 # Add dependencies (merge with existing)
                 existing_deps = set(comp.get('dependencies', []))
                 new_deps = [d.strip() for d in value.split(',') if d.strip()]
-                comp['dependencies'] = sorted(list(existing_deps | set(new_deps)))
+                changed |= self.set_dependencies(
+                    component_name, sorted(list(existing_deps | set(new_deps))))
             elif key == 'remove_deps':
                 # Remove dependencies
                 existing_deps = set(comp.get('dependencies', []))
                 remove_deps = [d.strip() for d in value.split(',') if d.strip()]
-                comp['dependencies'] = sorted(list(existing_deps - set(remove_deps)))
+                changed |= self.set_dependencies(
+                    component_name, sorted(list(existing_deps - set(remove_deps))))
             elif key == 'set_deps':
                 # Replace all dependencies
-                comp['dependencies'] = [d.strip() for d in value.split(',') if d.strip()]
+                changed |= self.set_dependencies(
+                    component_name, [d.strip() for d in value.split(',') if d.strip()])
             elif key != 'auto_detect':  # Skip special flags
-                comp[key] = value
+                self.set_field(component_name, key, value)
         
         # Recalculate dependency-based fields
-        self.build_dependency_graph()
-        self.update_component_calculations(component_name)
+        self.set_field(component_name, 'complexity_category',
+                       self.calculate_complexity_category(comp.get('dependencies', [])))
+        self.set_field(component_name, 'updated', datetime.now().strftime('%Y-%m-%d'))
+        if recalculate:
+            self.refresh_levels(changed | {component_name})
         
         print(f"✅ Updated {component_name}")
+        return changed
     
     def bulk_update(self, component_names: List[str], updates: Dict):
         """Update multiple components with the same changes"""
         print(f"🔄 Bulk updating {len(component_names)} components...")
+        changed = set(component_names)
         for name in component_names:
-            self.update_component(name, updates)
+            changed |= self.update_component(name, updates, recalculate=False)
+        self.refresh_levels(changed)
+    
+    def component_for_path(self, rel_path: str, path_index: Dict[str, str]) -> Optional[str]:
+        """Find the entry that owns a source file, by exact path or parent directory"""
+        name = path_index.get(rel_path)
+        if name is not None:
+            return name
+        parent = os.path.dirname(rel_path)
+        while parent:
+            name = path_index.get(parent)
+            if name is not None:
+                return name
+            parent = os.path.dirname(parent)
+        return None
+    
+    def merge_scan_results(self, usage: Dict[str, Tuple[List[str], List[str]]]) -> Set[str]:
+        """Merge scanned components and hooks into the matching entries"""
+        self.ensure_dependency_graph()
+        components = self.data['components']
+        path_index = {(comp.get('path') or '').rstrip('/'): name for name, comp in components.items()}
+        path_index.pop('', None)
+        
+        found: Dict[str, Tuple[Set[str], Set[str]]] = {}
+        for rel_path, (used_components, hooks) in usage.items():
+            name = self.component_for_path(rel_path, path_index)
+            if name is None:
+                continue
+            deps, hook_set = found.setdefault(name, (set(), set()))
+            deps.update(used_components)
+            hook_set.update(hooks)
+        
+        changed = set()
+        for name, (deps, hooks) in found.items():
+            comp = components[name]
+            own = {name, strip_component_extension(name), comp.get('name')}
+            existing_deps = comp.get('dependencies', [])
+            new_deps = sorted(deps - set(existing_deps) - own)
+            existing_hooks = comp.get('hooks', [])
+            new_hooks = sorted(hooks - set(existing_hooks))
+            
+            if new_deps:
+                self.set_dependencies(name, existing_deps + new_deps)
+                self.set_field(name, 'complexity_category',
+                               self.calculate_complexity_category(comp['dependencies']))
+            if new_hooks:
+                self.set_field(name, 'hooks', existing_hooks + new_hooks)
+            if new_deps or new_hooks:
+                self.set_field(name, 'updated', datetime.now().strftime('%Y-%m-%d'))
+                changed.add(name)
+        
+        self.refresh_levels(changed)
+        return changed
+    
+    def source_scanner(self, jobs: Optional[int] = None, use_cache: bool = True) -> SourceScanner:
+        """A scanner over the audit's scan_scope, backed by the scan cache unless disabled"""
+        scope = self.data.setdefault('metadata', {}).get('scan_scope', DEFAULT_SCAN_SCOPE)
+        cache = ScanCache(self.scan_cache_path).load() if use_cache else None
+        return SourceScanner(self.repo_root, scope, jobs, cache)
+    
+    @profiled('scan')
+    def scan_sources(self, jobs: Optional[int] = None, use_cache: bool = True,
+                     scanner: Optional[SourceScanner] = None) -> Set[str]:
+        """Populate dependencies and hooks from every source file in scan_scope"""
+        metadata = self.data.setdefault('metadata', {})
+        scanner = scanner or self.source_scanner(jobs, use_cache)
+        cache = scanner.cache
+        
+        files = scanner.list_files()
+        print(f"🔎 Scanning {len(files)} source files...")
+        changed = self.merge_scan_results(scanner.scan(files, prune=True))
+        metadata['last_full_scan'] = datetime.now().isoformat(timespec='seconds')
+        
+        if cache:
+            PROFILER.count('scan_cache_hits', cache.hits)
+            PROFILER.count('scan_cache_misses', cache.misses)
+            print(f"🗂️  Scan cache: {cache.hits} hits, {cache.misses} misses")
+        print(f"✅ Scan merged new dependencies or hooks into {len(changed)} components")
+        return changed
+    
+    def watch_sources(self, jobs: Optional[int] = None, use_cache: bool = True, polling: bool = False,
+                      debounce: float = WATCH_DEBOUNCE_SECONDS, interval: float = WATCH_POLL_SECONDS,
+                      minify: bool = False):
+        """Keep the audit in sync with scan_scope until interrupted.
+        
+        Starts with a regular scan, then waits for file events. A burst of
+        events is collected until it has been quiet for `debounce` seconds,
+        only the files it touched are scanned, and the result is merged and
+        saved like --scan would. A batch that fails (unreadable source,
+        unloadable audit, conflicting writer) is reported and its files are
+        retried with the next one, on top of a freshly loaded audit.
+        """
+        scanner = self.source_scanner(jobs, use_cache)
+        
+        def accept(path: str) -> bool:
+            return scanner.in_scope(os.path.relpath(path, self.repo_root).replace(os.sep, '/'))
+        
+        # Watch before the initial scan so edits made during it are not missed
+        roots = scanner.watch_roots()
+        watcher = open_source_watcher(roots, accept, polling, interval)
+        self.scan_sources(scanner=scanner)
+        self.update_statistics(verbose=False)
+        self.save_audit(minify=minify)
+        print(f"👀 Watching {', '.join(os.path.relpath(root, self.repo_root) for root in roots)} "
+              f"({watcher.kind}); press Ctrl+C to stop")
+        
+        changed: Set[str] = set()
+        rescan = failed = False
+        try:
+            while True:
+                events = watcher.wait(None)
+                deadline = time.monotonic() + WATCH_MAX_DELAY_SECONDS
+                while True:
+                    if events is None:
+                        rescan = True
+                    else:
+                        changed.update(events)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    events = watcher.wait(min(debounce, remaining))
+                    if events == set():
+                        break
+                try:
+                    self.apply_source_changes(scanner, changed, rescan, minify, reload=failed)
+                except (OSError, ValueError, RuntimeError, sqlite3.Error, StorageConflict) as e:
+                    stamp = datetime.now().strftime('%H:%M:%S')
+                    what = 'full rescan' if rescan else f"{len(changed)} changed files"
+                    print(f"❌ {stamp} Update failed, will retry the {what} on the next change: {e}")
+                    failed = True
+                    continue
+                changed = set()
+                rescan = failed = False
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+        finally:
+            watcher.close()
+    
+    @profiled('scan')
+    def apply_source_changes(self, scanner: 'SourceScanner', paths: Set[str], rescan: bool = False,
+                             minify: bool = False, reload: bool = False) -> Set[str]:
+        """Rescan changed source files and save any dependencies or hooks they add.
+        
+        With `reload`, unsaved changes left by a failed earlier batch are
+        dropped and the audit is loaded again before merging.
+        """
+        if reload or self.store.changed_externally(self):
+            # Someone ran another command meanwhile; build on their result
+            self.pending_changes = []
+            self.load_audit()
+        
+        rel_paths = {os.path.relpath(path, self.repo_root).replace(os.sep, '/') for path in paths}
+        live = sorted(rel for rel in rel_paths if os.path.isfile(os.path.join(self.repo_root, rel)))
+        if rescan:
+            live = scanner.list_files()
+        elif scanner.cache:
+            scanner.cache.forget(rel_paths.difference(live))
+        
+        changed = self.merge_scan_results(scanner.scan(live, prune=rescan))
+        stamp = datetime.now().strftime('%H:%M:%S')
+        what = 'full rescan' if rescan else f"{len(rel_paths)} files changed"
+        if changed:
+            print(f"🔄 {stamp} {what}: new dependencies or hooks in {', '.join(sorted(changed))}")
+            self.update_statistics(verbose=False)
+            self.save_audit(minify=minify)
+        else:
+            if scanner.cache:
+                scanner.cache.save()
+            print(f"🔄 {stamp} {what}: audit already up to date")
+        return changed
+    
+    def locate_source(self, component_name: str) -> Optional[str]:
+        """The in-scope source file named like the component, if exactly one matches"""
+        if self.sources_by_stem is None:
+            self.sources_by_stem = {}
+            for rel in self.source_scanner(use_cache=False).list_files():
+                self.sources_by_stem.setdefault(source_stem(rel), []).append(rel)
+        matches = self.sources_by_stem.get(strip_component_extension(component_name), [])
+        return matches[0] if len(matches) == 1 else None
+    
+    def load_fingerprints(self) -> Dict[str, Dict]:
+        """Last known path and content hash per component, from .audit-fingerprints.json"""
+        try:
+            with open(self.fingerprints_path, 'r') as f:
+                return json.load(f).get('components', {})
+        except (OSError, ValueError):
+            return {}
+    
+    @profiled('reconcile')
+    def reconcile_paths(self, jobs: Optional[int] = None) -> Dict:
+        """Check every entry's path against the tree and work out fixes.
+        
+        Audited paths and every file in scan_scope are stat'ed and hashed
+        on a thread pool. An entry whose path is gone is matched to a file
+        no other entry owns: first by the content hash recorded for it
+        (in .audit-fingerprints.json or the scan cache), then by file name
+        if exactly one candidate remains. Files in scope that no entry owns
+        and that are not variants of an audited component are listed as
+        untracked. The fingerprints of everything found are recorded for
+        the next run.
+        """
+        components = self.data['components']
+        scanner = self.source_scanner(jobs, use_cache=False)
+        on_disk = scanner.list_files()
+        # Entries without a path (missing, empty or null) are reported as missing
+        audited = {name: (comp.get('path') or '').rstrip('/') for name, comp in components.items()}
+        targets = sorted(set(on_disk).union(path for path in audited.values() if path))
+        
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            found = dict(zip(targets, pool.map(
+                lambda rel: fingerprint_path(os.path.join(self.repo_root, rel)), targets)))
+        PROFILER.count('files_fingerprinted', len(targets))
+        
+        path_index = {path: name for name, path in audited.items()
+                      if path and found[path][0] != 'missing'}
+        unowned = [rel for rel in on_disk if self.component_for_path(rel, path_index) is None]
+        by_hash: Dict[str, List[str]] = {}
+        by_stem: Dict[str, List[str]] = {}
+        for rel in unowned:
+            by_hash.setdefault(found[rel][1], []).append(rel)
+            by_stem.setdefault(source_stem(rel), []).append(rel)
+        
+        known = self.load_fingerprints()
+        scan_cache = ScanCache(self.scan_cache_path).load().files
+        moved, missing = [], []
+        claimed: Set[str] = set()
+        for name, path in audited.items():
+            if path and found[path][0] != 'missing':
+                continue
+            record = known.get(name, {})
+            old_hash = record.get('sha1') if record.get('path') == path else None
+            old_hash = old_hash or scan_cache.get(path, {}).get('sha1')
+            candidates = [rel for rel in by_hash.get(old_hash, []) if rel not in claimed] if old_hash else []
+            match = 'fingerprint'
+            if len(candidates) != 1:
+                stems = {strip_component_extension(name), components[name].get('name')}
+                candidates = [rel for stem in stems if stem for rel in by_stem.get(stem, []) if rel not in claimed]
+                match = 'name'
+            if len(candidates) == 1:
+                claimed.add(candidates[0])
+                moved.append({'component': name, 'from': path, 'to': candidates[0], 'match': match})
+            else:
+                stem = strip_component_extension(name)
+                twins = [other for other_path, other in path_index.items()
+                         if source_stem(other_path) == stem and other != name] if not candidates else []
+                missing.append({'component': name, 'path': path, 'candidates': sorted(candidates),
+                                'duplicate_of': sorted(twins)})
+        
+        audited_stems = {source_stem(path) for path in audited.values() if path}
+        audited_stems.update(strip_component_extension(name) for name in components)
+        untracked = [rel for rel in unowned if rel not in claimed and source_stem(rel)[:1].isupper()
+                     and source_stem(rel) not in audited_stems]
+        
+        fingerprints = dict(known)
+        for name, path in audited.items():
+            if path and found[path][0] == 'file':
+                fingerprints[name] = {'path': path, 'sha1': found[path][1]}
+        for name in set(fingerprints) - set(components):
+            del fingerprints[name]
+        if fingerprints != known:
+            write_atomic(self.fingerprints_path, json.dumps(
+                {'version': 1, 'components': fingerprints}, separators=(',', ':'), sort_keys=True).encode('utf-8'))
+        
+        return {'checked': len(targets), 'moved': moved, 'missing': missing, 'untracked': untracked}
+    
+    def apply_path_fixes(self, moved: List[Dict]) -> int:
+        """Point moved entries at their new paths; the caller saves once for all of them"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        for move in moved:
+            self.set_field(move['component'], 'path', move['to'])
+            self.set_field(move['component'], 'updated', today)
+        return len(moved)
+    
+    def print_reconcile(self, report: Dict, fix: bool):
+        print(f"🔎 Checked {report['checked']} paths")
+        if report['moved']:
+            print(f"\n🚚 {len(report['moved'])} moved:")
+            for move in report['moved']:
+                print(f"   {move['component']}: {move['from'] or '(no path)'} → {move['to']} (by {move['match']})")
+        if report['missing']:
+            print(f"\n👻 {len(report['missing'])} not found on disk:")
+            for entry in report['missing']:
+                hint = ''
+                if entry['candidates']:
+                    hint = f" (candidates: {', '.join(entry['candidates'])})"
+                elif entry['duplicate_of']:
+                    hint = f" (probably a duplicate of {', '.join(entry['duplicate_of'])})"
+                print(f"   {entry['component']}: {entry['path'] or '(no path)'}{hint}")
+        if report['untracked']:
+            print(f"\n🆕 {len(report['untracked'])} on disk but not in the audit:")
+            for rel in report['untracked']:
+                print(f"   {rel}")
+        if not (report['moved'] or report['missing'] or report['untracked']):
+            print("✅ Every audited path exists and every component in scope is audited")
+        elif report['moved'] and not fix:
+            print(f"\n💡 Run with --fix to apply the {len(report['moved'])} path fixes")
     
     def auto_detect_changes(self, component_name: str):
         """Auto-detect what might need updating based on component status"""
@@ -297,6 +2979,9 @@ class AuditUpdater:
         print(f"   Dependencies ({len(deps)}): {', '.join(deps) if deps else 'None'}")
         print(f"   Complexity: {comp.get('complexity_category')}")
         print(f"   Dependency Level: {comp.get('dependency_level')}")
+        self.ensure_dependency_graph()
+        impacted = self.graph.reachable([component_name], 'ancestors')
+        print(f"   Downstream impact: {len(impacted)} components depend on it directly or indirectly")
         
         # Analyze dependency readiness
         if deps:
@@ -317,87 +3002,541 @@ class AuditUpdater:
             if pending_deps:
                 print(f"   Waiting for: {', '.join(pending_deps)}")
     
-    def validate_and_fix(self, fix: bool = False):
-        """Validate JSON structure and optionally fix issues"""
-        issues = []
-        fixes_applied = []
+    def changed_components(self) -> Set[str]:
+        """Components touched in this run, or in the last journaled transaction if none"""
+        touched = {entry['component'] for entry in self.pending_changes}
+        if touched:
+            return touched
+        last_txn = None
+        for entry in self.journal.entries():
+            if entry.get('op') == 'snapshot' or 'txn' not in entry:
+                continue
+            if entry['txn'] != last_txn:
+                last_txn = entry['txn']
+                touched = set()
+            touched.add(entry['component'])
+        return touched
+    
+    @profiled('validate')
+    def validate_and_fix(self, fix: bool = False, changed_only: bool = False,
+                         fmt: str = 'table', dry_run: bool = False) -> bool:
+        """Validate the audit with every rule in one traversal and optionally fix issues.
+        
+        Without fix (or with dry_run) nothing is modified. Returns False if
+        any error-level issue was found.
+        """
+        scope = self.changed_components() if changed_only else None
+        engine = ValidationEngine(self, scope)
+        issues = engine.run()
+        errors = sum(1 for issue in issues if issue['severity'] == 'error')
+        
+        if fmt == 'json':
+            print(json.dumps({
+                'issues': issues,
+                'summary': {'errors': errors, 'warnings': len(issues) - errors,
+                            'components_checked': len(self.data['components']) if scope is None else len(scope)},
+            }, ensure_ascii=False, indent=2))
+        elif fmt == 'sarif':
+            uri = os.path.relpath(self.audit_path, self.repo_root).replace(os.sep, '/')
+            print(json.dumps(engine.to_sarif(uri), ensure_ascii=False, indent=2))
+        else:
+            checked = 'all components' if scope is None else f"{len(scope)} changed components"
+            print(f"🔍 Validation complete ({checked}): {len(issues)} issues found "
+                  f"({errors} errors, {len(issues) - errors} warnings)")
+            if issues:
+                print("Issues found:")
+                for issue in issues:
+                    icon = '❌' if issue['severity'] == 'error' else '⚠️ '
+                    where = f"{issue['component']}: " if issue['component'] else ''
+                    print(f"   {icon} [{issue['rule']}] {where}{issue['message']}")
+        
+        fixable = sum(1 for issue in issues if issue['fixable'])
+        if fix and dry_run:
+            if fmt == 'table':
+                print(f"🧪 Dry run: {fixable} issues would be fixed, nothing was changed")
+        elif fix:
+            applied = engine.apply_fixes()
+            if fmt == 'table' and applied:
+                print(f"🔧 Applied {len(applied)} fixes:")
+                for fix_msg in applied:
+                    print(f"   ✅ {fix_msg}")
+        
+        return errors == 0
+    
+    @profiled('query')
+    def query(self, expression: str, sort: Optional[str] = None,
+              fields: Optional[List[str]] = None) -> Tuple[List[Dict], List[str]]:
+        """Answer a filter expression, using index intersection where possible.
+        
+        Returns the projected rows and the field names they contain.
+        """
+        conditions = parse_query(expression) if expression.strip() else []
+        fields = fields or QUERY_DEFAULT_FIELDS
+        for name in fields:
+            if name not in QUERY_FIELDS:
+                raise ValueError(f"unknown field {name!r} in --fields")
         
         components = self.data['components']
+        if self.component_index.components is not components:
+            self.component_index.build(components)
+        candidates, residual = self.component_index.candidates(conditions)
+        if candidates is None:
+            names = list(components)
+        else:
+            names = sorted(candidates, key=self.component_index.position.__getitem__)
         
-        # Check for missing required fields
-        required_fields = ['name', 'path', 'description', 'category', 'used', 
-                          'primitives', 'logic_extraction', 'native', 'notes', 'updated']
+        matched = [name for name in names
+                   if all(_matches(name, components[name], f, op, values) for f, op, values in residual)]
         
-        for name, comp in components.items():
-            for field in required_fields:
-                if field not in comp:
-                    issues.append(f"{name}: Missing field '{field}'")
-                    if fix:
-                        default_values = {
-                            'name': name.replace('.tsx', '').replace('.ts', ''),
-                            'path': f'src/components/{name}',
-                            'description': 'Description needed',
-                            'category': 'platform_specific',
-                            'used': 'unknown',
-                            'primitives': 'todo',
-                            'logic_extraction': 'todo', 
-                            'native': 'todo',
-                            'notes': 'Needs review',
-                            'updated': datetime.now().strftime('%Y-%m-%d')
-                        }
-                        comp[field] = default_values.get(field, '')
-                        fixes_applied.append(f"Added missing {field} to {name}")
-            
-            # Ensure new fields exist
-            if 'dependencies' not in comp:
-                comp['dependencies'] = []
-                if fix:
-                    fixes_applied.append(f"Added dependencies field to {name}")
-            
-            if 'dependency_level' not in comp:
-                comp['dependency_level'] = 0
-                if fix:
-                    fixes_applied.append(f"Added dependency_level to {name}")
-            
-            if 'complexity_category' not in comp:
-                comp['complexity_category'] = 'basic'
-                if fix:
-                    fixes_applied.append(f"Added complexity_category to {name}")
+        for key in reversed([k.strip() for k in (sort or '').split(',') if k.strip()]):
+            descending = key.startswith('-')
+            key = key.lstrip('-')
+            if key not in QUERY_FIELDS:
+                raise ValueError(f"unknown field {key!r} in --sort")
+            field = QUERY_FIELDS[key]
+            matched.sort(key=lambda n: self._sort_key(n, components[n], field), reverse=descending)
         
-        # Validate dependency references
-        for name, comp in components.items():
-            deps = comp.get('dependencies', [])
-            for dep in deps:
-                if dep not in components:
-                    issues.append(f"{name}: References non-existent dependency '{dep}'")
-        
-        # Check stats consistency
-        if 'dependency_hierarchy' not in self.data:
-            issues.append("Missing dependency_hierarchy in root")
-            if fix:
-                self.data['dependency_hierarchy'] = {
-                    'basic': {'count': 0, 'components': []},
-                    'simple': {'count': 0, 'components': []}, 
-                    'medium': {'count': 0, 'components': []},
-                    'complex': {'count': 0, 'components': []}
+        rows = []
+        for name in matched:
+            comp = components[name]
+            rows.append({f: name if QUERY_FIELDS[f] is None else comp.get(QUERY_FIELDS[f]) for f in fields})
+        return rows, fields
+    
+    @staticmethod
+    def _sort_key(name: str, comp: Dict, field: Optional[str]):
+        """Sort numbers numerically and everything else as text, missing values first"""
+        value = name if field is None else comp.get(field)
+        if isinstance(value, (int, float)):
+            return (1, value, '')
+        if isinstance(value, list):
+            return (1, len(value), '')
+        return (0 if value is None else 1, 0, '' if value is None else str(value).lower())
+    
+    @profiled('plan')
+    def build_plan(self) -> Dict:
+        """Group all remaining native work into parallelizable build waves.
+        
+        One topological pass over the strongly connected components: a
+        component's wave is one past the latest wave among its incomplete
+        dependencies, so wave 1 (waves[0]) is everything whose dependencies
+        are complete. Of those, the ones with primitives done are unblocked
+        right now, like the viewer's ready-now group. Members of a dependency
+        cycle share a wave and are reported as a cycle. Dependencies outside
+        the audit (primitives) count as available.
+        """
+        self.ensure_dependency_graph()
+        components = self.data['components']
+        forward = self.graph.forward
+        wave: Dict[str, int] = {}
+        via: Dict[str, Optional[str]] = {}
+        cycles = []
+        
+        for scc in self.graph.strongly_connected(forward):
+            pending = [name for name in scc if components[name].get('native') not in NATIVE_COMPLETE]
+            if not pending:
+                continue
+            members = set(scc)
+            level, blocker = 0, None
+            for member in scc:
+                for dep in forward[member]:
+                    if dep in wave and dep not in members and wave[dep] + 1 > level:
+                        level, blocker = wave[dep] + 1, dep
+            if len(scc) > 1:
+                cycles.append(sorted(scc))
+            for name in pending:
+                wave[name] = level
+                via[name] = blocker
+        
+        order = {name: i for i, name in enumerate(components)}
+        waves: List[List[str]] = [[] for _ in range(max(wave.values()) + 1)] if wave else []
+        for name in sorted(wave, key=order.__getitem__):
+            waves[wave[name]].append(name)
+        
+        critical_path = []
+        if waves:
+            node = waves[-1][0]
+            while node is not None:
+                critical_path.append(node)
+                node = via[node]
+            critical_path.reverse()
+        
+        return {
+            'remaining': len(wave),
+            'unblocked': [name for name in waves[0] if components[name].get('primitives') == 'done'] if waves else [],
+            'waves': waves,
+            'critical_path_length': len(waves),
+            'critical_path': critical_path,
+            'cycles': cycles,
+        }
+    
+    def print_plan(self, plan: Dict):
+        """Print a build plan as waves with the critical path"""
+        print(f"🗺️  Native build plan: {plan['remaining']} remaining, {len(plan['unblocked'])} unblocked now, "
+              f"critical path {plan['critical_path_length']} waves")
+        for number, members in enumerate(plan['waves'], 1):
+            label = 'dependencies complete' if number == 1 else f'after wave {number - 1}'
+            print(f"\n   Wave {number} ({len(members)}, {label}):")
+            for name in members:
+                comp = self.data['components'][name]
+                status = comp.get('native')
+                if comp.get('primitives') != 'done':
+                    status += f", primitives {comp.get('primitives')}"
+                print(f"      • {name} [{status}]")
+        if plan['critical_path']:
+            print(f"\n   Critical path: {' → '.join(plan['critical_path'])}")
+        for cycle in plan['cycles']:
+            print(f"⚠️  Cycle must be built together: {', '.join(cycle)}")
+    
+    def write_ready_to_build(self, plan: Dict) -> int:
+        """Replace mobile_strategy.ready_to_build with the unblocked components.
+        
+        Hand-written reason/effort/notes are kept for components that stay on
+        the list. Components already in progress are left off, and entries
+        are keyed by display name, so it is listed once even when several
+        files share it.
+        """
+        components = self.data['components']
+        strategy = self.data.setdefault('mobile_strategy', {})
+        existing = {entry.get('name'): entry for entry in strategy.get('ready_to_build', [])}
+        
+        ready = []
+        listed = set()
+        for name in plan['unblocked']:
+            comp = components[name]
+            if comp.get('native') == 'in_progress':
+                continue
+            display = comp.get('name') or strip_component_extension(name)
+            if display in listed:
+                continue
+            listed.add(display)
+            entry = existing.get(display)
+            if entry is None:
+                deps = self.graph.forward.get(name, [])
+                entry = {
+                    'name': display,
+                    'reason': 'All audited dependencies are native complete' if deps else 'No audited dependencies',
+                    'effort': 'TBD',
+                    'notes': comp.get('description', ''),
                 }
-                fixes_applied.append("Added missing dependency_hierarchy")
-        
-        print(f"🔍 Validation complete: {len(issues)} issues found")
-        if issues:
-            print("Issues found:")
-            for issue in issues:
-                print(f"   ❌ {issue}")
-        
-        if fix and fixes_applied:
-            print(f"🔧 Applied {len(fixes_applied)} fixes:")
-            for fix_msg in fixes_applied:
-                print(f"   ✅ {fix_msg}")
+            ready.append(entry)
+        
+        strategy['ready_to_build'] = ready
+        print(f"✅ ready_to_build now lists {len(ready)} components")
+        return len(ready)
+    
+    def transitive(self, component_name: str, direction: str) -> Tuple[str, List[str]]:
+        """Answer impact ('ancestors') or depends-on ('descendants') with one graph walk.
+        
+        Names resolve like dependencies do. A name that is only referenced
+        (a primitive outside the audit) is answered through its referrers.
+        """
+        self.ensure_dependency_graph()
+        key = self.graph.resolve(component_name)
+        if key is not None:
+            starts, include_starts = [key], False
+        else:
+            referrers = self.graph.unresolved.get(component_name)
+            if referrers is None:
+                raise ValueError(f"{component_name} is neither a component nor a known dependency")
+            if direction == 'descendants':
+                return component_name, []
+            starts, include_starts = sorted(referrers), True
+        
+        names = self.graph.reachable(starts, direction)
+        if include_starts:
+            names.update(starts)
+        return key or component_name, sorted(names, key=self._level_order)
+    
+    def _level_order(self, name: str) -> Tuple[int, str]:
+        return self.graph.levels.get(name, 0), name
+    
+    def print_transitive(self, component_name: str, direction: str, fmt: str = 'table') -> int:
+        """Print the transitive dependents or dependencies of a component"""
+        try:
+            key, names = self.transitive(component_name, direction)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+        
+        forward = self.graph.forward
+        if direction == 'ancestors':
+            direct = set(self.graph.reverse.get(key, ())) or self.graph.unresolved.get(key, set())
+        else:
+            direct = set(forward.get(key, ()))
+        
+        if fmt == 'json':
+            print(json.dumps({'component': key, 'direction': 'impact' if direction == 'ancestors' else 'depends_on',
+                              'direct': sorted(direct & set(names)), 'all': names}, ensure_ascii=False, indent=2))
+            return 0
+        
+        title = f"💥 {len(names)} components depend on {key}" if direction == 'ancestors' \
+            else f"🧩 {key} depends on {len(names)} components"
+        print(f"{title} ({len(direct & set(names))} directly):")
+        for name in names:
+            marker = '•' if name in direct else '◦'
+            print(f"   {marker} {name} (level {self.graph.levels.get(name, 0)})")
+        return 0
+    
+    @profiled('batch')
+    def run_batch(self, operations: List[Dict]) -> List[str]:
+        """Apply parsed batch operations in memory with one shared level refresh.
+        
+        Dependency edits are collected and their downstream levels refreshed
+        once, before any op that reads levels and at the end. The caller
+        saves once afterwards. Returns one result line per operation.
+        """
+        self.ensure_dependency_graph()
+        results = []
+        changed: Set[str] = set()
+        
+        for operation in operations:
+            op = operation['op']
+            label = f"#{operation['line']} {op}"
+            if op in ('validate', 'recalc') and changed:
+                self.refresh_levels(changed)
+                changed = set()
+            before = len(self.pending_changes)
             
-            # Recalculate everything after fixes
-            self.recalculate_all_components()
+            if op == 'validate':
+                valid = self.validate_and_fix(fix=operation['fix'])
+                outcome = 'valid' if valid else 'issues found'
+            elif op == 'recalc':
+                self.recalculate_all_components()
+                outcome = 'recalculated'
+            else:
+                names = operation['components']
+                for name in names:
+                    changed |= self.update_component(name, operation['updates'], recalculate=False)
+                    changed.add(name)
+                label += f" {', '.join(names)}"
+                outcome = 'ok'
+            
+            results.append(f"{label}: {outcome} ({len(self.pending_changes) - before} field changes)")
+        
+        if changed:
+            self.refresh_levels(changed)
+        return results
+    
+    @profiled('undo')
+    def undo(self, count: int) -> List[str]:
+        """Revert the last `count` journaled transactions, newest first.
+        
+        The reverts are journaled like any other edit, tagged with the
+        transactions they undo, so undone transactions are skipped next time.
+        """
+        transactions: Dict[str, List[Dict]] = OrderedDict()
+        undone = set()
+        for entry in self.journal.entries():
+            if entry.get('op') == 'snapshot':
+                continue
+            if 'undoes' in entry:
+                undone.update(entry['undoes'])
+                continue
+            transactions.setdefault(entry['txn'], []).append(entry)
+        
+        targets = [txn for txn in reversed(transactions) if txn not in undone][:count]
+        if not targets:
+            print("ℹ️  Nothing to undo")
+            return []
+        
+        components = self.data['components']
+        for txn in targets:
+            for entry in reversed(transactions[txn]):
+                name = entry['component']
+                op = entry['op']
+                if op == 'create':
+                    if name in components:
+                        self.delete_component(name)
+                elif op == 'delete':
+                    self.create_component(name, entry['old'])
+                elif name not in components:
+                    print(f"⚠️  Skipping {name}.{entry['field']}: component no longer exists")
+                elif components[name].get(entry['field']) != entry.get('new'):
+                    print(f"⚠️  {name}.{entry['field']} changed outside the journal; restoring anyway")
+                    self._revert_field(entry)
+                else:
+                    self._revert_field(entry)
+            print(f"↩️  Undid transaction {txn} ({len(transactions[txn])} changes)")
+        
+        self.journal_extra = {'undoes': targets}
+        self.build_dependency_graph()
+        self.graph.compute_levels()
+        return targets
+    
+    def _revert_field(self, entry: Dict):
+        """Restore the pre-change value recorded in a journal entry"""
+        if 'old' in entry:
+            self.set_field(entry['component'], entry['field'], entry['old'])
+        else:
+            self.delete_field(entry['component'], entry['field'])
+    
+    def show_history(self, component_name: str) -> int:
+        """Stream the journal and print every change to one component"""
+        count = 0
+        for entry in self.journal.entries():
+            if entry.get('component') != component_name:
+                continue
+            count += 1
+            op = entry['op']
+            marker = ' (undo)' if 'undoes' in entry else ''
+            if op == 'create':
+                print(f"   {entry['ts']}  created{marker}")
+            elif op == 'delete':
+                print(f"   {entry['ts']}  deleted{marker}")
+            else:
+                old = self._format_value(entry.get('old', '∅'))
+                new = self._format_value(entry.get('new', '∅'))
+                print(f"   {entry['ts']}  {entry['field']}: {old} → {new}{marker}")
+        
+        if not count:
+            print(f"ℹ️  No journaled changes for {component_name}")
+        return count
+    
+    @staticmethod
+    def _format_value(value, limit: int = 60) -> str:
+        """Render a journaled value on one short line"""
+        text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+        return text if len(text) <= limit else text[:limit - 1] + '…'
+    
+    @profiled('replay')
+    def reconstruct(self, when: str) -> Dict:
+        """Rebuild the audit as it was at `when` (ISO date or datetime).
+        
+        Replays the journal forwards from its snapshot, stopping at the first
+        entry after `when`. Derived stats are recomputed for the result.
+        """
+        if len(when) == 10:
+            when += 'T23:59:59'
+        header, document = self.journal.load_snapshot()
+        if when < header['ts']:
+            raise ValueError(f"Journal history starts at {header['ts']}")
+        
+        components = document.setdefault('components', {})
+        for entry in self.journal.entries():
+            if entry.get('op') == 'snapshot':
+                continue
+            if entry['ts'] > when:
+                break
+            ChangeJournal.apply(components, entry)
+        
+        restored = AuditUpdater(self.audit_path)
+        restored.data = document
+        restored.update_statistics(verbose=False)
+        return document
+    
+    def load_revision(self, spec: str) -> Dict:
+        """An audit document from a file, or rebuilt from the journal as of an ISO date"""
+        if os.path.isfile(spec):
+            with open(spec, 'rb') as f:
+                raw = f.read()
+            PROFILER.count('bytes_read', len(raw))
+            return json.loads(raw)
+        if re.match(r'^\d{4}-\d{2}-\d{2}', spec):
+            return self.reconstruct(spec)
+        raise ValueError(f"{spec} is neither an audit file nor an ISO date")
+    
+    @profiled('diff')
+    def diff(self, before_spec: str, after_spec: str) -> Dict:
+        """Differences between two audits given as files or journal dates"""
+        return diff_audits(self.load_revision(before_spec), self.load_revision(after_spec))
+    
+    def print_diff(self, before_spec: str, after_spec: str, diff: Dict):
+        changed = diff['changed']
+        print(f"🔍 {before_spec} → {after_spec}: {len(diff['added'])} added, {len(diff['removed'])} removed, "
+              f"{len(changed)} changed, {diff['unchanged']} unchanged")
+        if diff['added']:
+            print(f"\n➕ Added: {', '.join(diff['added'])}")
+        if diff['removed']:
+            print(f"\n➖ Removed: {', '.join(diff['removed'])}")
+        if diff['transitions']:
+            print("\n🔀 Status transitions:")
+            for t in diff['transitions']:
+                print(f"   {t['field']}: {t['from'] or '(none)'} → {t['to'] or '(none)'}  ×{t['count']}")
+        if changed:
+            print("\n✏️  Changed components:")
+            for entry in changed:
+                print(f"   {entry['component']}")
+                for field, (was, now) in entry['transitions'].items():
+                    print(f"      {field}: {was or '(none)'} → {now or '(none)'}")
+                if entry['dependencies_added'] or entry['dependencies_removed']:
+                    deps = [f"+{dep}" for dep in entry['dependencies_added']]
+                    deps += [f"-{dep}" for dep in entry['dependencies_removed']]
+                    print(f"      dependencies: {' '.join(deps)}")
+                if entry['fields']:
+                    print(f"      also changed: {', '.join(entry['fields'])}")
+        print("\n📈 Progress:")
+        for counter, (was, now) in diff['progress'].items():
+            print(f"   {counter}: {was} → {now} ({now - was:+d})")
+    
+    @profiled('trend')
+    def trend(self, source: str = 'snapshots') -> List[Dict]:
+        """Progress counters per date, from snapshot files or from the change journal"""
+        rows = self._journal_trend() if source == 'journal' else self._snapshot_trend()
+        return list(rows)
+    
+    def _snapshot_trend(self) -> Iterator[Dict]:
+        """One row per date over audit-backup*.json, the journal snapshot and the audit.
+        
+        Snapshots are read one at a time and reduced to their counters
+        before the next is opened. When several share a date, the most
+        recently modified one wins.
+        """
+        audit_dir = os.path.dirname(self.audit_path)
+        paths = [os.path.join(audit_dir, name) for name in os.listdir(audit_dir)
+                 if name.startswith('audit-backup') and name.endswith('.json')]
+        paths += [path for path in (self.journal.snapshot_path, self.audit_path) if os.path.exists(path)]
+        paths.sort(key=os.path.getmtime)
+        
+        by_date: Dict[str, Dict] = {}
+        for path in paths:
+            components = self.load_revision(path).get('components', {})
+            stats = AuditStats().build(components).to_stats()
+            date = snapshot_date(path, components)
+            by_date[date] = {'date': date, 'source': os.path.basename(path),
+                             **{counter: stats[counter] for counter in TREND_COUNTERS}}
+            del components
+        for date in sorted(by_date):
+            yield by_date[date]
+    
+    def _journal_trend(self) -> Iterator[Dict]:
+        """One row per journaled day: replay from the snapshot, counting by deltas"""
+        header, document = self.journal.load_snapshot()
+        components = document.get('components', {})
+        stats = AuditStats().build(components)
+        
+        def row(date: str) -> Dict:
+            counters = stats.to_stats()
+            return {'date': date, 'source': 'journal', **{counter: counters[counter] for counter in TREND_COUNTERS}}
         
-        return len(issues) == 0
+        current = header['ts'][:10]
+        for entry in self.journal.entries():
+            op = entry.get('op')
+            if op == 'snapshot':
+                continue
+            date = entry['ts'][:10]
+            if date != current:
+                yield row(current)
+                current = date
+            name = entry.get('component')
+            comp = components.get(name)
+            if op == 'set' and comp is not None:
+                stats.count_field(name, comp, entry['field'], -1)
+                ChangeJournal.apply(components, entry)
+                stats.count_field(name, comp, entry['field'], 1)
+            elif op == 'create':
+                if comp is not None:
+                    stats.remove(name, comp)
+                ChangeJournal.apply(components, entry)
+                stats.add(name, components[name])
+            elif op == 'delete' and comp is not None:
+                stats.remove(name, comp)
+                ChangeJournal.apply(components, entry)
+        yield row(current)
+    
+    def compact_journal(self):
+        """Fold the journal into a snapshot of the audit as saved on disk"""
+        folded = self.journal.compact(self.saved_bytes or self.serialize_audit())
+        print(f"🗜️  Compacted {folded} journal entries into {self.journal.snapshot_path}")
 
 def main():
     parser = argparse.ArgumentParser(description='Enhanced audit.json updater')
@@ -407,11 +3546,11 @@ def main():
     parser.add_argument('--bulk-update', help='Comma-separated list of components to update')
     
     # Status updates
-    parser.add_argument('--primitives', choices=['todo', 'partial', 'done'], help='Primitives status')
-    parser.add_argument('--logic_extraction', choices=['todo', 'in_progress', 'done', 'keep'], help='Logic extraction status')
-    parser.add_argument('--native', choices=['todo', 'in_progress', 'ready', 'done', 'not_needed'], help='Native status')
-    parser.add_argument('--category', choices=['shared', 'platform_specific', 'complex_refactor'], help='Component category')
-    parser.add_argument('--used', choices=['yes', 'no', 'unknown', 'suspended'], help='Usage status')
+    parser.add_argument('--primitives', choices=FIELD_CHOICES['primitives'], help='Primitives status')
+    parser.add_argument('--logic_extraction', choices=FIELD_CHOICES['logic_extraction'], help='Logic extraction status')
+    parser.add_argument('--native', choices=FIELD_CHOICES['native'], help='Native status')
+    parser.add_argument('--category', choices=FIELD_CHOICES['category'], help='Component category')
+    parser.add_argument('--used', choices=FIELD_CHOICES['used'], help='Usage status')
     
     # Dependency management
     parser.add_argument('--add-deps', help='Add dependencies (comma-separated)')
@@ -432,36 +3571,238 @@ def main():
     parser.add_argument('--recalculate-all', action='store_true', help='Recalculate all dependency levels and complexity')
     parser.add_argument('--stats-only', action='store_true', help='Only update statistics')
     parser.add_argument('--validate', action='store_true', help='Validate JSON structure')
-    parser.add_argument('--fix', action='store_true', help='Fix validation issues (use with --validate)')
+    parser.add_argument('--fix', action='store_true', help='Fix validation issues (with --validate) or apply path fixes (with --reconcile)')
+    parser.add_argument('--dry-run', action='store_true', help='With --fix, report fixes without applying them')
+    parser.add_argument('--changed-only', action='store_true', help='Validate only components touched in the last journaled save')
     
-    args = parser.parse_args()
+    # Output
+    parser.add_argument('--minify', action='store_true', help='Write audit.json without indentation (for machine consumers)')
+    
+    # Change journal
+    parser.add_argument('--undo', type=int, metavar='N', help='Undo the last N journaled transactions')
+    parser.add_argument('--history', metavar='COMPONENT', help='Show journaled changes for a component')
+    parser.add_argument('--as-of', metavar='WHEN', help='Reconstruct the audit as of an ISO date or datetime')
+    parser.add_argument('--output', help='Write --as-of output to this file instead of stdout')
+    parser.add_argument('--compact', action='store_true', help='Fold the change journal into a new snapshot')
+    
+    # Snapshot comparison
+    parser.add_argument('--diff', nargs=2, metavar=('A', 'B'),
+                        help='Compare two audits, each a file or an ISO date replayed from the journal')
+    parser.add_argument('--trend', nargs='?', const='snapshots', choices=['snapshots', 'journal'],
+                        help='Progress per date from audit-backup*.json and audit.json, or from the journal')
+    
+    # Queries
+    parser.add_argument('--query', metavar='EXPR', help='Filter components, e.g. "category=shared and native=todo and level<=1"')
+    parser.add_argument('--sort', help='Comma-separated sort fields for --query, prefix with - for descending')
+    parser.add_argument('--fields', help='Comma-separated fields to show for --query')
+    parser.add_argument('--format', choices=['table', 'json', 'csv', 'sarif'], default='table',
+                        help='Output format for --query and --trend (table/json/csv), --validate (table/json/sarif), '
+                             '--plan, --impact, --depends-on and --diff (table/json)')
+    
+    # Planning
+    parser.add_argument('--plan', action='store_true', help='Show native build waves and the critical path')
+    parser.add_argument('--write-ready', action='store_true', help='Rewrite mobile_strategy.ready_to_build from --plan')
+    
+    # Impact analysis
+    parser.add_argument('--impact', metavar='COMPONENT', help='List every component that depends on COMPONENT, directly or indirectly')
+    parser.add_argument('--depends-on', metavar='COMPONENT', help='List everything COMPONENT depends on, directly or indirectly')
+    
+    # Batch mode
+    parser.add_argument('--batch', metavar='FILE', help="Apply JSONL operations from FILE ('-' for stdin) in one load/save cycle")
+    
+    # Source scanning
+    parser.add_argument('--scan', action='store_true', help='Populate dependencies and hooks from component sources')
+    parser.add_argument('--jobs', type=int, help='Worker processes for --scan or threads for --reconcile (default: based on CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not update the scan cache')
+    parser.add_argument('--reconcile', action='store_true',
+                        help='Check entry paths against the tree, find moved files and unaudited components')
+    parser.add_argument('--watch', action='store_true', help='Scan, then keep rescanning changed sources until interrupted')
+    parser.add_argument('--poll', action='store_true', help='With --watch, poll for changes instead of using inotify')
+    parser.add_argument('--debounce', type=float, default=WATCH_DEBOUNCE_SECONDS,
+                        help='With --watch, seconds of quiet to wait for before rescanning (default: %(default)s)')
+    
+    # Storage
+    parser.add_argument('--storage', choices=['json', 'sqlite'], default=os.environ.get('AUDIT_STORAGE', 'json'),
+                        help='Where the audit is stored: audit.json, or audit.db kept in sync with an exported audit.json '
+                             '(default: $AUDIT_STORAGE or json)')
+    parser.add_argument('--no-export', action='store_true', help='With --storage sqlite, do not rewrite audit.json on save')
+    parser.add_argument('--export', action='store_true', help='Write audit.json from audit.db')
     
+    # Viewer index
+    parser.add_argument('--viewer-index', action='store_true', help='Regenerate the ComponentAuditViewer index and detail shards')
+    
+    # Profiling
+    parser.add_argument('--profile', nargs='?', const='table', choices=['table', 'json'],
+                        help='Print per-phase timings, memory and counters to stderr')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='With --profile, also trace peak Python allocations per phase (slower)')
+    
+    args = parser.parse_args()
+    if args.profile:
+        PROFILER.enable(trace_memory=args.profile_memory)
+    try:
+        with PROFILER.phase('total'):
+            return run(args)
+    except StorageConflict as e:
+        print(f"❌ Nothing was saved: {e}. Re-run the command to apply it on top of their changes.")
+        return 1
+    finally:
+        if args.profile:
+            sys.stderr.write(PROFILER.report(args.profile))
+
+
+def run(args) -> int:
+    """Execute the operation selected on the command line"""
     # Initialize updater
-    updater = AuditUpdater()
+    updater = AuditUpdater(storage=args.storage, export=not args.no_export)
+    if args.export and args.storage != 'sqlite':
+        print("❌ --export needs --storage sqlite (or AUDIT_STORAGE=sqlite)")
+        return 1
     updater.load_audit()
     
     # Handle different operations
     if args.recalculate_all:
         updater.recalculate_all_components()
         updater.update_statistics()
-        updater.save_audit()
+        updater.save_audit(minify=args.minify)
         
     elif args.validate:
-        is_valid = updater.validate_and_fix(fix=args.fix)
-        if args.fix:
-            updater.update_statistics()
-            updater.save_audit()
+        is_valid = updater.validate_and_fix(fix=args.fix, changed_only=args.changed_only,
+                                            fmt=args.format, dry_run=args.dry_run)
+        if args.fix and not args.dry_run:
+            updater.update_statistics(verbose=args.format == 'table')
+            updater.save_audit(minify=args.minify, verbose=args.format == 'table')
         return 0 if is_valid else 1
         
+    elif args.query is not None:
+        fields = [f.strip() for f in args.fields.split(',') if f.strip()] if args.fields else None
+        try:
+            rows, fields = updater.query(args.query, sort=args.sort, fields=fields)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+        print(format_rows(rows, fields, args.format))
+        if args.format == 'table':
+            print(f"\n{len(rows)} of {len(updater.data['components'])} components")
+        
+    elif args.plan:
+        plan = updater.build_plan()
+        if args.format == 'json':
+            print(json.dumps(plan, ensure_ascii=False, indent=2))
+        else:
+            updater.print_plan(plan)
+        if args.write_ready:
+            updater.write_ready_to_build(plan)
+            updater.save_audit(minify=args.minify)
+        
+    elif args.impact or args.depends_on:
+        if args.impact:
+            return updater.print_transitive(args.impact, 'ancestors', args.format)
+        return updater.print_transitive(args.depends_on, 'descendants', args.format)
+        
+    elif args.batch:
+        try:
+            if args.batch == '-':
+                operations = parse_batch_operations(sys.stdin)
+            else:
+                with open(args.batch, 'r', encoding='utf-8') as f:
+                    operations = parse_batch_operations(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ Batch aborted, nothing was changed: {e}")
+            return 1
+        
+        print(f"📦 Applying {len(operations)} batch operations...")
+        try:
+            results = updater.run_batch(operations)
+        except Exception as e:
+            print(f"❌ Batch aborted, nothing was changed: {e}")
+            return 1
+        for result in results:
+            print(f"   ✅ {result}")
+        updater.update_statistics()
+        updater.save_audit(minify=args.minify)
+        
+    elif args.undo is not None:
+        if updater.undo(args.undo):
+            updater.update_statistics()
+            updater.save_audit(minify=args.minify)
+        
+    elif args.history:
+        print(f"📜 History for {args.history}:")
+        updater.show_history(args.history)
+        
+    elif args.as_of:
+        try:
+            document = updater.reconstruct(args.as_of)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            return 1
+        text = json.dumps(document, ensure_ascii=False, indent=2)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(text)
+            print(f"✅ Wrote audit as of {args.as_of} to {args.output}")
+        else:
+            print(text)
+        
+    elif args.compact:
+        updater.compact_journal()
+        
+    elif args.diff:
+        try:
+            diff = updater.diff(*args.diff)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            return 1
+        if args.format == 'json':
+            print(json.dumps(diff, ensure_ascii=False, indent=2))
+        else:
+            updater.print_diff(*args.diff, diff)
+        
+    elif args.trend:
+        try:
+            rows = updater.trend(args.trend)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            return 1
+        print(format_rows(rows, ['date', 'source'] + TREND_COUNTERS, args.format))
+        
+    elif args.reconcile:
+        report = updater.reconcile_paths(jobs=args.jobs)
+        if args.format == 'json':
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            updater.print_reconcile(report, args.fix)
+        if args.fix and not args.dry_run and report['moved']:
+            updater.apply_path_fixes(report['moved'])
+            updater.update_statistics(verbose=args.format == 'table')
+            updater.save_audit(minify=args.minify, verbose=args.format == 'table')
+        
+    elif args.watch:
+        updater.watch_sources(jobs=args.jobs, use_cache=not args.no_cache, polling=args.poll,
+                              debounce=args.debounce, minify=args.minify)
+        
+    elif args.scan:
+        updater.scan_sources(jobs=args.jobs, use_cache=not args.no_cache)
+        updater.update_statistics()
+        updater.save_audit(minify=args.minify)
+        
+    elif args.export:
+        updater.store.export(minify=args.minify)
+        print(f"✅ Exported {updater.db_path} to {updater.audit_path}")
+        
+    elif args.viewer_index:
+        written = updater.write_viewer_index()
+        print(f"✅ Viewer index up to date in {updater.viewer_dir} ({written} files written)")
+        
     elif args.stats_only:
         updater.update_statistics()
-        updater.save_audit()
+        updater.save_audit(minify=args.minify)
         
     elif args.component or args.bulk_update:
         # Prepare updates
         updates = {}
-        for field in ['primitives', 'logic_extraction', 'native', 'category', 'used', 
-                     'hooks', 'notes', 'description', 'path', 'add_deps', 'remove_deps', 'set_deps']:
+        for field in UPDATE_FIELDS:
             value = getattr(args, field.replace('-', '_'))
             if value is not None:
                 updates[field] = value
@@ -485,10 +3826,10 @@ def main():
         
         # Always update stats after component changes
         updater.update_statistics()
-        updater.save_audit()
+        updater.save_audit(minify=args.minify)
     
     else:
-        print("❌ Must specify an operation (--component, --bulk-update, --recalculate-all, --stats-only, or --validate)")
+        print("❌ Must specify an operation (--component, --bulk-update, --recalculate-all, --scan, --watch, --reconcile, --stats-only, --export, --viewer-index, --validate, --query, --plan, --impact, --depends-on, --batch, --undo, --history, --as-of, --diff, --trend, or --compact)")
         return 1
     
     return 0
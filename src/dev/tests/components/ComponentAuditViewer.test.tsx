@@ -0,0 +1,82 @@
+import { describe, it, expect, vi } from 'vitest';
+import { render, screen, within } from '@testing-library/react';
+import userEvent from '@testing-library/user-event';
+import { ComponentAuditViewer } from '@/dev/components-audit';
+import viewerIndex from '@/dev/components-audit/audit-viewer/index.json';
+
+// Render the dev shell and primitives as plain elements so the test only
+// exercises the viewer's own data loading
+vi.mock('@/dev/shell', () => ({
+  DevPage: ({ children }: { children: React.ReactNode }) => (
+    <div>{children}</div>
+  ),
+  DevPageHeader: ({ title }: { title: string }) => <h1>{title}</h1>,
+}));
+
+vi.mock('@/components/primitives', () => ({
+  Button: ({
+    children,
+    onClick,
+  }: {
+    children: React.ReactNode;
+    onClick?: () => void;
+  }) => <button onClick={onClick}>{children}</button>,
+  Callout: ({ children }: { children: React.ReactNode }) => (
+    <div>{children}</div>
+  ),
+  Flex: ({ children }: { children: React.ReactNode }) => <div>{children}</div>,
+  Input: ({ value }: { value: string }) => <input value={value} readOnly />,
+  Select: () => null,
+}));
+
+type ViewerRow = (typeof viewerIndex.components)[number];
+
+const shardFiles = import.meta.glob<{
+  components: Record<string, { notes: string; hooks: string[] }>;
+}>('@/dev/components-audit/audit-viewer/details-*.json', {
+  import: 'default',
+  eager: true,
+});
+
+const shardOf = (row: ViewerRow) =>
+  Object.entries(shardFiles).find(([path]) =>
+    path.endsWith(`details-${String(row.shard).padStart(2, '0')}.json`)
+  )?.[1];
+
+const rowFor = (row: ViewerRow) => screen.getByText(row.path).closest('tr')!;
+
+describe('ComponentAuditViewer', () => {
+  // Rows come from index.json; the heavy fields are not in it
+  it('renders the rows of the viewer index', () => {
+    render(<ComponentAuditViewer />);
+
+    const first = viewerIndex.components[viewerIndex.order.alphabetical[0]];
+    expect(screen.getAllByText('Details')).toHaveLength(
+      viewerIndex.components.length
+    );
+    expect(within(rowFor(first)).getByText(first.name)).toBeInTheDocument();
+    expect(first).not.toHaveProperty('notes');
+  });
+
+  // Expanding a row fetches its detail shard and shows the notes and hooks
+  it('resolves a detail shard when a row is expanded', async () => {
+    const user = userEvent.setup();
+    render(<ComponentAuditViewer />);
+
+    const row = viewerIndex.components.find(
+      (component) => shardOf(component)?.components[component.key]?.notes
+    )!;
+    const detail = shardOf(row)!.components[row.key];
+
+    await user.click(within(rowFor(row)).getByText('Details'));
+
+    const expanded = rowFor(row).nextElementSibling as HTMLElement;
+    expect(
+      await within(expanded).findByText(detail.notes)
+    ).toBeInTheDocument();
+    for (const hook of detail.hooks) {
+      expect(within(expanded).getByText(hook)).toBeInTheDocument();
+    }
+    expect(within(rowFor(row)).getByText('Hide')).toBeInTheDocument();
+  });
+});